@@ -9,11 +9,26 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import sys
-import subprocess
 import threading
+import json
 from pathlib import Path
-from PIL import Image
-import piexif
+from jpegto.core import JobSpec, PIXELS, VIRTUAL
+from jpegto.backup import COPY, DELTA
+from jpegto.delta import DeltaJournal, default_journal_path
+from jpegto.events import FRAME_INTERVAL_MS, LOG_LINES, EventQueue, default_log_path
+from jpegto.jobs import JobError, JobJournal, default_job_path
+from jpegto.manifest import Manifest, default_root
+from jpegto.priority import FIFO, SMALLEST, FOCUS, FileOrder
+from jpegto.scheduler import CANCELLED, PAUSED, Scheduler
+from jpegto.stats import RunStats
+from jpegto import capabilities
+
+# Dosya sırası seçenekleri (arayüz etiketi -> sıra)
+ORDER_LABELS = {
+    "Bulunma sırası": FIFO,
+    "Küçük dosyalar önce": SMALLEST,
+    "Seçilen klasör önce": FOCUS,
+}
 
 class JPEGOrientationFixer:
     def __init__(self, root):
@@ -30,8 +45,19 @@ class JPEGOrientationFixer:
             except:
                 pass
         
+        # İşçi thread'lerin günlük ve ilerleme olayları; arayüz sabit kare hızında boşaltır
+        self.events = EventQueue()
+        # Çalışan işin verim ve aşama süreleri
+        self.stats = None
+        self.log_path = None
+        # İşler duraklatılabilir/iptal edilebilir; pencere kapanırken yazmalar tamamlanır
+        self.scheduler = Scheduler()
+        self.job = None
+        
         self.setup_ui()
-        self.check_exiftool()
+        self.root.after(FRAME_INTERVAL_MS, self.drain_events)
+        # Arka uç yoklaması pencere çizildikten sonra arka planda yapılır
+        self.root.after_idle(self.check_exiftool)
         
     def setup_ui(self):
         # Ana frame
@@ -75,6 +101,11 @@ class JPEGOrientationFixer:
                                            command=self.select_folder, width=18)
         self.select_folder_btn.grid(row=0, column=1, padx=8)
         
+        # Deneme: yalnızca başlıkları tara
+        self.audit_btn = ttk.Button(buttons_frame, text="🔍 Başlıkları Tara", 
+                                    command=self.start_audit, width=18)
+        self.audit_btn.grid(row=0, column=2, padx=8)
+        
         # Seçenekler frame'i
         options_frame = ttk.LabelFrame(main_frame, text="İşlem Seçenekleri", padding="15")
         options_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=15)
@@ -91,24 +122,85 @@ class JPEGOrientationFixer:
                                       variable=self.rotate_var)
         rotate_check.grid(row=1, column=0, sticky=tk.W, pady=3)
         
+        # Sanal döndürme: pikseller yerine yalnızca Orientation etiketi
+        self.virtual_var = tk.BooleanVar(value=False)
+        virtual_check = ttk.Checkbutton(options_frame, text="🏷️ Döndürmeyi yalnızca Orientation etiketiyle yap (pikseller değişmez)", 
+                                       variable=self.virtual_var)
+        virtual_check.grid(row=2, column=0, sticky=tk.W, pady=3)
+        
         # Orijinal dosyaları yedekle
         self.backup_var = tk.BooleanVar(value=True)
         backup_check = ttk.Checkbutton(options_frame, text="💾 Orijinal dosyaları yedekle (.backup uzantısı ile)", 
                                       variable=self.backup_var)
-        backup_check.grid(row=2, column=0, sticky=tk.W, pady=3)
-        
-        # İşlem butonu
-        self.process_btn = ttk.Button(main_frame, text="🚀 İşlemleri Başlat", 
+        backup_check.grid(row=3, column=0, sticky=tk.W, pady=3)
+        
+        # Daha önce aynı işlemle işlenmiş ve değişmemiş dosyaları atla
+        self.incremental_var = tk.BooleanVar(value=False)
+        incremental_check = ttk.Checkbutton(options_frame, text="⏭️ Daha önce işlenmiş dosyaları atla (manifesto ile)", 
+                                           variable=self.incremental_var)
+        incremental_check.grid(row=4, column=0, sticky=tk.W, pady=3)
+        
+        # Uzantısı yanlış JPEG'leri imzadan tanı
+        self.sniff_var = tk.BooleanVar(value=False)
+        sniff_check = ttk.Checkbutton(options_frame, text="🔎 Klasör taramasında uzantısı yanlış JPEG'leri de bul (FF D8 FF imzası)", 
+                                     variable=self.sniff_var)
+        sniff_check.grid(row=5, column=0, sticky=tk.W, pady=3)
+        
+        # Yalnızca etiketi değişecek dosyalarda tam kopya yerine başlık yedeği
+        self.delta_var = tk.BooleanVar(value=False)
+        delta_check = ttk.Checkbutton(options_frame, text="🧾 Yedekte yalnızca değişen başlığı sakla (delta günlüğü, geri yükleme: python3 -m jpegto --restore)", 
+                                     variable=self.delta_var)
+        delta_check.grid(row=6, column=0, sticky=tk.W, pady=3)
+        
+        self.full_log_var = tk.BooleanVar(value=False)
+        full_log_check = ttk.Checkbutton(options_frame, text="📝 Tüm işlem günlüğünü ayrıca diske yaz (.jpegto-….log)", 
+                                        variable=self.full_log_var)
+        full_log_check.grid(row=7, column=0, sticky=tk.W, pady=3)
+        
+        # Önce başlıklar taranır; Orientation'ı zaten doğru dosyalar yazma için açılmaz
+        self.only_needed_var = tk.BooleanVar(value=False)
+        only_needed_check = ttk.Checkbutton(options_frame, text="⚡ Önce başlıkları tara, yalnızca değişecek dosyaları işle (yedek de yalnızca onlara)", 
+                                           variable=self.only_needed_var)
+        only_needed_check.grid(row=8, column=0, sticky=tk.W, pady=3)
+        
+        # İşlem butonları ve dosya sırası
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.grid(row=5, column=0, columnspan=2, pady=20)
+        
+        self.process_btn = ttk.Button(controls_frame, text="🚀 İşlemleri Başlat", 
                                      command=self.start_processing)
-        self.process_btn.grid(row=5, column=0, columnspan=2, pady=20)
+        self.process_btn.grid(row=0, column=0, padx=8)
+        
+        self.pause_btn = ttk.Button(controls_frame, text="⏸️ Duraklat", 
+                                   command=self.toggle_pause, state='disabled', width=12)
+        self.pause_btn.grid(row=0, column=1, padx=8)
+        
+        self.cancel_btn = ttk.Button(controls_frame, text="⏹️ İptal", 
+                                    command=self.cancel_processing, state='disabled', width=12)
+        self.cancel_btn.grid(row=0, column=2, padx=8)
+        
+        # Sıra çalışırken de değiştirilebilir; bekleyen dosyalar yeniden sıralanır
+        ttk.Label(controls_frame, text="↕️ Sıra:").grid(row=0, column=3, padx=(16, 4))
+        self.order_var = tk.StringVar(value=next(iter(ORDER_LABELS)))
+        self.order_label = self.order_var.get()
+        self.order_focus = None
+        order_box = ttk.Combobox(controls_frame, textvariable=self.order_var, values=list(ORDER_LABELS),
+                                 state='readonly', width=20)
+        order_box.grid(row=0, column=4)
+        order_box.bind('<<ComboboxSelected>>', self.order_changed)
         
         # Progress bar
         self.progress = ttk.Progressbar(main_frame, mode='determinate')
         self.progress.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
+        # Canlı verim: dosya/sn, MB/sn, kalan süre
+        self.stats_var = tk.StringVar(value="")
+        stats_label = ttk.Label(main_frame, textvariable=self.stats_var)
+        stats_label.grid(row=7, column=0, columnspan=2, sticky=tk.W)
+        
         # Log alanı
         log_frame = ttk.LabelFrame(main_frame, text="İşlem Detayları", padding="5")
-        log_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        log_frame.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
         # Log text widget ve scrollbar
         log_container = ttk.Frame(log_frame)
@@ -126,13 +218,13 @@ class JPEGOrientationFixer:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(7, weight=1)
+        main_frame.rowconfigure(8, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         log_container.columnconfigure(0, weight=1)
         log_container.rowconfigure(0, weight=1)
         
-        self.selected_files = []
+        self.selected_sources = []
         
     def select_files(self):
         """Dosya seçme diyaloğu"""
@@ -144,7 +236,7 @@ class JPEGOrientationFixer:
             ]
         )
         if files:
-            self.selected_files = list(files)
+            self.selected_sources = list(files)
             self.update_drop_label()
             self.log(f"📁 {len(files)} dosya seçildi")
     
@@ -152,25 +244,27 @@ class JPEGOrientationFixer:
         """Klasör seçme diyaloğu"""
         folder = filedialog.askdirectory(title="JPEG dosyalarının bulunduğu klasörü seçin")
         if folder:
-            jpeg_files = []
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg')):
-                        jpeg_files.append(os.path.join(root, file))
-            
-            if jpeg_files:
-                self.selected_files = jpeg_files
-                self.update_drop_label()
-                self.log(f"📂 {folder} klasöründe {len(jpeg_files)} JPEG dosyası bulundu")
-            else:
-                messagebox.showwarning("Uyarı", "Seçilen klasörde JPEG dosyası bulunamadı!")
+            # Klasör işlem sırasında taranır; dosyalar bulundukça işlenir
+            self.selected_sources = [folder]
+            self.update_drop_label()
+            self.log(f"📂 {folder} klasörü seçildi")
+    
+    def describe_sources(self):
+        """Seçilen dosya ve klasörlerin kısa açıklaması"""
+        folders = sum(1 for path in self.selected_sources if os.path.isdir(path))
+        files = len(self.selected_sources) - folders
+        parts = []
+        if folders:
+            parts.append(f"{folders} klasör")
+        if files:
+            parts.append(f"{files} dosya")
+        return ", ".join(parts)
     
     def update_drop_label(self):
         """Drop alanının etiketini güncelle"""
-        if self.selected_files:
-            count = len(self.selected_files)
+        if self.selected_sources:
             self.drop_label.configure(
-                text=f"✅ {count} JPEG dosyası seçildi\n\nİşlemleri başlatmaya hazır!",
+                text=f"✅ {self.describe_sources()} seçildi\n\nİşlemleri başlatmaya hazır!",
                 fg='#2e7d32'
             )
         else:
@@ -180,53 +274,65 @@ class JPEGOrientationFixer:
             )
     
     def check_exiftool(self):
-        """exiftool'un yüklü olup olmadığını kontrol et"""
-        try:
-            result = subprocess.run(['exiftool', '-ver'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                self.log(f"✅ exiftool bulundu (versiyon: {version})")
-                return True
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+        """exiftool, sips ve kayıpsız motoru arka planda yokla (sonuç diskte önbelleğe alınır)"""
+        def probe():
+            self.events.call(self.backends_checked, capabilities.probe())
         
-        # exiftool yoksa uyarı göster
-        self.log("⚠️  exiftool bulunamadı - EXIF işlemleri için gerekli")
-        answer = messagebox.askyesno(
-            "exiftool Gerekli", 
-            "EXIF orientation düzeltme için exiftool gereklidir.\n\n"
-            "Homebrew ile yüklemek ister misiniz?\n\n"
-            "Terminal komutu: brew install exiftool"
+        threading.Thread(target=probe, daemon=True).start()
+    
+    def backends_checked(self, backends):
+        """Yoklama bitti: sonucu günlüğe yaz (exiftool isteğe bağlıdır, pencere açılmaz)"""
+        self.log(f"🧰 Döndürme arka uçları: kayıpsız ({backends.lossless}), "
+                 f"sips {'var' if backends.sips else 'yok'}, PIL")
+        version = backends.exiftool
+        if version:
+            self.log(f"✅ exiftool bulundu (versiyon: {version})")
+        else:
+            self.log("ℹ️  exiftool bulunamadı, yerleşik EXIF yamalayıcı kullanılacak")
+    
+    def build_spec(self):
+        """Seçeneklerden iş tanımını oluştur"""
+        return JobSpec(
+            fix_exif=self.fix_exif_var.get(),
+            rotate=self.rotate_var.get(),
+            backup=self.backup_var.get(),
+            rotate_mode=VIRTUAL if self.virtual_var.get() else PIXELS,
+            backup_mode=DELTA if self.delta_var.get() else COPY,
+            incremental=self.incremental_var.get(),
         )
-        if answer:
-            self.install_exiftool()
-        return False
     
-    def install_exiftool(self):
-        """exiftool'u Homebrew ile yükle"""
-        def install():
-            try:
-                self.log("📦 exiftool yükleniyor...")
-                result = subprocess.run(
-                    ['brew', 'install', 'exiftool'], 
-                    capture_output=True, text=True, timeout=300
-                )
-                if result.returncode == 0:
-                    self.log("✅ exiftool başarıyla yüklendi!")
-                else:
-                    self.log(f"❌ exiftool yükleme hatası: {result.stderr}")
-                    self.log("💡 Manuel yükleme: Terminal'de 'brew install exiftool' komutunu çalıştırın")
-            except subprocess.TimeoutExpired:
-                self.log("⏱️  Yükleme zaman aşımına uğradı")
-            except Exception as e:
-                self.log(f"❌ Yükleme hatası: {str(e)}")
-                self.log("💡 Manuel yükleme: Terminal'de 'brew install exiftool' komutunu çalıştırın")
-        
-        threading.Thread(target=install, daemon=True).start()
+    def start_audit(self):
+        """Deneme: başlıkları tara, hiçbir dosyaya yazma"""
+        if not self.selected_sources:
+            messagebox.showwarning("Uyarı", "Lütfen önce dosyaları seçin!")
+            return
+        
+        if not self.fix_exif_var.get() and not self.rotate_var.get():
+            messagebox.showwarning("Uyarı", "Lütfen en az bir işlem seçin!")
+            return
+        
+        self.audit_btn.configure(state='disabled')
+        threading.Thread(target=self.run_audit,
+                         args=(self.build_spec(), list(self.selected_sources), self.sniff_var.get()),
+                         daemon=True).start()
+    
+    def run_audit(self, spec, sources, sniff):
+        """Başlıkları tara, histogramı günlüğe yaz; denetim raporunu döndür"""
+        from jpegto.audit import audit
+        
+        self.log("🔍 Başlıklar taranıyor...")
+        report = audit(spec, sources, sniff)
+        self.log(f"🔍 {report.files} dosya tarandı, {len(report.paths)} dosya işlem gerektiriyor")
+        for line in report.format_histogram():
+            self.log(f"   {line}")
+        for path, error in report.errors[:20]:
+            self.log(f"⚠️ Başlık okunamadı ({os.path.basename(path)}): {error}")
+        self.events.call(self.audit_btn.configure, {'state': 'normal'})
+        return report
     
     def start_processing(self):
         """İşlemleri başlat"""
-        if not self.selected_files:
+        if not self.selected_sources:
             messagebox.showwarning("Uyarı", "Lütfen önce dosyaları seçin!")
             return
         
@@ -235,11 +341,14 @@ class JPEGOrientationFixer:
             return
         
         # Onay diyaloğu
-        message = f"{len(self.selected_files)} dosya üzerinde şu işlemler yapılacak:\n\n"
+        message = f"{self.describe_sources()} üzerinde şu işlemler yapılacak:\n\n"
         if self.fix_exif_var.get():
             message += "✅ EXIF Orientation düzeltme\n"
         if self.rotate_var.get():
-            message += "🔄 90° döndürme\n"
+            if self.virtual_var.get():
+                message += "🏷️ 90° döndürme (yalnızca Orientation etiketi)\n"
+            else:
+                message += "🔄 90° döndürme\n"
         if self.backup_var.get():
             message += "💾 Yedekleme\n"
         message += "\nDevam etmek istiyor musunuz?"
@@ -247,121 +356,210 @@ class JPEGOrientationFixer:
         if not messagebox.askyesno("İşlemi Onayla", message):
             return
         
-        # İşlemi ayrı thread'de çalıştır
+        # Yarıda kalmış bir iş varsa kaldığı yerden sürdürülebilir
+        job_path = default_job_path(default_root(self.selected_sources))
+        resume = False
+        if os.path.exists(job_path):
+            answer = messagebox.askyesnocancel(
+                "Yarıda Kalmış İş",
+                "Bu konumda yarıda kalmış bir iş bulundu.\n\n"
+                "Evet: kaldığı yerden sürdür (önceki işin seçenekleriyle)\n"
+                "Hayır: yok say ve yeni iş başlat")
+            if answer is None:
+                return
+            if answer:
+                resume = True
+            else:
+                os.remove(job_path)
+        
+        # Seçenekler ana thread'de okunur, işçi thread tkinter değişkenlerine dokunmaz
+        spec = self.build_spec()
+        
+        self.log_path = None
+        if self.full_log_var.get():
+            self.log_path = self.events.open_log(default_log_path(default_root(self.selected_sources)))
+            self.log(f"📝 Tam günlük: {self.log_path}")
+        self.stats = RunStats()
+        self.stats_var.set("")
+        
+        # İşlem zamanlayıcıda ayrı bir işte çalışır (duraklatılabilir, iptal edilebilir)
         self.process_btn.configure(state='disabled', text="⏳ İşleniyor...")
+        self.pause_btn.configure(state='normal', text="⏸️ Duraklat")
+        self.cancel_btn.configure(state='normal')
         self.log("🚀 İşlem başlatılıyor...")
-        threading.Thread(target=self.process_files, daemon=True).start()
+        # Toplam dosya sayısı tarama bitene kadar bilinmez
+        self.progress_total = None
+        self.progress.configure(mode='indeterminate', value=0)
+        self.progress.start(15)
+        self.job = self.scheduler.submit(
+            self.process_files,
+            args=(spec, list(self.selected_sources), self.sniff_var.get(), job_path, resume,
+                  self.only_needed_var.get()),
+            order=self.current_order(),
+            on_done=lambda job: self.events.call(self.job_finished, job))
     
-    def process_files(self):
-        """Dosyaları işle"""
-        total_files = len(self.selected_files)
-        self.progress.configure(maximum=total_files, value=0)
-        
-        success_count = 0
-        error_count = 0
-        
-        for i, file_path in enumerate(self.selected_files):
-            try:
-                filename = os.path.basename(file_path)
-                self.log(f"🔄 İşleniyor: {filename}")
-                
-                # Yedek oluştur
-                if self.backup_var.get():
-                    backup_path = file_path + '.backup'
-                    if not os.path.exists(backup_path):
-                        subprocess.run(['cp', file_path, backup_path], check=True)
-                        self.log(f"💾 Yedek oluşturuldu: {filename}.backup")
-                
-                # EXIF orientation düzelt
-                if self.fix_exif_var.get():
-                    self.fix_exif_orientation(file_path)
+    def current_order(self):
+        """Seçili dosya sırası (FileOrder)"""
+        order = ORDER_LABELS[self.order_var.get()]
+        return FileOrder(order, self.order_focus if order == FOCUS else None)
+    
+    def order_changed(self, event=None):
+        """Sıra değişti: odak klasörü sor, çalışan işe uygula"""
+        order = ORDER_LABELS[self.order_var.get()]
+        if order == FOCUS:
+            folder = filedialog.askdirectory(title="Önce işlenecek klasörü seçin")
+            if not folder:
+                # Vazgeçildi: önceki sıra geri gelir
+                self.order_var.set(self.order_label)
+                return
+            self.order_focus = folder
+        self.order_label = self.order_var.get()
+        if self.job:
+            self.job.set_order(order, self.order_focus if order == FOCUS else None)
+            self.log(f"↕️ Sıra: {self.order_var.get()}" + (f" ({self.order_focus})" if order == FOCUS else ""))
+    
+    def toggle_pause(self):
+        """Duraklat/sürdür; işlenmekte olan dosyalar tamamlanır"""
+        if not self.job:
+            return
+        if self.job.state == PAUSED:
+            self.job.resume()
+            self.pause_btn.configure(text="⏸️ Duraklat")
+            self.log("▶️ Sürdürülüyor")
+        else:
+            self.job.pause()
+            self.pause_btn.configure(text="▶️ Sürdür")
+            self.log("⏸️ Duraklatıldı: işlenmekte olan dosyalar tamamlanıyor, yeni dosya başlatılmıyor")
+    
+    def cancel_processing(self):
+        """İşi iptal et; yazılmakta olan dosyalar tamamlanır, iş günlüğü sürdürmek için kalır"""
+        if not self.job:
+            return
+        self.job.cancel()
+        self.pause_btn.configure(state='disabled')
+        self.cancel_btn.configure(state='disabled')
+        self.log("⏹️ İptal ediliyor: yazılmakta olan dosyalar tamamlanıyor...")
+    
+    def set_progress_total(self, total):
+        """Tarama bitti: ilerleme çubuğu belirli moda geçer"""
+        self.progress.stop()
+        self.progress_total = total
+        self.progress.configure(mode='determinate', maximum=max(total, 1))
+        self.log(f"🔍 Tarama tamamlandı: {total} JPEG dosyası")
+    
+    def set_progress_value(self, done):
+        if self.progress_total is not None:
+            self.progress.configure(value=done)
+    
+    def process_files(self, task, spec, sources, sniff, job_path, resume=False, only_needed=False):
+        """Dosyaları bulundukça işle, (başarılı, hatalı) döndür; yarıda kalırsa sürdürülebilir"""
+        
+        def on_start(i, file_path):
+            self.log(f"🔄 İşleniyor: {os.path.basename(file_path)}")
+        
+        def on_result(i, result):
+            filename = os.path.basename(result.path)
+            if result.skipped:
+                self.log(f"⏭️ Atlandı (değişmemiş): {filename}")
+            elif result.ok:
+                if 'backup' in result.actions:
+                    if result.backends['backup'] == DELTA:
+                        self.log(f"💾 Başlık yedeği günlüğe yazıldı: {filename}")
+                    else:
+                        self.log(f"💾 Yedek oluşturuldu ({result.backends['backup']}): {filename}.backup")
+                if 'fix_exif' in result.actions:
                     self.log(f"✅ EXIF orientation düzeltildi: {filename}")
-                
-                # Döndürme işlemi
-                if self.rotate_var.get():
-                    self.rotate_image(file_path)
+                if 'rotate' in result.actions:
                     self.log(f"🔄 90° döndürüldü: {filename}")
-                
-                success_count += 1
                 self.log(f"✅ Tamamlandı: {filename}")
-                
-            except Exception as e:
-                error_count += 1
-                filename = os.path.basename(file_path)
-                self.log(f"❌ Hata ({filename}): {str(e)}")
+            else:
+                self.log(f"❌ Hata ({filename}): {result.error}")
             
             # Progress bar güncelle
-            self.root.after(0, lambda i=i: self.progress.configure(value=i+1))
+            self.events.progress(i + 1)
+        
+        def on_total(total):
+            self.events.total(total)
         
-        # İşlem tamamlandı
-        self.root.after(0, self.processing_completed, success_count, error_count)
-    
-    def fix_exif_orientation(self, file_path):
-        """EXIF orientation bilgisini düzelt"""
         try:
-            # Önce exiftool ile deneme
-            result = subprocess.run([
-                'exiftool', '-Orientation=1', '-n', '-overwrite_original', file_path
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(result.returncode, 'exiftool')
-                
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            # exiftool çalışmazsa PIL ile deneme
-            try:
-                with Image.open(file_path) as img:
-                    # Mevcut EXIF verilerini oku
-                    exif_data = img.getexif()
-                    
-                    if exif_data:
-                        # PIL için piexif kullan
-                        exif_dict = piexif.load(img.info.get('exif', b''))
-                        # Orientation değerini 1 yap (normal)
-                        exif_dict['0th'][piexif.ImageIFD.Orientation] = 1
-                        exif_bytes = piexif.dump(exif_dict)
-                        
-                        # Görüntüyü kaydet
-                        img.save(file_path, exif=exif_bytes, quality=95, optimize=True)
-                    else:
-                        # EXIF verisi yoksa basit kaydetme
-                        img.save(file_path, quality=95, optimize=True)
-                        
-            except Exception as pil_error:
-                raise Exception(f"EXIF orientation düzeltilemedi: {str(pil_error)}")
-    
-    def rotate_image(self, file_path):
-        """Görüntüyü 90 derece saat yönünde döndür"""
+            if resume:
+                job = JobJournal.resume(job_path)
+                spec, sources, sniff = job.spec, job.sources, job.sniff
+                self.log(f"⏯️ İş sürdürülüyor: {len(job.completed)} dosya zaten tamamlanmış")
+            else:
+                if only_needed:
+                    # Yalnızca planı boş olmayan dosyalar işlenir (ve yedeklenir)
+                    report = self.run_audit(spec, sources, sniff)
+                    if not report.paths:
+                        self.log("✅ Değişmesi gereken dosya yok")
+                        return report.files - len(report.errors), len(report.errors)
+                    sources = report.paths
+                job = JobJournal.create(job_path, spec, sources, sniff)
+        except (OSError, JobError) as e:
+            self.log(f"❌ İş günlüğü açılamadı: {e}")
+            return 0, 0
+        
+        # Kaynaklar bir dosya listesi olabilir; kök klasör iş günlüğünün klasörüdür
+        root = os.path.dirname(job_path)
+        manifest = Manifest(root) if spec.incremental else None
+        journal = None
+        if spec.backup and spec.backup_mode == DELTA:
+            journal = DeltaJournal(default_journal_path(root))
+        pipeline = None
         try:
-            # macOS'ta sips komutunu kullan (daha hızlı)
-            result = subprocess.run([
-                'sips', '-r', '90', file_path
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(result.returncode, 'sips')
-                
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            # sips çalışmazsa PIL kullan
-            try:
-                with Image.open(file_path) as img:
-                    # 90 derece saat yönünde döndür
-                    rotated = img.rotate(-90, expand=True)
-                    
-                    # EXIF verilerini koru
-                    exif = img.info.get('exif')
-                    if exif:
-                        rotated.save(file_path, exif=exif, quality=95, optimize=True)
-                    else:
-                        rotated.save(file_path, quality=95, optimize=True)
-                        
-            except Exception as pil_error:
-                raise Exception(f"Döndürme işlemi başarısız: {str(pil_error)}")
+            # Tarama, yedekleme, dönüşüm ve doğrulama sınırlı kuyruklarla eşzamanlı ilerler
+            pipeline = task.pipeline(spec, sniff=sniff)
+            success_count, error_count = pipeline.run(
+                sources, on_start=on_start, on_result=on_result, on_total=on_total, manifest=manifest,
+                journal=journal, job=job, stats=self.stats)
+        finally:
+            # Kesintisiz biten işin günlüğü silinir; aksi halde bir sonraki başlatmada sürdürülür
+            if pipeline and pipeline.completed:
+                job.finish()
+            else:
+                job.close()
+            if manifest:
+                manifest.close()
+            if journal:
+                journal.close()
+                if journal.records:
+                    self.log(f"🧾 Delta günlüğü: {journal.path} ({journal.records} kayıt)")
+        
+        return success_count, error_count
+    
+    def job_finished(self, job):
+        """İş bittiğinde, iptal edildiğinde veya hata verdiğinde (arayüz thread'inde) çağrılır"""
+        self.job = None
+        self.pause_btn.configure(state='disabled', text="⏸️ Duraklat")
+        self.cancel_btn.configure(state='disabled')
+        if job.error:
+            self.log(f"❌ İş hatası: {job.error}")
+        if job.result is None:
+            # Hat başlamadan iptal edildi veya hata verdi
+            self.process_btn.configure(state='normal', text="🚀 İşlemleri Başlat")
+            self.progress.stop()
+            self.progress.configure(mode='determinate', value=0)
+            self.events.close_log()
+            return
+        self.processing_completed(*job.result, cancelled=job.state == CANCELLED)
     
-    def processing_completed(self, success_count, error_count):
+    def processing_completed(self, success_count, error_count, cancelled=False):
         """İşlem tamamlandığında çağrılır"""
         self.process_btn.configure(state='normal', text="🚀 İşlemleri Başlat")
-        self.progress.configure(value=0)
+        self.progress.stop()
+        self.progress.configure(mode='determinate', value=0)
+        
+        if cancelled:
+            self.log(f"⏹️ İş iptal edildi: {success_count} başarılı, {error_count} hatalı; "
+                     "kalan dosyalar bir sonraki başlatmada sürdürülebilir")
+            self.events.close_log()
+            return
+        
+        if success_count + error_count == 0:
+            messagebox.showwarning("Uyarı", "Seçilen konumlarda JPEG dosyası bulunamadı!")
+            self.log("⚠️ JPEG dosyası bulunamadı")
+            self.events.close_log()
+            return
         
         if error_count == 0:
             icon = "🎉"
@@ -376,20 +574,52 @@ class JPEGOrientationFixer:
             message += f"❌ Hatalı: {error_count} dosya\n\n"
             message += "Detaylar için işlem geçmişine bakın."
         
+        files_per_second, mb_per_second = self.stats.rates()
+        self.stats_var.set(f"{self.stats.files} dosya · {self.stats.elapsed:.1f} sn · "
+                           f"{files_per_second:.1f} dosya/sn · {mb_per_second:.1f} MB/sn")
         messagebox.showinfo(title, message)
+        self.log("⏱️ Aşama süreleri:")
+        for line in self.stats.format_stages():
+            self.log(f"   {line}")
+        for line in self.stats.format_encodes():
+            self.log(f"🎞️ Yeniden kodlama: {line}")
+        memory = self.stats.format_memory()
+        if memory:
+            self.log(f"🧠 Bellek: {memory}")
+        if self.log_path:
+            # Makine tarafından okunabilir özet tam günlüğün yanına yazılır
+            summary_path = os.path.splitext(self.log_path)[0] + '.json'
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats.to_dict(), f, ensure_ascii=False, indent=2)
+            self.log(f"📝 Özet: {summary_path}")
         self.log(f"\n🏁 İşlem tamamlandı: {success_count} başarılı, {error_count} hatalı\n" + "="*50)
+        self.events.close_log()
     
     def log(self, message):
-        """Log mesajı ekle"""
-        def add_log():
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.log_text.see(tk.END)
-            self.root.update_idletasks()
-        
-        if threading.current_thread() == threading.main_thread():
-            add_log()
-        else:
-            self.root.after(0, add_log)
+        """Log mesajı ekle (herhangi bir thread'den çağrılabilir)"""
+        self.events.log(message)
+    
+    def drain_events(self):
+        """Olay kuyruğunu boşalt: kare başına tek ekleme, tek kaydırma, tek ilerleme güncellemesi"""
+        if self.stats and self.stats.finished is None:
+            self.stats_var.set(self.stats.format_live())
+        frame = self.events.drain()
+        if frame:
+            lines = frame.lines
+            if frame.dropped:
+                lines.insert(0, f"⏩ ... {frame.dropped} satır atlandı")
+            if lines:
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                # Halka tampon: görünümde en fazla LOG_LINES satır tutulur
+                self.log_text.delete("1.0", f"end-{LOG_LINES + 1}l")
+                self.log_text.see(tk.END)
+            if frame.total is not None:
+                self.set_progress_total(frame.total)
+            if frame.progress is not None:
+                self.set_progress_value(frame.progress)
+            for function, args in frame.calls:
+                function(*args)
+        self.root.after(FRAME_INTERVAL_MS, self.drain_events)
 
 def main():
     """Ana fonksiyon"""
@@ -413,11 +643,24 @@ def main():
     app.log("🔧 JPEG Orientation Fixer başlatıldı")
     app.log("📋 Kullanım: Dosyalarınızı seçin, işlem seçeneklerini belirleyin ve başlatın")
     
+    def close_when_idle():
+        # Yazılmakta olan dosyalar bitmeden pencere kapanmaz
+        if app.scheduler.active:
+            root.after(200, close_when_idle)
+            return
+        root.quit()
+        root.destroy()
+    
     def on_closing():
-        """Uygulama kapanırken"""
-        if messagebox.askokcancel("Çıkış", "Uygulamayı kapatmak istediğinizden emin misiniz?"):
-            root.quit()
-            root.destroy()
+        """Uygulama kapanırken; süren iş iptal edilir, yazılmakta olan dosyalar tamamlanır"""
+        if app.scheduler.active:
+            if messagebox.askokcancel("Çıkış", "İşlem sürüyor. İptal edip çıkmak istiyor musunuz?\n"
+                                               "Yazılmakta olan dosyalar tamamlanır, kalanlar sonra sürdürülebilir."):
+                app.log("⏹️ Çıkılıyor: yazılmakta olan dosyalar tamamlanıyor...")
+                app.scheduler.cancel_all()
+                close_when_idle()
+        elif messagebox.askokcancel("Çıkış", "Uygulamayı kapatmak istediğinizden emin misiniz?"):
+            close_when_idle()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
     
@@ -8,12 +8,26 @@ Drag & drop arayüzü ile kolayca kullanılabilir.
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-import sys
-import subprocess
 import threading
+import json
 from pathlib import Path
-from PIL import Image, ImageTk
-import piexif
+from jpegto.core import JobSpec, PIXELS, VIRTUAL
+from jpegto.backup import COPY, DELTA
+from jpegto.delta import DeltaJournal, default_journal_path
+from jpegto.events import FRAME_INTERVAL_MS, LOG_LINES, EventQueue, default_log_path
+from jpegto.jobs import JobError, JobJournal, default_job_path
+from jpegto.manifest import Manifest, default_root
+from jpegto.priority import FIFO, SMALLEST, FOCUS, FileOrder
+from jpegto.scheduler import CANCELLED, PAUSED, Scheduler
+from jpegto.stats import RunStats
+from jpegto import capabilities
+
+# Dosya sırası seçenekleri (arayüz etiketi -> sıra)
+ORDER_LABELS = {
+    "Bulunma sırası": FIFO,
+    "Küçük dosyalar önce": SMALLEST,
+    "Seçilen klasör önce": FOCUS,
+}
 
 class JPEGOrientationFixer:
     def __init__(self, root):
@@ -26,8 +40,19 @@ class JPEGOrientationFixer:
         style = ttk.Style()
         style.theme_use('clam')
         
+        # İşçi thread'lerin günlük ve ilerleme olayları; arayüz sabit kare hızında boşaltır
+        self.events = EventQueue()
+        # Çalışan işin verim ve aşama süreleri
+        self.stats = None
+        self.log_path = None
+        # İşler duraklatılabilir/iptal edilebilir; pencere kapanırken yazmalar tamamlanır
+        self.scheduler = Scheduler()
+        self.job = None
+        
         self.setup_ui()
-        self.check_exiftool()
+        self.root.after(FRAME_INTERVAL_MS, self.drain_events)
+        # Arka uç yoklaması pencere çizildikten sonra arka planda yapılır
+        self.root.after_idle(self.check_exiftool)
         
     def setup_ui(self):
         # Ana frame
@@ -71,6 +96,11 @@ class JPEGOrientationFixer:
                                            command=self.select_folder, width=15)
         self.select_folder_btn.grid(row=0, column=1, padx=5)
         
+        # Deneme: yalnızca başlıkları tara
+        self.audit_btn = ttk.Button(buttons_frame, text="Başlıkları Tara", 
+                                    command=self.start_audit, width=15)
+        self.audit_btn.grid(row=0, column=2, padx=5)
+        
         # Seçenekler frame'i
         options_frame = ttk.LabelFrame(main_frame, text="Seçenekler", padding="10")
         options_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
@@ -87,25 +117,86 @@ class JPEGOrientationFixer:
                                       variable=self.rotate_var)
         rotate_check.grid(row=1, column=0, sticky=tk.W, pady=2)
         
+        # Sanal döndürme: pikseller yerine yalnızca Orientation etiketi
+        self.virtual_var = tk.BooleanVar(value=False)
+        virtual_check = ttk.Checkbutton(options_frame, text="Döndürmeyi yalnızca Orientation etiketiyle yap (pikseller değişmez)", 
+                                       variable=self.virtual_var)
+        virtual_check.grid(row=2, column=0, sticky=tk.W, pady=2)
+        
         # Orijinal dosyaları yedekle
         self.backup_var = tk.BooleanVar(value=True)
         backup_check = ttk.Checkbutton(options_frame, text="Orijinal dosyaları yedekle (önerilen)", 
                                       variable=self.backup_var)
-        backup_check.grid(row=2, column=0, sticky=tk.W, pady=2)
-        
-        # İşlem butonu
-        self.process_btn = ttk.Button(main_frame, text="İşlemleri Başlat", 
+        backup_check.grid(row=3, column=0, sticky=tk.W, pady=2)
+        
+        # Daha önce aynı işlemle işlenmiş ve değişmemiş dosyaları atla
+        self.incremental_var = tk.BooleanVar(value=False)
+        incremental_check = ttk.Checkbutton(options_frame, text="Daha önce işlenmiş dosyaları atla (manifesto ile)", 
+                                           variable=self.incremental_var)
+        incremental_check.grid(row=4, column=0, sticky=tk.W, pady=2)
+        
+        # Uzantısı yanlış JPEG'leri imzadan tanı
+        self.sniff_var = tk.BooleanVar(value=False)
+        sniff_check = ttk.Checkbutton(options_frame, text="Klasör taramasında uzantısı yanlış JPEG'leri de bul (FF D8 FF imzası)", 
+                                     variable=self.sniff_var)
+        sniff_check.grid(row=5, column=0, sticky=tk.W, pady=2)
+        
+        # Yalnızca etiketi değişecek dosyalarda tam kopya yerine başlık yedeği
+        self.delta_var = tk.BooleanVar(value=False)
+        delta_check = ttk.Checkbutton(options_frame, text="Yedekte yalnızca değişen başlığı sakla (delta günlüğü, geri yükleme: python3 -m jpegto --restore)", 
+                                     variable=self.delta_var)
+        delta_check.grid(row=6, column=0, sticky=tk.W, pady=2)
+        
+        self.full_log_var = tk.BooleanVar(value=False)
+        full_log_check = ttk.Checkbutton(options_frame, text="Tüm işlem günlüğünü ayrıca diske yaz (.jpegto-….log)", 
+                                        variable=self.full_log_var)
+        full_log_check.grid(row=7, column=0, sticky=tk.W, pady=2)
+        
+        # Önce başlıklar taranır; Orientation'ı zaten doğru dosyalar yazma için açılmaz
+        self.only_needed_var = tk.BooleanVar(value=False)
+        only_needed_check = ttk.Checkbutton(options_frame, text="Önce başlıkları tara, yalnızca değişecek dosyaları işle (yedek de yalnızca onlara)", 
+                                           variable=self.only_needed_var)
+        only_needed_check.grid(row=8, column=0, sticky=tk.W, pady=2)
+        
+        # İşlem butonları ve dosya sırası
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.grid(row=5, column=0, columnspan=2, pady=20)
+        
+        self.process_btn = ttk.Button(controls_frame, text="İşlemleri Başlat", 
                                      command=self.start_processing, 
                                      style='Accent.TButton')
-        self.process_btn.grid(row=5, column=0, columnspan=2, pady=20)
+        self.process_btn.grid(row=0, column=0, padx=8)
+        
+        self.pause_btn = ttk.Button(controls_frame, text="Duraklat", 
+                                   command=self.toggle_pause, state='disabled', width=10)
+        self.pause_btn.grid(row=0, column=1, padx=8)
+        
+        self.cancel_btn = ttk.Button(controls_frame, text="İptal", 
+                                    command=self.cancel_processing, state='disabled', width=10)
+        self.cancel_btn.grid(row=0, column=2, padx=8)
+        
+        # Sıra çalışırken de değiştirilebilir; bekleyen dosyalar yeniden sıralanır
+        ttk.Label(controls_frame, text="Sıra:").grid(row=0, column=3, padx=(16, 4))
+        self.order_var = tk.StringVar(value=next(iter(ORDER_LABELS)))
+        self.order_label = self.order_var.get()
+        self.order_focus = None
+        order_box = ttk.Combobox(controls_frame, textvariable=self.order_var, values=list(ORDER_LABELS),
+                                 state='readonly', width=20)
+        order_box.grid(row=0, column=4)
+        order_box.bind('<<ComboboxSelected>>', self.order_changed)
         
         # Progress bar
         self.progress = ttk.Progressbar(main_frame, mode='determinate')
         self.progress.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
+        # Canlı verim: dosya/sn, MB/sn, kalan süre
+        self.stats_var = tk.StringVar(value="")
+        stats_label = ttk.Label(main_frame, textvariable=self.stats_var)
+        stats_label.grid(row=7, column=0, columnspan=2, sticky=tk.W)
+        
         # Log alanı
         log_frame = ttk.LabelFrame(main_frame, text="İşlem Geçmişi", padding="5")
-        log_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        log_frame.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
         self.log_text = tk.Text(log_frame, height=8, width=80, wrap=tk.WORD)
         scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
@@ -118,14 +209,14 @@ class JPEGOrientationFixer:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(7, weight=1)
+        main_frame.rowconfigure(8, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         
         # Drag & Drop bağlamaları
         self.setup_drag_drop()
         
-        self.selected_files = []
+        self.selected_sources = []
         
     def setup_drag_drop(self):
         """Drag & Drop işlevselliğini ayarla"""
@@ -165,24 +256,10 @@ class JPEGOrientationFixer:
     
     def process_dropped_files(self, files):
         """Sürüklenen dosyaları işle"""
-        jpeg_files = []
-        for file_path in files:
-            if os.path.isfile(file_path):
-                if file_path.lower().endswith(('.jpg', '.jpeg')):
-                    jpeg_files.append(file_path)
-            elif os.path.isdir(file_path):
-                # Klasördeki JPEG dosyalarını bul
-                for root, dirs, files in os.walk(file_path):
-                    for file in files:
-                        if file.lower().endswith(('.jpg', '.jpeg')):
-                            jpeg_files.append(os.path.join(root, file))
-        
-        if jpeg_files:
-            self.selected_files = jpeg_files
-            self.update_drop_label()
-            self.log(f"{len(jpeg_files)} JPEG dosyası seçildi")
-        else:
-            messagebox.showwarning("Uyarı", "Seçilen dosyalar arasında JPEG dosyası bulunamadı!")
+        # Klasörler ve JPEG olmayan dosyalar işlem sırasında taranıp elenir
+        self.selected_sources = list(files)
+        self.update_drop_label()
+        self.log(f"{self.describe_sources()} seçildi")
     
     def select_files(self):
         """Dosya seçme diyaloğu"""
@@ -191,7 +268,7 @@ class JPEGOrientationFixer:
             filetypes=[("JPEG files", "*.jpg *.jpeg"), ("All files", "*.*")]
         )
         if files:
-            self.selected_files = list(files)
+            self.selected_sources = list(files)
             self.update_drop_label()
             self.log(f"{len(files)} dosya seçildi")
     
@@ -199,65 +276,89 @@ class JPEGOrientationFixer:
         """Klasör seçme diyaloğu"""
         folder = filedialog.askdirectory(title="JPEG dosyalarının bulunduğu klasörü seçin")
         if folder:
-            jpeg_files = []
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith(('.jpg', '.jpeg')):
-                        jpeg_files.append(os.path.join(root, file))
-            
-            if jpeg_files:
-                self.selected_files = jpeg_files
-                self.update_drop_label()
-                self.log(f"{folder} klasöründe {len(jpeg_files)} JPEG dosyası bulundu")
-            else:
-                messagebox.showwarning("Uyarı", "Seçilen klasörde JPEG dosyası bulunamadı!")
+            # Klasör işlem sırasında taranır; dosyalar bulundukça işlenir
+            self.selected_sources = [folder]
+            self.update_drop_label()
+            self.log(f"{folder} klasörü seçildi")
+    
+    def describe_sources(self):
+        """Seçilen dosya ve klasörlerin kısa açıklaması"""
+        folders = sum(1 for path in self.selected_sources if os.path.isdir(path))
+        files = len(self.selected_sources) - folders
+        parts = []
+        if folders:
+            parts.append(f"{folders} klasör")
+        if files:
+            parts.append(f"{files} dosya")
+        return ", ".join(parts)
     
     def update_drop_label(self):
         """Drop alanının etiketini güncelle"""
-        if self.selected_files:
-            count = len(self.selected_files)
-            self.drop_label.configure(text=f"{count} JPEG dosyası seçildi\n\nİşlemleri başlatmak için 'İşlemleri Başlat' butonuna tıklayın")
+        if self.selected_sources:
+            self.drop_label.configure(text=f"{self.describe_sources()} seçildi\n\nİşlemleri başlatmak için 'İşlemleri Başlat' butonuna tıklayın")
         else:
             self.drop_label.configure(text="JPEG dosyalarını buraya sürükleyip bırakın\n\nveya aşağıdaki butonları kullanın")
     
     def check_exiftool(self):
-        """exiftool'un yüklü olup olmadığını kontrol et"""
-        try:
-            result = subprocess.run(['exiftool', '-ver'], capture_output=True, text=True)
-            if result.returncode == 0:
-                self.log(f"exiftool bulundu (versiyon: {result.stdout.strip()})")
-                return True
-        except FileNotFoundError:
-            pass
+        """exiftool, sips ve kayıpsız motoru arka planda yokla (sonuç diskte önbelleğe alınır)"""
+        def probe():
+            self.events.call(self.backends_checked, capabilities.probe())
         
-        # exiftool yoksa Homebrew ile yüklemeyi öner
-        answer = messagebox.askyesno("exiftool bulunamadı", 
-                                   "EXIF orientation düzeltme için exiftool gerekli.\n\n"
-                                   "Homebrew ile yüklemek ister misiniz?\n"
-                                   "(Terminal: brew install exiftool)")
-        if answer:
-            self.install_exiftool()
-        return False
+        threading.Thread(target=probe, daemon=True).start()
     
-    def install_exiftool(self):
-        """exiftool'u Homebrew ile yükle"""
-        def install():
-            try:
-                self.log("exiftool yükleniyor...")
-                result = subprocess.run(['brew', 'install', 'exiftool'], 
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    self.log("exiftool başarıyla yüklendi!")
-                else:
-                    self.log(f"exiftool yükleme hatası: {result.stderr}")
-            except Exception as e:
-                self.log(f"Yükleme hatası: {str(e)}")
-        
-        threading.Thread(target=install, daemon=True).start()
+    def backends_checked(self, backends):
+        """Yoklama bitti: sonucu günlüğe yaz (exiftool isteğe bağlıdır, pencere açılmaz)"""
+        self.log(f"Döndürme arka uçları: kayıpsız ({backends.lossless}), "
+                 f"sips {'var' if backends.sips else 'yok'}, PIL")
+        version = backends.exiftool
+        if version:
+            self.log(f"exiftool bulundu (versiyon: {version})")
+        else:
+            self.log("exiftool bulunamadı, yerleşik EXIF yamalayıcı kullanılacak")
+    
+    def build_spec(self):
+        """Seçeneklerden iş tanımını oluştur"""
+        return JobSpec(
+            fix_exif=self.fix_exif_var.get(),
+            rotate=self.rotate_var.get(),
+            backup=self.backup_var.get(),
+            rotate_mode=VIRTUAL if self.virtual_var.get() else PIXELS,
+            backup_mode=DELTA if self.delta_var.get() else COPY,
+            incremental=self.incremental_var.get(),
+        )
+    
+    def start_audit(self):
+        """Deneme: başlıkları tara, hiçbir dosyaya yazma"""
+        if not self.selected_sources:
+            messagebox.showwarning("Uyarı", "Lütfen önce dosyaları seçin!")
+            return
+        
+        if not self.fix_exif_var.get() and not self.rotate_var.get():
+            messagebox.showwarning("Uyarı", "Lütfen en az bir işlem seçin!")
+            return
+        
+        self.audit_btn.configure(state='disabled')
+        threading.Thread(target=self.run_audit,
+                         args=(self.build_spec(), list(self.selected_sources), self.sniff_var.get()),
+                         daemon=True).start()
+    
+    def run_audit(self, spec, sources, sniff):
+        """Başlıkları tara, histogramı günlüğe yaz; denetim raporunu döndür"""
+        from jpegto.audit import audit
+        
+        self.log("Başlıklar taranıyor...")
+        report = audit(spec, sources, sniff)
+        self.log(f"{report.files} dosya tarandı, {len(report.paths)} dosya işlem gerektiriyor")
+        for line in report.format_histogram():
+            self.log(f"   {line}")
+        for path, error in report.errors[:20]:
+            self.log(f"Başlık okunamadı ({os.path.basename(path)}): {error}")
+        self.events.call(self.audit_btn.configure, {'state': 'normal'})
+        return report
     
     def start_processing(self):
         """İşlemleri başlat"""
-        if not self.selected_files:
+        if not self.selected_sources:
             messagebox.showwarning("Uyarı", "Lütfen önce dosyaları seçin!")
             return
         
@@ -265,119 +366,275 @@ class JPEGOrientationFixer:
             messagebox.showwarning("Uyarı", "Lütfen en az bir işlem seçin!")
             return
         
-        # İşlemi ayrı thread'de çalıştır
+        # Yarıda kalmış bir iş varsa kaldığı yerden sürdürülebilir
+        job_path = default_job_path(default_root(self.selected_sources))
+        resume = False
+        if os.path.exists(job_path):
+            answer = messagebox.askyesnocancel(
+                "Yarıda Kalmış İş",
+                "Bu konumda yarıda kalmış bir iş bulundu.\n\n"
+                "Evet: kaldığı yerden sürdür (önceki işin seçenekleriyle)\n"
+                "Hayır: yok say ve yeni iş başlat")
+            if answer is None:
+                return
+            if answer:
+                resume = True
+            else:
+                os.remove(job_path)
+        
+        # Seçenekler ana thread'de okunur, işçi thread tkinter değişkenlerine dokunmaz
+        spec = self.build_spec()
+        
+        self.log_path = None
+        if self.full_log_var.get():
+            self.log_path = self.events.open_log(default_log_path(default_root(self.selected_sources)))
+            self.log(f"Tam günlük: {self.log_path}")
+        self.stats = RunStats()
+        self.stats_var.set("")
+        
+        # İşlem zamanlayıcıda ayrı bir işte çalışır (duraklatılabilir, iptal edilebilir)
         self.process_btn.configure(state='disabled')
-        threading.Thread(target=self.process_files, daemon=True).start()
+        self.pause_btn.configure(state='normal', text="Duraklat")
+        self.cancel_btn.configure(state='normal')
+        # Toplam dosya sayısı tarama bitene kadar bilinmez
+        self.progress_total = None
+        self.progress.configure(mode='indeterminate', value=0)
+        self.progress.start(15)
+        self.job = self.scheduler.submit(
+            self.process_files,
+            args=(spec, list(self.selected_sources), self.sniff_var.get(), job_path, resume,
+                  self.only_needed_var.get()),
+            order=self.current_order(),
+            on_done=lambda job: self.events.call(self.job_finished, job))
     
-    def process_files(self):
-        """Dosyaları işle"""
-        total_files = len(self.selected_files)
-        self.progress.configure(maximum=total_files)
-        
-        success_count = 0
-        error_count = 0
-        
-        for i, file_path in enumerate(self.selected_files):
-            try:
-                self.log(f"İşleniyor: {os.path.basename(file_path)}")
-                
-                # Yedek oluştur
-                if self.backup_var.get():
-                    backup_path = file_path + '.backup'
-                    if not os.path.exists(backup_path):
-                        subprocess.run(['cp', file_path, backup_path], check=True)
-                
-                # EXIF orientation düzelt
-                if self.fix_exif_var.get():
-                    self.fix_exif_orientation(file_path)
-                
-                # Döndürme işlemi
-                if self.rotate_var.get():
-                    self.rotate_image(file_path)
-                
-                success_count += 1
-                self.log(f"✓ Tamamlandı: {os.path.basename(file_path)}")
-                
-            except Exception as e:
-                error_count += 1
-                self.log(f"✗ Hata ({os.path.basename(file_path)}): {str(e)}")
+    def current_order(self):
+        """Seçili dosya sırası (FileOrder)"""
+        order = ORDER_LABELS[self.order_var.get()]
+        return FileOrder(order, self.order_focus if order == FOCUS else None)
+    
+    def order_changed(self, event=None):
+        """Sıra değişti: odak klasörü sor, çalışan işe uygula"""
+        order = ORDER_LABELS[self.order_var.get()]
+        if order == FOCUS:
+            folder = filedialog.askdirectory(title="Önce işlenecek klasörü seçin")
+            if not folder:
+                # Vazgeçildi: önceki sıra geri gelir
+                self.order_var.set(self.order_label)
+                return
+            self.order_focus = folder
+        self.order_label = self.order_var.get()
+        if self.job:
+            self.job.set_order(order, self.order_focus if order == FOCUS else None)
+            self.log(f"Sıra: {self.order_var.get()}" + (f" ({self.order_focus})" if order == FOCUS else ""))
+    
+    def toggle_pause(self):
+        """Duraklat/sürdür; işlenmekte olan dosyalar tamamlanır"""
+        if not self.job:
+            return
+        if self.job.state == PAUSED:
+            self.job.resume()
+            self.pause_btn.configure(text="Duraklat")
+            self.log("Sürdürülüyor")
+        else:
+            self.job.pause()
+            self.pause_btn.configure(text="Sürdür")
+            self.log("Duraklatıldı: işlenmekte olan dosyalar tamamlanıyor, yeni dosya başlatılmıyor")
+    
+    def cancel_processing(self):
+        """İşi iptal et; yazılmakta olan dosyalar tamamlanır, iş günlüğü sürdürmek için kalır"""
+        if not self.job:
+            return
+        self.job.cancel()
+        self.pause_btn.configure(state='disabled')
+        self.cancel_btn.configure(state='disabled')
+        self.log("İptal ediliyor: yazılmakta olan dosyalar tamamlanıyor...")
+    
+    def set_progress_total(self, total):
+        """Tarama bitti: ilerleme çubuğu belirli moda geçer"""
+        self.progress.stop()
+        self.progress_total = total
+        self.progress.configure(mode='determinate', maximum=max(total, 1))
+        self.log(f"Tarama tamamlandı: {total} JPEG dosyası")
+    
+    def set_progress_value(self, done):
+        if self.progress_total is not None:
+            self.progress.configure(value=done)
+    
+    def process_files(self, task, spec, sources, sniff, job_path, resume=False, only_needed=False):
+        """Dosyaları bulundukça işle, (başarılı, hatalı) döndür; yarıda kalırsa sürdürülebilir"""
+        
+        def on_start(i, file_path):
+            self.log(f"İşleniyor: {os.path.basename(file_path)}")
+        
+        def on_result(i, result):
+            if result.skipped:
+                self.log(f"Atlandı (değişmemiş): {os.path.basename(result.path)}")
+            elif result.ok:
+                self.log(f"✓ Tamamlandı: {os.path.basename(result.path)}")
+            else:
+                self.log(f"✗ Hata ({os.path.basename(result.path)}): {result.error}")
             
             # Progress bar güncelle
-            self.root.after(0, lambda: self.progress.configure(value=i+1))
+            self.events.progress(i + 1)
+        
+        def on_total(total):
+            self.events.total(total)
         
-        # İşlem tamamlandı
-        self.root.after(0, self.processing_completed, success_count, error_count)
-    
-    def fix_exif_orientation(self, file_path):
-        """EXIF orientation bilgisini düzelt"""
         try:
-            # exiftool ile orientation'ı 1 yap
-            result = subprocess.run([
-                'exiftool', '-Orientation=1', '-n', '-overwrite_original', file_path
-            ], capture_output=True, text=True, check=True)
-        except subprocess.CalledProcessError as e:
-            # exiftool yoksa PIL ile deneme
-            try:
-                with Image.open(file_path) as img:
-                    # EXIF verilerini oku
-                    exif_data = piexif.load(img.info.get('exif', b''))
-                    
-                    # Orientation değerini 1 yap
-                    exif_data['0th'][piexif.ImageIFD.Orientation] = 1
-                    
-                    # EXIF verilerini geri yaz
-                    exif_bytes = piexif.dump(exif_data)
-                    img.save(file_path, exif=exif_bytes, quality=95)
-            except Exception:
-                raise Exception("EXIF orientation düzeltilemedi")
-    
-    def rotate_image(self, file_path):
-        """Görüntüyü 90 derece döndür"""
-        # macOS'ta sips komutunu kullan
+            if resume:
+                job = JobJournal.resume(job_path)
+                spec, sources, sniff = job.spec, job.sources, job.sniff
+                self.log(f"İş sürdürülüyor: {len(job.completed)} dosya zaten tamamlanmış")
+            else:
+                if only_needed:
+                    # Yalnızca planı boş olmayan dosyalar işlenir (ve yedeklenir)
+                    report = self.run_audit(spec, sources, sniff)
+                    if not report.paths:
+                        self.log("Değişmesi gereken dosya yok")
+                        return report.files - len(report.errors), len(report.errors)
+                    sources = report.paths
+                job = JobJournal.create(job_path, spec, sources, sniff)
+        except (OSError, JobError) as e:
+            self.log(f"HATA: İş günlüğü açılamadı: {e}")
+            return 0, 0
+        
+        # Kaynaklar bir dosya listesi olabilir; kök klasör iş günlüğünün klasörüdür
+        root = os.path.dirname(job_path)
+        manifest = Manifest(root) if spec.incremental else None
+        journal = None
+        if spec.backup and spec.backup_mode == DELTA:
+            journal = DeltaJournal(default_journal_path(root))
+        pipeline = None
         try:
-            result = subprocess.run([
-                'sips', '-r', '90', file_path
-            ], capture_output=True, text=True, check=True)
-        except subprocess.CalledProcessError:
-            # sips çalışmazsa PIL kullan
-            with Image.open(file_path) as img:
-                rotated = img.rotate(-90, expand=True)
-                rotated.save(file_path, quality=95)
+            # Tarama, yedekleme, dönüşüm ve doğrulama sınırlı kuyruklarla eşzamanlı ilerler
+            pipeline = task.pipeline(spec, sniff=sniff)
+            success_count, error_count = pipeline.run(
+                sources, on_start=on_start, on_result=on_result, on_total=on_total, manifest=manifest,
+                journal=journal, job=job, stats=self.stats)
+        finally:
+            # Kesintisiz biten işin günlüğü silinir; aksi halde bir sonraki başlatmada sürdürülür
+            if pipeline and pipeline.completed:
+                job.finish()
+            else:
+                job.close()
+            if manifest:
+                manifest.close()
+            if journal:
+                journal.close()
+                if journal.records:
+                    self.log(f"Delta günlüğü: {journal.path} ({journal.records} kayıt)")
+        
+        return success_count, error_count
+    
+    def job_finished(self, job):
+        """İş bittiğinde, iptal edildiğinde veya hata verdiğinde (arayüz thread'inde) çağrılır"""
+        self.job = None
+        self.pause_btn.configure(state='disabled', text="Duraklat")
+        self.cancel_btn.configure(state='disabled')
+        if job.error:
+            self.log(f"HATA: {job.error}")
+        if job.result is None:
+            # Hat başlamadan iptal edildi veya hata verdi
+            self.process_btn.configure(state='normal')
+            self.progress.stop()
+            self.progress.configure(mode='determinate', value=0)
+            self.events.close_log()
+            return
+        self.processing_completed(*job.result, cancelled=job.state == CANCELLED)
     
-    def processing_completed(self, success_count, error_count):
+    def processing_completed(self, success_count, error_count, cancelled=False):
         """İşlem tamamlandığında çağrılır"""
         self.process_btn.configure(state='normal')
-        self.progress.configure(value=0)
+        self.progress.stop()
+        self.progress.configure(mode='determinate', value=0)
+        
+        if cancelled:
+            self.log(f"--- İş iptal edildi: {success_count} başarılı, {error_count} hatalı; "
+                     "kalan dosyalar bir sonraki başlatmada sürdürülebilir ---")
+            self.events.close_log()
+            return
+        
+        if success_count + error_count == 0:
+            messagebox.showwarning("Uyarı", "Seçilen konumlarda JPEG dosyası bulunamadı!")
+            self.log("JPEG dosyası bulunamadı")
+            self.events.close_log()
+            return
         
         message = f"İşlem tamamlandı!\n\n"
         message += f"Başarılı: {success_count} dosya\n"
         if error_count > 0:
             message += f"Hatalı: {error_count} dosya"
         
+        files_per_second, mb_per_second = self.stats.rates()
+        self.stats_var.set(f"{self.stats.files} dosya · {self.stats.elapsed:.1f} sn · "
+                           f"{files_per_second:.1f} dosya/sn · {mb_per_second:.1f} MB/sn")
         messagebox.showinfo("Tamamlandı", message)
+        self.log("Aşama süreleri:")
+        for line in self.stats.format_stages():
+            self.log(f"   {line}")
+        for line in self.stats.format_encodes():
+            self.log(f"Yeniden kodlama: {line}")
+        memory = self.stats.format_memory()
+        if memory:
+            self.log(f"Bellek: {memory}")
+        if self.log_path:
+            # Makine tarafından okunabilir özet tam günlüğün yanına yazılır
+            summary_path = os.path.splitext(self.log_path)[0] + '.json'
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats.to_dict(), f, ensure_ascii=False, indent=2)
+            self.log(f"Özet: {summary_path}")
         self.log(f"--- İşlem tamamlandı: {success_count} başarılı, {error_count} hatalı ---")
+        self.events.close_log()
     
     def log(self, message):
-        """Log mesajı ekle"""
-        def add_log():
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.log_text.see(tk.END)
-        
-        if threading.current_thread() == threading.main_thread():
-            add_log()
-        else:
-            self.root.after(0, add_log)
+        """Log mesajı ekle (herhangi bir thread'den çağrılabilir)"""
+        self.events.log(message)
+    
+    def drain_events(self):
+        """Olay kuyruğunu boşalt: kare başına tek ekleme, tek kaydırma, tek ilerleme güncellemesi"""
+        if self.stats and self.stats.finished is None:
+            self.stats_var.set(self.stats.format_live())
+        frame = self.events.drain()
+        if frame:
+            lines = frame.lines
+            if frame.dropped:
+                lines.insert(0, f"... {frame.dropped} satır atlandı")
+            if lines:
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                # Halka tampon: görünümde en fazla LOG_LINES satır tutulur
+                self.log_text.delete("1.0", f"end-{LOG_LINES + 1}l")
+                self.log_text.see(tk.END)
+            if frame.total is not None:
+                self.set_progress_total(frame.total)
+            if frame.progress is not None:
+                self.set_progress_value(frame.progress)
+            for function, args in frame.calls:
+                function(*args)
+        self.root.after(FRAME_INTERVAL_MS, self.drain_events)
 
 def main():
     """Ana fonksiyon"""
     root = tk.Tk()
     app = JPEGOrientationFixer(root)
     
-    # Uygulama kapanırken temizlik
-    def on_closing():
+    def close_when_idle():
+        # Yazılmakta olan dosyalar bitmeden pencere kapanmaz
+        if app.scheduler.active:
+            root.after(200, close_when_idle)
+            return
         root.quit()
         root.destroy()
     
+    # Uygulama kapanırken temizlik; süren iş iptal edilir, yazılmakta olan dosyalar tamamlanır
+    def on_closing():
+        if app.scheduler.active:
+            if not messagebox.askokcancel("Çıkış", "İşlem sürüyor. İptal edip çıkmak istiyor musunuz?\n"
+                                                   "Yazılmakta olan dosyalar tamamlanır, kalanlar sonra sürdürülebilir."):
+                return
+            app.log("Çıkılıyor: yazılmakta olan dosyalar tamamlanıyor...")
+            app.scheduler.cancel_all()
+        close_when_idle()
+    
     root.protocol("WM_DELETE_WINDOW", on_closing)
     
     try:
@@ -0,0 +1,4 @@
+"""
+jpegto - JPEG orientation araçlarının ortak çekirdeği
+GUI script'leri (jpeg_fixer.py, jpeg_orientation_fixer.py) bu paketteki motorları kullanır.
+"""
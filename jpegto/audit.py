@@ -0,0 +1,147 @@
+"""
+Yalnızca başlık okuyan denetim (deneme çalıştırması)
+Her dosyanın SOS'a kadarki başlık segmentleri sınırlı okumalarla dolaşılır; Orientation,
+boyutlar ve EXIF varlığı çıkarılır, iş tanımına göre planlanır. Sonuç bir Orientation
+histogramı ve işlem gerektiren dosyaların listesidir. Liste doğrudan işleyiciye
+verilebilir: Orientation'ı zaten istenen değerde olan dosyalar yazma için hiç açılmaz.
+"""
+
+import collections
+import concurrent.futures
+
+from .core import iter_jpeg_paths
+from .jpegmeta import JPEGFormatError, read_header
+from .planner import NONE, plan
+
+# Aynı anda okunan başlık sayısı (işçi başına)
+INFLIGHT_PER_WORKER = 4
+
+
+class AuditEntry:
+    """Bir dosyanın başlık özeti ve planı"""
+
+    __slots__ = ('path', 'header', 'plan', 'error')
+
+    def __init__(self, path, header=None, file_plan=None, error=None):
+        self.path = path
+        # HeaderInfo; başlık okunamadıysa None
+        self.header = header
+        self.plan = file_plan
+        self.error = error
+
+    @property
+    def backend(self):
+        """Planı uygulayacak ilk (en ucuz) arka uç; plan yoksa None"""
+        return self.plan.backends()[0] if self.plan else None
+
+    @property
+    def needs_work(self):
+        return self.backend not in (None, NONE)
+
+    def to_dict(self):
+        data = {'path': self.path}
+        if self.header:
+            data.update(self.header.to_dict())
+        if self.plan:
+            data['transform'] = self.plan.transform
+            data['backend'] = self.backend
+        data['error'] = self.error
+        return data
+
+
+def audit_file(spec, path):
+    """Başlığı oku ve işleyicinin yapacağı planı hesapla; hatalar AuditEntry içinde döner"""
+    try:
+        header = read_header(path)
+    except JPEGFormatError as e:
+        # İşleyici de etiketi okuyamayan dosyayı etiketsiz sayar
+        return AuditEntry(path, file_plan=plan(spec, None), error=str(e))
+    except OSError as e:
+        return AuditEntry(path, error=str(e))
+    return AuditEntry(path, header, plan(spec, header.orientation))
+
+
+class AuditReport:
+    """Denetim özeti: Orientation histogramı, EXIF sayıları, arka uçlar ve işlem listesi"""
+
+    def __init__(self):
+        self.files = 0
+        self.orientations = collections.Counter()
+        self.exif = 0
+        self.backends = collections.Counter()
+        self.errors = []
+        # İşlem gerektiren dosyalar (tarama sırasıyla)
+        self.paths = []
+
+    def add(self, entry):
+        self.files += 1
+        if entry.error:
+            self.errors.append((entry.path, entry.error))
+        if entry.header:
+            self.orientations[entry.header.orientation] += 1
+            if entry.header.exif:
+                self.exif += 1
+        if entry.plan:
+            self.backends[entry.backend] += 1
+        if entry.needs_work:
+            self.paths.append(entry.path)
+
+    def format_histogram(self):
+        """Orientation histogramı ve arka uç dağılımı satırları"""
+        lines = []
+        width = max(self.orientations.values(), default=0)
+        for value in sorted(self.orientations, key=lambda value: (value is None, value or 0)):
+            count = self.orientations[value]
+            bar = '#' * max(1, round(count * 40 / width))
+            label = 'yok' if value is None else str(value)
+            lines.append(f"Orientation {label:>3}: {count:>7}  {bar}")
+        lines.append(f"EXIF var: {self.exif}, yok: {self.files - self.exif - len(self.errors)}")
+        lines.append("Plan: " + ", ".join(f"{backend} {count}" for backend, count in self.backends.most_common()))
+        return lines
+
+    def to_dict(self):
+        return {
+            'files': self.files,
+            'needs_work': len(self.paths),
+            'orientations': {'none' if value is None else str(value): count
+                             for value, count in self.orientations.items()},
+            'exif': self.exif,
+            'backends': dict(self.backends),
+            'errors': len(self.errors),
+        }
+
+
+def iter_audit(spec, sources, sniff=False, workers=8):
+    """Dosyaları bulundukça denetle; AuditEntry'leri tarama sırasıyla üret"""
+    window = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers),
+                                               thread_name_prefix='jpegto-audit') as executor:
+        for path in iter_jpeg_paths(sources, sniff=sniff):
+            window.append(executor.submit(audit_file, spec, path))
+            if len(window) >= workers * INFLIGHT_PER_WORKER:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def audit(spec, sources, sniff=False, workers=8, on_entry=None):
+    """Tüm kaynakları denetle ve AuditReport döndür"""
+    report = AuditReport()
+    for entry in iter_audit(spec, sources, sniff, workers):
+        report.add(entry)
+        if on_entry:
+            on_entry(entry)
+    return report
+
+
+def write_list(path, paths):
+    """İşlem listesini satır başına bir yol olarak yaz"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for file_path in paths:
+            f.write(file_path + '\n')
+
+
+def read_list(path):
+    """write_list ile yazılmış listeyi oku (boş satırlar atlanır)"""
+    with open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
@@ -0,0 +1,261 @@
+"""
+Süreç içi yedekleme motoru
+Her dosya için `cp` çalıştırmak yerine kopya bu süreçte yapılır. Önce FICLONE ile
+reflink (btrfs/XFS: veri paylaşılır, disk kullanımı artmaz), sonra çekirdek içi
+kopya (copy_file_range, sendfile), en son tamponlu kopya denenir. Desteklenmeyen
+stratejiler aygıt başına hatırlanır ve bir daha denenmez. Yedeğin var olup olmadığı
+klasör başına tek bir listeleme ile kontrol edilir; listede görünen yedek yine de
+lstat ile doğrulanır (uzun ömürlü süreçlerde silinmiş yedekler yeniden oluşturulur).
+"""
+
+import collections
+import errno
+import os
+import sys
+import tempfile
+import threading
+
+from . import trace
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+
+BACKUP_SUFFIX = '.backup'
+
+# Yedekleme modları
+COPY = 'copy'     # dosyanın tam kopyası (.backup)
+DELTA = 'delta'   # yalnızca başlık, çalıştırma günlüğüne (bkz. delta.py)
+BACKUP_MODES = (COPY, DELTA)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+REFLINK = 'reflink'
+COPY_FILE_RANGE = 'copy_file_range'
+SENDFILE = 'sendfile'
+BUFFERED = 'buffered'
+
+BUFFER_SIZE = 1024 * 1024
+
+# Bu kadar klasörün yedek listesi bellekte tutulur
+LISTING_CACHE_SIZE = 64
+
+# Stratejinin bu dosya sisteminde desteklenmediğini gösteren hatalar
+UNSUPPORTED_ERRNOS = {
+    errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EPERM,
+}
+
+
+def _reflink(src, dst, size):
+    fcntl.ioctl(dst, FICLONE, src)
+
+
+def _copy_file_range(src, dst, size):
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(src, dst, size - offset, offset, offset)
+        if copied == 0:
+            break
+        offset += copied
+
+
+def _sendfile(src, dst, size):
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst, src, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _buffered(src, dst, size):
+    while True:
+        chunk = os.read(src, BUFFER_SIZE)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst, view):]
+
+
+def copy_range(src, dst, offset, count):
+    """src'nin [offset, offset+count) aralığını dst'nin geçerli konumuna çekirdek içinde kopyala
+
+    Veri Python nesnelerinden geçmez (copy_file_range, olmazsa sendfile); ikisi de
+    desteklenmiyorsa tamponlu kopyaya düşülür. Kullanılan stratejiyi döndürür.
+    """
+    position = os.lseek(dst, 0, os.SEEK_CUR)
+    if hasattr(os, 'copy_file_range'):
+        try:
+            done = 0
+            while done < count:
+                copied = os.copy_file_range(src, dst, count - done, offset + done, position + done)
+                if copied == 0:
+                    break
+                done += copied
+            if done == count:
+                os.lseek(dst, position + count, os.SEEK_SET)
+                return COPY_FILE_RANGE
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+        os.lseek(dst, position, os.SEEK_SET)
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        try:
+            done = 0
+            while done < count:
+                sent = os.sendfile(dst, src, offset + done, count - done)
+                if sent == 0:
+                    break
+                done += sent
+            if done == count:
+                return SENDFILE
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+        os.lseek(dst, position, os.SEEK_SET)
+    os.lseek(src, offset, os.SEEK_SET)
+    done = 0
+    while done < count:
+        chunk = os.read(src, min(BUFFER_SIZE, count - done))
+        if not chunk:
+            raise OSError(f"Kaynak beklenenden kısa ({offset + done} konumunda bitti)")
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst, view):]
+        done += len(chunk)
+    return BUFFERED
+
+
+def _available_strategies():
+    strategies = []
+    if fcntl is not None and sys.platform.startswith('linux'):
+        strategies.append((REFLINK, _reflink))
+    if hasattr(os, 'copy_file_range'):
+        strategies.append((COPY_FILE_RANGE, _copy_file_range))
+    # macOS'ta sendfile yalnızca sokete yazabilir
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        strategies.append((SENDFILE, _sendfile))
+    strategies.append((BUFFERED, _buffered))
+    return strategies
+
+
+STRATEGIES = _available_strategies()
+
+
+class BackupEngine:
+    """Dosyaların yanına .backup kopyası oluşturan, iş parçacığı güvenli motor"""
+
+    def __init__(self, suffix=BACKUP_SUFFIX):
+        self.suffix = suffix
+        self.counts = collections.Counter()
+        self._listings = collections.OrderedDict()
+        # st_dev -> o aygıtta desteklenmeyen stratejiler
+        self._unsupported = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _listing(self, directory):
+        """Klasördeki yedek adları; her klasör bir kez listelenir"""
+        with self._lock:
+            names = self._listings.get(directory)
+            if names is not None:
+                self._listings.move_to_end(directory)
+                return names
+        try:
+            names = {name for name in os.listdir(directory) if name.endswith(self.suffix)}
+        except OSError:
+            names = set()
+        with self._lock:
+            names = self._listings.setdefault(directory, names)
+            while len(self._listings) > LISTING_CACHE_SIZE:
+                self._listings.popitem(last=False)
+        return names
+
+    def exists(self, backup_path):
+        directory, name = os.path.split(os.path.abspath(backup_path))
+        names = self._listing(directory)
+        if name not in names:
+            return False
+        # Liste izleme servisi ve HTTP servisinde eskiyebilir: yedek bu arada silinmiş olabilir
+        if os.path.lexists(backup_path):
+            return True
+        with self._lock:
+            names.discard(name)
+        return False
+
+    def _copy(self, src, dst, st):
+        """İlk çalışan stratejiyle kopyala, stratejinin adını döndür"""
+        unsupported = self._unsupported[st.st_dev]
+        for strategy, copy in STRATEGIES:
+            if strategy in unsupported:
+                continue
+            try:
+                copy(src, dst, st.st_size)
+            except OSError as e:
+                if strategy == BUFFERED or e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                unsupported.add(strategy)
+                # Yarım kalan kopya temizlenip sonraki strateji baştan dener
+                os.ftruncate(dst, 0)
+                os.lseek(dst, 0, os.SEEK_SET)
+                os.lseek(src, 0, os.SEEK_SET)
+                continue
+            if os.fstat(dst).st_size != st.st_size:
+                raise OSError(f"Yedek eksik kopyalandı ({strategy})")
+            return strategy
+        raise OSError("Kullanılabilir kopyalama stratejisi yok")
+
+    def _publish(self, temp, backup_path):
+        """Geçici dosyayı yedek adına taşı; yedek bu arada oluştuysa False"""
+        try:
+            # link() var olan dosyanın üzerine yazmaz
+            os.link(temp, backup_path)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:
+            # Sabit bağlantı desteklemeyen dosya sistemleri (FAT, bazı ağ paylaşımları)
+            if os.path.exists(backup_path):
+                return False
+            os.replace(temp, backup_path)
+            return True
+
+    def backup(self, file_path):
+        """Yedeği oluştur ve kullanılan stratejiyi döndür; yedek zaten varsa None"""
+        with trace.span('backup.copy', path=file_path) as span:
+            strategy = self._backup(file_path)
+            span.set(strategy=strategy)
+        return strategy
+
+    def _backup(self, file_path):
+        backup_path = file_path + self.suffix
+        if self.exists(backup_path):
+            return None
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp = tempfile.mkstemp(prefix='.jpegto-', suffix='.tmp', dir=directory)
+        try:
+            src = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                st = os.fstat(src)
+                strategy = self._copy(src, fd, st)
+            finally:
+                os.close(src)
+            os.close(fd)
+            fd = None
+            os.chmod(temp, st.st_mode & 0o777)
+            if not self._publish(temp, backup_path):
+                return None
+        finally:
+            if fd is not None:
+                os.close(fd)
+            if os.path.exists(temp):
+                os.unlink(temp)
+
+        self._listing(directory).add(os.path.basename(backup_path))
+        with self._lock:
+            self.counts[strategy] += 1
+        return strategy
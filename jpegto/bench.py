@@ -0,0 +1,457 @@
+"""
+Tekrarlanabilir performans ölçümleri
+Kullanım:
+    python3 -m jpegto.bench corpus KLASÖR [--sizes 0.3,2,12,24,50,100]
+    python3 -m jpegto.bench run KLASÖR --out baseline.json [--compare eski.json]
+
+`corpus` sabit tohumla sentetik JPEG'ler üretir: 0.3–100 MP boyutlar, 4:4:4 / 4:2:2 /
+4:2:0 alt örnekleme, temel ve aşamalı kodlama, EXIF'siz / EXIF'li / makernote'lu
+dosyalar ve her boyutta sekiz Orientation değerinin tamamı. `run` mevcut her yolu
+(yerinde yama, etiket ekleme, exiftool süreci ve kalıcı işçisi, PIL+piexif geri dönüşü,
+kayıpsız, sips ve PIL döndürme, yedek kopyası, delta kaydı) her dosyanın taze kopyası üzerinde
+ölçer; PIL döndürmesi her kodlama profiliyle ayrıca ölçülür ve çıktı/giriş boyut
+oranı raporlanır. Her (yol, boyut) grubu ayrı bir süreçte çalışır, böylece tepe bellek (RSS)
+gruba özgü ölçülür. Sonuçlar JSON taban çizgisine yazılır; --compare ile önceki
+sürümün çizgisiyle karşılaştırılıp gerilemeler bildirilir.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+CORPUS_VERSION = 1
+CORPUS_MANIFEST = 'corpus.json'
+SEED = 1234
+
+# Megapiksel
+SIZES = (0.3, 2, 12, 24, 50, 100)
+QUICK_SIZES = (0.3, 2)
+
+SUBSAMPLING = {'444': 0, '422': 1, '420': 2}
+EXIF_KINDS = ('none', 'exif', 'makernote')
+ORIENTATIONS = tuple(range(1, 9))
+
+MAKERNOTE_SIZE = 32 * 1024
+
+PATCH = 'patch'
+SPLICE = 'splice'
+EXIFTOOL_ONESHOT = 'exiftool_oneshot'
+EXIFTOOL_POOL = 'exiftool_pool'
+PIL_EXIF = 'pil_exif'
+ROTATE_LOSSLESS = 'rotate_lossless'
+ROTATE_SIPS = 'rotate_sips'
+ROTATE_PIL = 'rotate_pil'
+ROTATE_PIL_FAST = 'rotate_pil_fast'
+ROTATE_PIL_SMALL = 'rotate_pil_small'
+BACKUP_COPY = 'backup_copy'
+BACKUP_DELTA = 'backup_delta'
+PATHS = (PATCH, SPLICE, EXIFTOOL_ONESHOT, EXIFTOOL_POOL, PIL_EXIF, ROTATE_LOSSLESS, ROTATE_SIPS, ROTATE_PIL,
+         ROTATE_PIL_FAST, ROTATE_PIL_SMALL, BACKUP_COPY, BACKUP_DELTA)
+
+# PIL döndürme yolu -> kodlama profili (rotate_pil varsayılan profili kullanır)
+ENCODE_PATHS = {ROTATE_PIL_FAST: 'fast', ROTATE_PIL_SMALL: 'small'}
+
+# Karşılaştırmada bu oranın üzerindeki yavaşlama/bellek artışı gerileme sayılır
+REGRESSION_THRESHOLD = 0.10
+
+
+def dimensions(megapixels):
+    """4:3 en-boy oranında, 16'nın katı boyutlar"""
+    width = int(math.sqrt(megapixels * 1e6 * 4 / 3)) // 16 * 16
+    return width, width * 3 // 4 // 16 * 16
+
+
+def corpus_cases(sizes=SIZES):
+    """Her boyut için alt örnekleme × kodlama × EXIF türü; Orientation değerleri sırayla dağıtılır"""
+    cases = []
+    for megapixels in sizes:
+        width, height = dimensions(megapixels)
+        index = 0
+        for subsampling in SUBSAMPLING:
+            for progressive in (False, True):
+                for exif in EXIF_KINDS:
+                    orientation = None if exif == 'none' else ORIENTATIONS[index % len(ORIENTATIONS)]
+                    if exif != 'none':
+                        index += 1
+                    name = (f"{megapixels:g}mp-{subsampling}-{'prog' if progressive else 'base'}-{exif}"
+                            f"-o{orientation or 0}.jpg")
+                    cases.append({
+                        'name': name, 'megapixels': megapixels, 'width': width, 'height': height,
+                        'subsampling': subsampling, 'progressive': progressive, 'exif': exif,
+                        'orientation': orientation,
+                    })
+    return cases
+
+
+def _pattern(width, height, seed):
+    """Belirlenimci içerik: iki gradyan ve tohumlu gürültüden büyütülmüş ayrıntı"""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    detail = Image.frombytes('L', (256, 256), rng.randbytes(256 * 256))
+    channels = [
+        Image.linear_gradient('L').resize((width, height)),
+        Image.radial_gradient('L').resize((width, height)),
+        detail.resize((width, height), Image.Resampling.BICUBIC),
+    ]
+    return Image.merge('RGB', channels)
+
+
+def _exif_bytes(case, seed):
+    import piexif
+
+    if case['exif'] == 'none':
+        return None
+    exif = {
+        '0th': {
+            piexif.ImageIFD.Orientation: case['orientation'],
+            piexif.ImageIFD.Make: b'jpegto',
+            piexif.ImageIFD.Model: b'bench',
+            piexif.ImageIFD.DateTime: b'2024:01:01 12:00:00',
+        },
+        'Exif': {piexif.ExifIFD.DateTimeOriginal: b'2024:01:01 12:00:00'},
+    }
+    if case['exif'] == 'makernote':
+        exif['Exif'][piexif.ExifIFD.MakerNote] = random.Random(seed).randbytes(MAKERNOTE_SIZE)
+    return piexif.dump(exif)
+
+
+def _file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_corpus(directory, sizes=SIZES, seed=SEED, log=print):
+    """Sentetik külliyatı üret (var olan dosyalar yeniden üretilmez); manifestoyu döndür"""
+    os.makedirs(directory, exist_ok=True)
+    cases = corpus_cases(sizes)
+    images = {}
+    for number, case in enumerate(cases):
+        path = os.path.join(directory, case['name'])
+        if not os.path.exists(path):
+            key = case['width'], case['height']
+            if key not in images:
+                # Aynı boyuttaki dosyalar aynı içeriği paylaşır; yalnızca kodlama değişir
+                images.clear()
+                images[key] = _pattern(case['width'], case['height'], seed)
+            params = {'quality': 90, 'subsampling': SUBSAMPLING[case['subsampling']],
+                      'progressive': case['progressive']}
+            exif = _exif_bytes(case, seed + number)
+            if exif:
+                params['exif'] = exif
+            images[key].save(path, format='JPEG', **params)
+            log(f"üretildi: {case['name']}")
+        case['bytes'] = os.path.getsize(path)
+        case['hash'] = _file_hash(path)
+    manifest = {'version': CORPUS_VERSION, 'seed': seed, 'sizes': list(sizes), 'cases': cases}
+    with open(os.path.join(directory, CORPUS_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_corpus(directory):
+    with open(os.path.join(directory, CORPUS_MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KiB, macOS'ta bayt
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _operation(path_name, work_directory):
+    """Ölçülecek işlemi döndür: fonksiyon(dosya) -> uygulandıysa True; yol kullanılamıyorsa None"""
+    from .backup import BackupEngine
+    from .core import JobSpec, Processor
+    from .delta import DeltaJournal
+    from .encoding import ORIGINAL
+    from .exiftool import ExifToolPool
+    from .jpegmeta import patch_orientation
+    from .lossless import ROTATE_90
+    from .planner import Plan
+    from .splice import splice_orientation
+
+    # Kayıpsız yol boyut sınırı olmadan ölçülür (sınır aşılınca motor hiç çalışmazdı)
+    processor = Processor(JobSpec(fix_exif=True, rotate=True, backup=False, always_lossless=True,
+                                  encode=ENCODE_PATHS.get(path_name, ORIGINAL)))
+    if path_name == PATCH:
+        return lambda path: patch_orientation(path, 1)
+    if path_name == SPLICE:
+        # Etiketsiz dosyaya Orientation=6 eklenir (başlık yeniden kurulur, görüntü verisi kopyalanır)
+        return lambda path: splice_orientation(path, 6) is not None
+    if path_name == EXIFTOOL_ONESHOT:
+        if not shutil.which('exiftool'):
+            return None
+
+        def oneshot(path):
+            # Eski GUI'lerin dosya başına süreç başlatan yolu
+            subprocess.run(['exiftool', '-Orientation=1', '-n', '-overwrite_original', path],
+                           capture_output=True, check=True)
+            return True
+        return oneshot
+    if path_name == EXIFTOOL_POOL:
+        if not ExifToolPool.available():
+            return None
+        pool = ExifToolPool(size=1)
+
+        def pooled(path):
+            pool.set_orientation(path, 1)
+            return True
+        return pooled
+    if path_name == PIL_EXIF:
+        def pil_exif(path):
+            processor.set_orientation_pil(path, 1)
+            return True
+        return pil_exif
+    if path_name == ROTATE_LOSSLESS:
+        return lambda path: processor._apply_lossless(path, Plan(ROTATE_90))
+    if path_name == ROTATE_SIPS:
+        if not shutil.which('sips'):
+            return None
+        return lambda path: processor._apply_sips(path, Plan(ROTATE_90))
+    if path_name == ROTATE_PIL or path_name in ENCODE_PATHS:
+        def rotate_pil(path):
+            processor._apply_reencode(path, Plan(ROTATE_90))
+            return True
+        return rotate_pil
+    if path_name == BACKUP_COPY:
+        engine = BackupEngine()
+
+        def backup(path):
+            return engine.backup(path) is not None
+        return backup
+    if path_name == BACKUP_DELTA:
+        journal = DeltaJournal(os.path.join(work_directory, 'bench.delta'))
+
+        def delta(path):
+            journal.record(path)
+            return True
+        return delta
+    raise ValueError(f"Bilinmeyen yol: {path_name}")
+
+
+def _applies(path_name, case):
+    # Yerinde yama yalnızca etiketi olan, ekleme yalnızca etiketi olmayan dosyalarda çalışır
+    if path_name == PATCH:
+        return case['orientation'] is not None
+    if path_name == SPLICE:
+        return case['orientation'] is None
+    return True
+
+
+def _bench_group(path_name, corpus_directory, cases, repeat):
+    """Ayrı süreçte: bir yolu bir boyuttaki dosyalarda ölç"""
+    work_directory = tempfile.mkdtemp(prefix='.jpegto-bench-', dir=corpus_directory)
+    try:
+        # Modül içe aktarmaları taban belleğe dahil edilir
+        operation = _operation(path_name, work_directory)
+        base_rss = _peak_rss_mb()
+        if operation is None:
+            return {'available': False}
+        samples = []
+        output_ratios = []
+        declined = 0
+        for case in cases:
+            source = os.path.join(corpus_directory, case['name'])
+            target = os.path.join(work_directory, case['name'])
+            for _ in range(repeat):
+                shutil.copyfile(source, target)
+                if os.path.exists(target + '.backup'):
+                    os.unlink(target + '.backup')
+                start = time.perf_counter()
+                applied = operation(target)
+                elapsed = time.perf_counter() - start
+                if applied is False:
+                    declined += 1
+                    continue
+                samples.append(elapsed)
+                output_ratios.append(os.path.getsize(target) / case['bytes'])
+        return {'available': True, 'samples': samples, 'declined': declined,
+                'output_ratio': statistics.mean(output_ratios) if output_ratios else None,
+                'base_rss_mb': base_rss, 'peak_rss_mb': _peak_rss_mb()}
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+def _summarize(group, cases):
+    samples = sorted(group['samples'])
+    if not samples:
+        return {'files': 0, 'declined': group['declined']}
+    megapixels = cases[0]['megapixels']
+    mean_bytes = sum(case['bytes'] for case in cases) / len(cases)
+    return {
+        'files': len(samples),
+        'declined': group['declined'],
+        'median': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, math.ceil(len(samples) * 0.95) - 1)],
+        'min': samples[0],
+        'max': samples[-1],
+        'megapixels_per_second': megapixels * len(samples) / sum(samples),
+        'mb_per_second': mean_bytes * len(samples) / (1024 * 1024) / sum(samples),
+        # Çıktı boyutunun giriş boyutuna ortalama oranı (yeniden kodlayan yollarda anlamlı)
+        'output_ratio': group['output_ratio'],
+        'base_rss_mb': group['base_rss_mb'],
+        'peak_rss_mb': group['peak_rss_mb'],
+    }
+
+
+def _environment():
+    from PIL import __version__ as pillow_version
+    from .exiftool import probe_exiftool
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'pillow': pillow_version,
+        'exiftool': probe_exiftool(),
+        'sips': bool(shutil.which('sips')),
+    }
+
+
+def run_benchmarks(corpus_directory, paths=PATHS, repeat=3, log=print):
+    """Her (yol, boyut) grubunu temiz bir süreçte ölç; taban çizgisi sözlüğünü döndür"""
+    manifest = load_corpus(corpus_directory)
+    by_size = {}
+    for case in manifest['cases']:
+        by_size.setdefault(case['megapixels'], []).append(case)
+
+    results = {}
+    # spawn: her grup aynı temiz başlangıç belleğiyle başlar
+    context = multiprocessing.get_context('spawn')
+    for path_name in paths:
+        results[path_name] = {}
+        for megapixels, cases in sorted(by_size.items()):
+            cases = [case for case in cases if _applies(path_name, case)]
+            if not cases:
+                continue
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                group = executor.submit(_bench_group, path_name, corpus_directory, cases, repeat).result()
+            if not group['available']:
+                log(f"{path_name}: kullanılamıyor, atlandı")
+                del results[path_name]
+                break
+            summary = _summarize(group, cases)
+            results[path_name][f"{megapixels:g}"] = summary
+            if summary['files']:
+                log(f"{path_name:<17} {megapixels:>5g} MP  medyan {summary['median'] * 1000:9.1f} ms"
+                    f"  {summary['megapixels_per_second']:8.1f} MP/sn  tepe RSS {summary['peak_rss_mb'] or 0:7.1f} MB"
+                    f"  boyut ×{summary['output_ratio']:.2f}")
+            else:
+                log(f"{path_name:<17} {megapixels:>5g} MP  uygulanamadı ({summary['declined']} dosya)")
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': _environment(),
+        'corpus': {'version': manifest['version'], 'seed': manifest['seed'], 'sizes': manifest['sizes'],
+                   'files': len(manifest['cases'])},
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """İki taban çizgisini karşılaştır; (satırlar, gerilemeler) döndür"""
+    lines = []
+    regressions = []
+    for path_name, sizes in current['results'].items():
+        for size, summary in sizes.items():
+            old = baseline['results'].get(path_name, {}).get(size)
+            if not old or not old.get('files') or not summary.get('files'):
+                continue
+            time_ratio = summary['median'] / old['median']
+            rss_ratio = None
+            if old.get('peak_rss_mb') and summary.get('peak_rss_mb'):
+                rss_ratio = summary['peak_rss_mb'] / old['peak_rss_mb']
+            line = f"{path_name:<17} {size:>5} MP  süre ×{time_ratio:.2f}"
+            if rss_ratio is not None:
+                line += f"  RSS ×{rss_ratio:.2f}"
+            if time_ratio > 1 + threshold or (rss_ratio is not None and rss_ratio > 1 + threshold):
+                line += "  GERİLEME"
+                regressions.append((path_name, size))
+            lines.append(line)
+    return lines, regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='jpegto.bench', description="jpegto performans ölçümleri")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    corpus = commands.add_parser('corpus', help="Sentetik JPEG külliyatı üret")
+    corpus.add_argument('directory')
+    corpus.add_argument('--sizes', default=','.join(f"{size:g}" for size in SIZES),
+                        help="Megapiksel boyutları, virgülle (varsayılan: %(default)s)")
+    corpus.add_argument('--quick', action='store_true',
+                        help=f"Yalnızca küçük boyutlar ({', '.join(f'{size:g}' for size in QUICK_SIZES)} MP)")
+    corpus.add_argument('--seed', type=int, default=SEED)
+
+    run = commands.add_parser('run', help="Külliyat üzerinde yolları ölç")
+    run.add_argument('directory')
+    run.add_argument('--out', help="Taban çizgisi JSON dosyası")
+    run.add_argument('--paths', default=','.join(PATHS), help="Ölçülecek yollar (varsayılan: %(default)s)")
+    run.add_argument('--repeat', type=int, default=3, help="Dosya başına tekrar sayısı")
+    run.add_argument('--compare', metavar='ESKİ', help="Önceki taban çizgisiyle karşılaştır")
+    run.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                     help="Gerileme eşiği (varsayılan: %(default)s = %%10)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    log = lambda message: print(message, file=sys.stderr)
+
+    if args.command == 'corpus':
+        sizes = QUICK_SIZES if args.quick else tuple(float(size) for size in args.sizes.split(','))
+        manifest = generate_corpus(args.directory, sizes, args.seed, log=log)
+        log(f"külliyat hazır: {len(manifest['cases'])} dosya")
+        return 0
+
+    paths = [name for name in args.paths.split(',') if name]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        log(f"jpegto.bench: bilinmeyen yol: {', '.join(sorted(unknown))}")
+        return 2
+    result = run_benchmarks(args.directory, paths, args.repeat, log=log)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        log(f"taban çizgisi: {args.out}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, result, args.threshold)
+        for line in lines:
+            log(line)
+        if regressions:
+            log(f"jpegto.bench: {len(regressions)} gerileme")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Arka uç yetenekleri ve disk önbelleği
+exiftool sürümü, sips'in varlığı ve kayıpsız döndürme motoru (jpegtran) bir kez yoklanır; sonuç
+kullanıcı önbellek klasörüne yazılır. Önbellek anahtarı PATH ve bulunan ikili
+dosyaların yolu ve değişiklik zamanıdır: PATH değişince veya exiftool güncellenince
+yeniden yoklanır. Aksi halde `exiftool -ver` (Perl başlangıcı) her açılışta çalışmaz.
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+
+from . import exiftool
+from .lossless import JPEGTRAN
+
+CACHE_VERSION = 2
+CACHE_NAME = 'backends.json'
+
+# Yoklanan ikili dosyalar
+BINARIES = (exiftool.EXIFTOOL, 'sips', JPEGTRAN)
+
+# Kayıpsız döndürme motorları: jpegtran varsa o, yoksa paket içindeki saf Python
+# motoru (yavaş, bkz. lossless.py)
+LOSSLESS_ENGINE = 'builtin'
+LOSSLESS_JPEGTRAN = JPEGTRAN
+
+_lock = threading.Lock()
+_current = None
+
+
+def cache_path():
+    if sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    elif os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'jpegto', CACHE_NAME)
+
+
+def _fingerprint():
+    """Önbellek anahtarı: PATH ve her ikilinin (yol, mtime) bilgisi"""
+    binaries = {}
+    for name in BINARIES:
+        path = shutil.which(name)
+        try:
+            binaries[name] = [path, os.stat(path).st_mtime_ns] if path else None
+        except OSError:
+            binaries[name] = None
+    return {'version': CACHE_VERSION, 'path': os.environ.get('PATH', ''), 'binaries': binaries}
+
+
+class Backends:
+    """Kullanılabilir arka uçlar"""
+
+    __slots__ = ('exiftool', 'sips', 'lossless', 'cached')
+
+    def __init__(self, exiftool=None, sips=None, lossless=LOSSLESS_ENGINE, cached=False):
+        # exiftool sürümü (yoksa None), sips yolu (yoksa None)
+        self.exiftool = exiftool
+        self.sips = sips
+        self.lossless = lossless
+        # Sonuç disk önbelleğinden mi geldi?
+        self.cached = cached
+
+    def to_dict(self):
+        return {'exiftool': self.exiftool, 'sips': self.sips, 'lossless': self.lossless}
+
+
+def _load(fingerprint):
+    try:
+        with open(cache_path(), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('key') != fingerprint:
+        return None
+    backends = data.get('backends', {})
+    return Backends(backends.get('exiftool'), backends.get('sips'), backends.get('lossless', LOSSLESS_ENGINE),
+                    cached=True)
+
+
+def _save(fingerprint, backends):
+    path = cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': fingerprint, 'backends': backends.to_dict()}, f)
+        os.replace(temp_path, path)
+    except OSError:
+        # Önbellek yazılamazsa (salt okunur ev klasörü) bir sonraki açılışta yeniden yoklanır
+        pass
+
+
+def probe(refresh=False):
+    """Arka uçları döndür: süreç içinde, sonra diskte önbelleğe alınır"""
+    global _current
+    with _lock:
+        if _current is not None and not refresh:
+            return _current
+        fingerprint = _fingerprint()
+        backends = None if refresh else _load(fingerprint)
+        if backends is None:
+            exiftool_binary = fingerprint['binaries'][exiftool.EXIFTOOL]
+            sips_binary = fingerprint['binaries']['sips']
+            lossless = LOSSLESS_JPEGTRAN if fingerprint['binaries'][JPEGTRAN] else LOSSLESS_ENGINE
+            version = exiftool.probe_exiftool(refresh=True) if exiftool_binary else None
+            backends = Backends(version, sips_binary[0] if sips_binary else None, lossless)
+            _save(fingerprint, backends)
+        # exiftool işçileri ve ExifToolPool.available sürümü yeniden sormaz
+        exiftool.remember_version(exiftool.EXIFTOOL, backends.exiftool)
+        _current = backends
+        return backends
@@ -0,0 +1,360 @@
+"""
+jpegto komut satırı arayüzü
+Kullanım: python3 -m jpegto [seçenekler] DOSYA|KLASÖR|GLOB ...
+Her dosya için bir JSON satırı stdout'a yazılır, özet stderr'e gider.
+"""
+
+import argparse
+import collections
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from . import trace
+from .audit import audit, read_list, write_list
+from .backup import BACKUP_MODES, COPY, DELTA
+from .core import JobSpec, PIXELS, ROTATE_MODES
+from .encoding import ORIGINAL, PROFILES
+from .delta import DeltaError, DeltaJournal, default_journal_path, restore
+from .lossless import PERFECT, TRIM
+from .jobs import JobError, JobJournal, default_job_path
+from .manifest import Manifest, default_root
+from .parallel import MODES, AUTO, default_workers
+from .pipeline import Pipeline
+from .priority import FIFO, FOCUS, ORDERS, FileOrder
+from .stats import RunStats
+
+# Canlı ilerleme satırının en sık yenilenme aralığı (saniye)
+PROGRESS_INTERVAL = 0.25
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='jpegto',
+        description="JPEG dosyalarının EXIF orientation bilgisini düzeltir ve dosyaları döndürür.",
+    )
+    parser.add_argument('paths', nargs='*', help="JPEG dosyaları, klasörler veya glob desenleri")
+    parser.add_argument('--no-fix', dest='fix_exif', action='store_false',
+                        help="EXIF Orientation düzeltmesini atla (varsayılan: Orientation=1 yapılır)")
+    parser.add_argument('--rotate', action='store_true', help="Dosyaları 90° saat yönünde döndür")
+    parser.add_argument('--rotate-mode', choices=ROTATE_MODES, default=PIXELS,
+                        help="pixels: pikselleri döndür, virtual: yalnızca Orientation etiketini birleştirip yaz, "
+                             "bake: etiketi birleştir ve EXIF okumayan tüketiciler için piksellere uygula")
+    parser.add_argument('--encode', choices=PROFILES, default=ORIGINAL,
+                        help="PIL ile yeniden kodlama gerektiğinde: original: özgün nicemleme tabloları ve alt "
+                             "örnekleme korunur, fast: Huffman iyileştirmesi yok, small: iyileştirilmiş ve aşamalı")
+    parser.add_argument('--trim', dest='trim', action='store_const', const=TRIM, default=PERFECT,
+                        help="Kayıpsız döndürmede MCU katı olmayan kenar satır/sütunlarını kırp "
+                             "(varsayılan: kırpılmaz, bu dosyalar kayıpsız yol yerine yeniden kodlanır)")
+    parser.add_argument('--always-lossless', action='store_true',
+                        help="jpegtran yokken 1 MP üstü dosyaları da saf Python motoruyla kayıpsız döndür "
+                             "(yavaş: MP başına ~2 s; varsayılan: bu dosyalar sips/PIL ile yeniden kodlanır)")
+    parser.add_argument('--quality', type=int,
+                        help="Yeniden kodlama kalitesi 1-100 (original ile verilirse özgün tablolar yerine kullanılır; "
+                             "fast/small için varsayılan 95)")
+    parser.add_argument('--no-backup', dest='backup', action='store_false',
+                        help="Orijinal dosyaların .backup yedeğini alma")
+    parser.add_argument('--backup-mode', choices=BACKUP_MODES, default=COPY,
+                        help="copy: tam .backup kopyası, delta: yalnızca başlığı değişecek dosyaların özgün "
+                             "başlığını ve içerik özetini çalıştırma günlüğüne yaz")
+    parser.add_argument('--journal', help="Delta günlüğünün yolu (varsayılan: kök klasörde .jpegto-ZAMAN.delta)")
+    parser.add_argument('--no-job', dest='job', action='store_false',
+                        help="İş günlüğü tutma (varsayılan: kök klasörde .jpegto-job.wal; her dosya yeniden "
+                             "adlandırmadan önce fsync edilir, klasörler ve tamamlanma kayıtları toplu fsync ile "
+                             "kalıcılaşır). Günlük olmadan dosyalar fsync edilmez")
+    parser.add_argument('--resume', action='store_true',
+                        help="Yarıda kalmış işi günlüğündeki seçenek ve dosya listesiyle sürdür")
+    parser.add_argument('--durable', action='store_true',
+                        help="--no-job ile de her dosyayı yeniden adlandırmadan önce fsync et; çökmeden sonra "
+                             "dosyalar ya eski ya yeni haldedir (iş günlüğü varken bu zaten yapılır)")
+    parser.add_argument('--job-file', help="İş günlüğünün yolu (varsayılan: kök klasörde .jpegto-job.wal)")
+    parser.add_argument('--restore', metavar='GÜNLÜK',
+                        help="Delta günlüğündeki dosyaları özgün haline getir (yollar verilirse yalnızca onları); "
+                             "birden fazla çalıştırma varsa günlükler yeniden eskiye doğru geri yüklenmeli")
+    parser.add_argument('--audit', action='store_true',
+                        help="Deneme: yalnızca başlıkları oku, dosya başına Orientation/boyut/EXIF ve planı yaz, "
+                             "Orientation histogramını göster; hiçbir dosyaya yazma")
+    parser.add_argument('--audit-list', metavar='DOSYA',
+                        help="--audit ile: işlem gerektiren dosyaların listesini bu dosyaya yaz (--files-from ile verilir)")
+    parser.add_argument('--files-from', metavar='DOSYA',
+                        help="İşlenecek yolları bu listeden oku (satır başına bir yol)")
+    parser.add_argument('--only-needed', action='store_true',
+                        help="Önce başlıkları tara, yalnızca değişecek dosyaları işle; diğerleri yazma için açılmaz")
+    parser.add_argument('--watch', action='store_true',
+                        help="Klasörleri sürekli izle; yazması biten yeni/değişen JPEG'leri işle (Ctrl+C ile durur). "
+                             "Linux'ta inotify, diğer sistemlerde periyodik tarama kullanılır")
+    parser.add_argument('--debounce', type=float, default=None, metavar='SN',
+                        help="--watch: yazması biten dosyada bu kadar sessizlik beklenir (varsayılan: 0.25)")
+    parser.add_argument('--poll', type=float, default=None, metavar='SN',
+                        help="--watch: inotify yerine bu aralıkla tarayarak izle (ağ dosya sistemleri için)")
+    parser.add_argument('--sniff', action='store_true',
+                        help="Klasörlerde uzantısı JPEG olmayan dosyaları da FF D8 FF imzasıyla tanı "
+                             "(doğrudan verilen dosyaların imzasına her zaman bakılır)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Aynı işlemle daha önce işlenmiş ve değişmemiş dosyaları atla (kök klasörde SQLite manifestosu)")
+    parser.add_argument('--manifest-root', help="Manifestonun tutulacağı kök klasör (varsayılan: dosyaların ortak klasörü)")
+    parser.add_argument('-j', '--workers', type=int, default=default_workers(),
+                        help="Paralel işçi sayısı (varsayılan: CPU çekirdek sayısı)")
+    parser.add_argument('--mode', choices=MODES, default=AUTO,
+                        help="process: CPU ağırlıklı PIL/kayıpsız yollar, thread: exiftool/sips/G/Ç yolları")
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help="Aynı anda çözülen görüntülerin tahmini bellek üst sınırı"
+                             " (varsayılan: fiziksel belleğin yarısı, 0: sınırsız)")
+    parser.add_argument('--order', choices=ORDERS, default=FIFO,
+                        help="Dosya sırası: fifo bulunma sırası, smallest küçük dosyalar önce,"
+                             " focus --focus klasörü önce")
+    parser.add_argument('--focus', metavar='KLASÖR', help="--order focus ile önce işlenecek klasör")
+    parser.add_argument('--no-verify', dest='verify', action='store_false',
+                        help="Yazılan dosyaların başlığını ve Orientation değerini yeniden okuyup doğrulama")
+    parser.add_argument('--no-progress', dest='progress', action='store_false',
+                        help="stderr'deki canlı ilerleme satırını (dosya/sn, MB/sn, kalan süre) gösterme")
+    parser.add_argument('--timings', action='store_true',
+                        help="Özette aşama başına gecikmeleri (p50/p95/p99) göster")
+    parser.add_argument('--stats', metavar='DOSYA',
+                        help="Verim ve aşama histogramlarını içeren JSON özetini bu dosyaya yaz")
+    parser.add_argument('--trace', metavar='DOSYA',
+                        help="Arka uç çağrılarının aralıklarını Chrome/Perfetto iz dosyasına yaz "
+                             "(chrome://tracing veya ui.perfetto.dev ile açılır)")
+    parser.add_argument('--profile', metavar='KLASÖR',
+                        help="İşçileri cProfile ile profille; işçi başına bir .prof dosyası yazılır")
+    return parser
+
+
+def run_restore(journal_path, paths):
+    """Delta günlüğünden geri yükle; her dosya için bir JSON satırı yaz"""
+    restored = failed = 0
+    try:
+        for path, error, action in restore(journal_path, paths):
+            if error:
+                failed += 1
+            else:
+                restored += 1
+            line = {'path': path, 'ok': error is None, 'action': action, 'error': error}
+            sys.stdout.write(json.dumps(line, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+    except (OSError, DeltaError) as e:
+        print(f"jpegto: {e}", file=sys.stderr)
+        return 1
+    print(f"jpegto: {restored} dosya geri yüklendi, {failed} hatalı", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_audit(spec, sources, sniff, workers, list_path):
+    """Yalnızca başlıkları denetle; her dosya için bir JSON satırı, özet ve histogram yaz"""
+    def on_entry(entry):
+        sys.stdout.write(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+    start = time.monotonic()
+    report = audit(spec, sources, sniff, workers, on_entry=on_entry)
+    elapsed = time.monotonic() - start
+    if not report.files:
+        print("jpegto: JPEG dosyası bulunamadı", file=sys.stderr)
+        return 1
+    print(f"jpegto: {report.files} dosya denetlendi ({elapsed:.2f} sn), {len(report.paths)} dosya işlem gerektiriyor, "
+          f"{len(report.errors)} başlık okunamadı", file=sys.stderr)
+    for line in report.format_histogram():
+        print(f"  {line}", file=sys.stderr)
+    if list_path:
+        write_list(list_path, report.paths)
+        print(f"jpegto: işlem listesi {list_path} (--files-from ile işlenebilir)", file=sys.stderr)
+    return 0
+
+
+def memory_budget(args):
+    """--memory-budget (MB) -> bayt; verilmediyse None (varsayılan bütçe)"""
+    return None if args.memory_budget is None else args.memory_budget * 1024 * 1024
+
+
+def run_watch(spec, roots, args):
+    """İzleme servisi: her dosya için bir JSON satırı (işlem gecikmesiyle) yaz"""
+    from .watch import DEBOUNCE, WatchDaemon
+
+    manifest = Manifest(args.manifest_root or default_root(roots))
+    stats = RunStats()
+    daemon = WatchDaemon(spec, roots, workers=args.workers, mode=args.mode, sniff=args.sniff, verify=args.verify,
+                         manifest=manifest, debounce=DEBOUNCE if args.debounce is None else args.debounce,
+                         poll_interval=args.poll, memory_budget=memory_budget(args))
+
+    def on_watching(method):
+        print(f"jpegto: {len(roots)} klasör izleniyor ({method}); durdurmak için Ctrl+C", file=sys.stderr)
+
+    def on_result(result, latency):
+        stats.add(result)
+        line = result.to_dict()
+        line['latency'] = round(latency, 4)
+        sys.stdout.write(json.dumps(line, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+    # SIGTERM (ör. systemd) de Ctrl+C gibi düzenli kapanış yapar
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    thread = threading.Thread(target=daemon.run, kwargs={'on_result': on_result, 'on_watching': on_watching},
+                              daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+        thread.join()
+        signal.signal(signal.SIGTERM, previous)
+        manifest.close()
+    stats.finish()
+    print(f"jpegto: izleme durdu; {stats.files} dosya, {stats.errors} hatalı, {stats.skipped} güncel", file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.restore:
+        return run_restore(args.restore, args.paths)
+    if args.files_from:
+        try:
+            args.paths.extend(read_list(args.files_from))
+        except OSError as e:
+            print(f"jpegto: {e}", file=sys.stderr)
+            return 2
+        if not args.paths:
+            print("jpegto: işlem listesi boş, işlenecek dosya yok", file=sys.stderr)
+            return 0
+    if args.resume and (args.audit or args.only_needed or args.watch):
+        parser.error("--resume, --audit, --only-needed ve --watch ile birlikte kullanılamaz")
+    if args.watch and not all(os.path.isdir(path) for path in args.paths):
+        parser.error("--watch yalnızca klasörlerle kullanılabilir")
+    if not args.paths and not (args.resume and args.job_file):
+        parser.error("en az bir dosya, klasör veya glob deseni gerekli")
+    if args.quality is not None and not 1 <= args.quality <= 100:
+        parser.error("--quality 1-100 arasında olmalı")
+    if args.memory_budget is not None and args.memory_budget < 0:
+        parser.error("--memory-budget negatif olamaz")
+    if (args.order == FOCUS) != bool(args.focus):
+        parser.error("--focus ile --order focus birlikte kullanılmalı")
+
+    job = None
+    if args.resume:
+        # Seçenekler ve kaynaklar günlükten okunur
+        try:
+            job = JobJournal.resume(args.job_file or default_job_path(default_root(args.paths)))
+        except JobError as e:
+            print(f"jpegto: {e}", file=sys.stderr)
+            return 2
+        spec, sources, sniff = job.spec, job.sources, job.sniff
+        print(f"jpegto: iş sürdürülüyor ({len(job.completed)} dosya daha önce tamamlanmış)", file=sys.stderr)
+    else:
+        spec = JobSpec(fix_exif=args.fix_exif, rotate=args.rotate, backup=args.backup,
+                       rotate_mode=args.rotate_mode, incremental=args.incremental,
+                       backup_mode=args.backup_mode, durable=args.durable, encode=args.encode,
+                       quality=args.quality, trim=args.trim,
+                       always_lossless=args.always_lossless)
+        sources, sniff = args.paths, args.sniff
+    if not spec.has_work:
+        print("jpegto: en az bir işlem seçilmeli (--no-fix ile birlikte --rotate kullanın)", file=sys.stderr)
+        return 2
+    # Sürdürülen işin kaynakları bir dosya listesi olabilir; kök verilen yollardan bulunur
+    root = default_root(args.paths or sources)
+    if args.watch:
+        return run_watch(spec, sources, args)
+    if args.audit:
+        return run_audit(spec, sources, sniff, args.workers, args.audit_list)
+    if args.only_needed and not job:
+        report = audit(spec, sources, sniff, args.workers)
+        print(f"jpegto: {report.files} dosyanın başlığı tarandı, {len(report.paths)} dosya işlem gerektiriyor",
+              file=sys.stderr)
+        if not report.paths:
+            return 1 if not report.files else 0
+        sources = report.paths
+    if args.job and not job:
+        try:
+            job = JobJournal.create(args.job_file or default_job_path(root), spec, sources, sniff)
+        except JobError as e:
+            print(f"jpegto: {e}", file=sys.stderr)
+            return 2
+        sources = job.sources
+
+    manifest = None
+    if spec.incremental:
+        manifest = Manifest(args.manifest_root or root)
+    journal = None
+    if spec.backup and spec.backup_mode == DELTA:
+        journal = DeltaJournal(args.journal or default_journal_path(root))
+
+    skipped = [0]
+    backup_strategies = collections.Counter()
+    stats = RunStats()
+    # Canlı satır yalnızca stderr bir terminalse yazılır
+    live = args.progress and sys.stderr.isatty()
+    last_progress = [0.0]
+
+    def on_result(index, result):
+        if result.skipped:
+            skipped[0] += 1
+        if 'backup' in result.backends:
+            backup_strategies[result.backends['backup']] += 1
+        sys.stdout.write(json.dumps(result.to_dict(), ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+        if live and time.monotonic() - last_progress[0] >= PROGRESS_INTERVAL:
+            last_progress[0] = time.monotonic()
+            sys.stderr.write('\r\033[K' + stats.format_live())
+            sys.stderr.flush()
+
+    tracer = trace.enable(args.trace) if args.trace else None
+    # Dosyalar bulundukça işlenir; tarama bitmesi beklenmez
+    pipeline = Pipeline(spec, workers=args.workers, mode=args.mode, sniff=sniff, verify=args.verify,
+                        profile_dir=args.profile, memory_budget=memory_budget(args),
+                        order=FileOrder(args.order, args.focus) if args.order != FIFO else None)
+    try:
+        success_count, error_count = pipeline.run(sources, on_result=on_result, manifest=manifest,
+                                                  journal=journal, job=job, stats=stats)
+    finally:
+        if live:
+            sys.stderr.write('\r\033[K')
+        if tracer:
+            trace.disable()
+            events = tracer.save()
+            print(f"jpegto: iz dosyası {tracer.path} ({events} olay)", file=sys.stderr)
+        if manifest:
+            manifest.close()
+        if journal:
+            journal.close()
+        if job:
+            # Yarıda kalan işin günlüğü --resume için saklanır
+            if pipeline.completed:
+                job.finish()
+            else:
+                job.close()
+    if success_count + error_count == 0:
+        if args.resume:
+            print("jpegto: tüm dosyalar zaten tamamlanmış", file=sys.stderr)
+            return 0
+        print("jpegto: JPEG dosyası bulunamadı", file=sys.stderr)
+        return 1
+    summary = f"jpegto: {success_count} başarılı, {error_count} hatalı"
+    if manifest:
+        summary += f" ({skipped[0]} dosya güncel olduğu için atlandı)"
+    if backup_strategies:
+        summary += "; yedek: " + ", ".join(f"{name} {count}" for name, count in backup_strategies.most_common())
+    print(summary, file=sys.stderr)
+    files_per_second, mb_per_second = stats.rates()
+    print(f"jpegto: {stats.elapsed:.2f} sn, {files_per_second:.1f} dosya/sn, {mb_per_second:.1f} MB/sn",
+          file=sys.stderr)
+    for line in stats.format_encodes():
+        print(f"jpegto: yeniden kodlama {line}", file=sys.stderr)
+    memory = stats.format_memory()
+    if memory:
+        print(f"jpegto: bellek: {memory}", file=sys.stderr)
+    if args.timings:
+        for line in stats.format_stages():
+            print(f"  {line}", file=sys.stderr)
+    if args.stats:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
+    if journal and journal.records:
+        print(f"jpegto: delta günlüğü {journal.path} ({journal.records} kayıt, {journal.bytes_written} bayt)",
+              file=sys.stderr)
+    return 1 if error_count else 0
@@ -0,0 +1,567 @@
+"""
+Başsız (GUI'siz) işlem çekirdeği
+İş tanımı (JobSpec) ve dosya işleyici (Processor) tkinter içermez; GUI'ler, CLI ve
+diğer servisler aynı mantığı buradan kullanır.
+"""
+
+import glob
+import os
+import subprocess
+import threading
+import time
+
+from . import capabilities, trace
+from .encoding import ORIGINAL, EncodeProfile
+from .backup import BACKUP_MODES, COPY, DELTA, BackupEngine
+from .exiftool import ExifToolPool, ExifToolError
+from .manifest import fast_hash
+from .orientation import IDENTITY, normalize
+from .scanner import iter_jpegs
+from .stats import BACKUP, ENCODE, EXIF, HASH, ROTATE, VERIFY, WRITE, timed
+from .jpegmeta import JPEGFormatError, patch_orientation, patch_orientation_bytes, read_orientation
+from .splice import splice_orientation, splice_orientation_bytes
+from .lossless import (
+    LosslessError, ROTATE_90, ROTATE_180, ROTATE_270, FLIP_HORIZONTAL, FLIP_VERTICAL,
+    TRANSPOSE, TRANSVERSE, PERFECT, TRIM_POLICIES, BUILTIN_MAX_PIXELS, replace_atomic, temp_path_for,
+    transform_jpeg, transform_jpeg_jpegtran, write_atomic,
+)
+from .planner import (
+    Plan, plan, NONE, PATCH, LOSSLESS, SIPS, REENCODE, SIPS_ARGS,
+    PIXELS, VIRTUAL, BAKE, ROTATE_MODES,
+)
+
+# Kayıpsız dönüşüm adı -> PIL Image.Transpose üyesi
+# (PIL ve piexif ilk yeniden kodlamada içe aktarılır; başlangıç süresine eklenmez)
+PIL_TRANSPOSE = {
+    ROTATE_90: 'ROTATE_270',
+    ROTATE_180: 'ROTATE_180',
+    ROTATE_270: 'ROTATE_90',
+    FLIP_HORIZONTAL: 'FLIP_LEFT_RIGHT',
+    FLIP_VERTICAL: 'FLIP_TOP_BOTTOM',
+    TRANSPOSE: 'TRANSPOSE',
+    TRANSVERSE: 'TRANSVERSE',
+}
+
+
+class JobSpec:
+    """Bir toplu işin seçenekleri"""
+
+    def __init__(self, fix_exif=True, rotate=False, backup=True, rotate_mode=PIXELS, incremental=False,
+                 backup_mode=COPY, durable=False, encode=ORIGINAL, quality=None, trim=PERFECT,
+                 always_lossless=False):
+        if rotate_mode not in ROTATE_MODES:
+            raise ValueError(f"Bilinmeyen döndürme modu: {rotate_mode}")
+        if backup_mode not in BACKUP_MODES:
+            raise ValueError(f"Bilinmeyen yedekleme modu: {backup_mode}")
+        if trim not in TRIM_POLICIES:
+            raise ValueError(f"Bilinmeyen kırpma politikası: {trim}")
+        self.fix_exif = fix_exif
+        self.rotate = rotate
+        self.backup = backup
+        # delta: yalnızca başlığı değişecek dosyaların başlığı günlüğe yazılır
+        self.backup_mode = backup_mode
+        # Yazılan her dosya yeniden adlandırılmadan önce ayrı ayrı diske zorlanır;
+        # iş günlüğüyle çalışan Pipeline bunu her zaman açar
+        self.durable = durable
+        self.rotate_mode = rotate_mode
+        # Manifesto için işlem öncesi içerik özeti hesaplanır
+        self.incremental = incremental
+        # PIL ile yeniden kodlama gerektiğinde kullanılan profil ve kalite (bkz. encoding.py)
+        self.encode = encode
+        self.quality = quality
+        self.encoder = EncodeProfile(encode, quality)
+        # Kayıpsız dönüşümde kısmi MCU kenarı: perfect ise kayıpsız yol atlanır (piksel
+        # kaybı olmaz), trim ise kenar kırpılır; yalnızca kullanıcı açıkça seçerse
+        self.trim = trim
+        # jpegtran yokken BUILTIN_MAX_PIXELS üstü dosyalar da yavaş saf Python motoruyla
+        # kayıpsız döndürülür (varsayılan: sips/PIL ile yeniden kodlanır)
+        self.always_lossless = always_lossless
+
+    @property
+    def has_work(self):
+        return self.fix_exif or self.rotate
+
+    @property
+    def operation(self):
+        """Manifestoda saklanan işlem imzası"""
+        parts = []
+        if self.fix_exif:
+            parts.append('fix_exif')
+        if self.rotate:
+            parts.append(f'rotate90:{self.rotate_mode}')
+        return '+'.join(parts)
+
+    def to_dict(self):
+        return {
+            'fix_exif': self.fix_exif,
+            'rotate': self.rotate,
+            'backup': self.backup,
+            'backup_mode': self.backup_mode,
+            'rotate_mode': self.rotate_mode,
+            'incremental': self.incremental,
+            'durable': self.durable,
+            'encode': self.encode,
+            'quality': self.quality,
+            'trim': self.trim,
+            'always_lossless': self.always_lossless,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in (
+            'fix_exif', 'rotate', 'backup', 'backup_mode', 'rotate_mode', 'incremental', 'durable',
+            'encode', 'quality', 'trim', 'always_lossless',
+        ) if key in data})
+
+
+class FileResult:
+    """Tek bir dosyanın işlem sonucu"""
+
+    def __init__(self, path):
+        self.path = path
+        self.ok = False
+        self.skipped = False
+        self.error = None
+        self.source_hash = None
+        # Uygulanan adımlar ve her adımda kullanılan arka uç (ör. {'fix_exif': 'patch'})
+        self.actions = []
+        self.backends = {}
+        # Uygulanan net dönüşüm ve dosyada kalan Orientation değeri
+        self.transform = None
+        self.orientation = None
+        # Dosya boyutu ve aşama süreleri (saniye, ör. {'backup': 0.002}); bkz. stats.py
+        self.size = None
+        self.timings = {}
+        # PIL ile yeniden kodlandıysa profil, kodlama süresi ve çıktı boyutu
+        self.encode = None
+        # Süreç modunda dönüşümü yapan işçinin o ana kadarki tepe RSS'i (bayt)
+        self.worker_rss = None
+
+    @classmethod
+    def skipped_result(cls, path):
+        """Manifestoya göre güncel olduğu için atlanan dosya"""
+        result = cls(path)
+        result.ok = True
+        result.skipped = True
+        return result
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'ok': self.ok,
+            'skipped': self.skipped,
+            'actions': self.actions,
+            'backends': self.backends,
+            'transform': self.transform,
+            'orientation': self.orientation,
+            'error': self.error,
+            'encode': self.encode,
+        }
+
+
+def iter_jpeg_paths(paths, sniff=False):
+    """Dosya, klasör ve glob desenlerinden JPEG yollarını bulundukça üret"""
+    expanded = []
+    for pattern in paths:
+        if glob.has_magic(pattern):
+            expanded.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            expanded.append(pattern)
+    return iter_jpegs(expanded, sniff=sniff)
+
+
+def find_jpegs(paths, sniff=False):
+    """Dosya, klasör ve glob desenlerinden JPEG dosya listesini oluştur"""
+    return list(iter_jpeg_paths(paths, sniff=sniff))
+
+
+class Processor:
+    """JobSpec'e göre dosyaları işleyen, tkinter'dan bağımsız işleyici"""
+
+    def __init__(self, spec, exiftool_workers=1):
+        self.spec = spec
+        self.exiftool_workers = exiftool_workers
+        self.exiftool_pool = None
+        self.backup_engine = BackupEngine()
+        # Delta yedek günlüğü (DeltaJournal); yoksa delta modunda da tam kopya alınır
+        self.journal = None
+        # İş parçacığının üzerinde çalıştığı dosyanın aşama süreleri
+        self._local = threading.local()
+
+    def open(self):
+        # Kalıcı exiftool işçisi: her dosya için yeni süreç başlatılmaz
+        # (sürüm disk önbelleğinden gelir; her işçi süreç `exiftool -ver` çalıştırmaz)
+        if self.exiftool_pool is None and capabilities.probe().exiftool:
+            self.exiftool_pool = ExifToolPool(size=self.exiftool_workers)
+        return self
+
+    def close(self):
+        if self.exiftool_pool:
+            self.exiftool_pool.close()
+            self.exiftool_pool = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def backup(self, file_path):
+        """Orijinal dosyanın yedeğini al; kullanılan stratejiyi, yedek zaten varsa None döndür"""
+        if self.spec.backup_mode == DELTA and self.journal:
+            if self.plan_file(file_path).transform == IDENTITY:
+                # Görüntü verisine dokunulmayacak: tam kopya yerine başlık günlüğe yazılır
+                try:
+                    with trace.span('backup.delta', path=file_path):
+                        self.journal.record(file_path)
+                    return DELTA
+                except JPEGFormatError:
+                    pass
+        return self.backup_engine.backup(file_path)
+
+    def fix_exif_orientation(self, file_path):
+        """EXIF orientation bilgisini düzelt, kullanılan arka ucu döndür"""
+        return self.set_orientation(file_path, 1)
+
+    def set_orientation(self, file_path, value, before_reencode=None):
+        """Orientation etiketini yaz, kullanılan arka ucu döndür
+
+        before_reencode, PIL ile yeniden kodlamadan (görüntü verisi de değişir) hemen
+        önce çağrılır.
+        """
+        # Orientation etiketi varsa yalnızca değer baytları yerinde değiştirilir
+        try:
+            with trace.span('exif.patch', path=file_path) as span:
+                patched = patch_orientation(file_path, value, durable=self.spec.durable)
+                span.set(applied=patched)
+            if patched:
+                return 'patch'
+        except JPEGFormatError:
+            pass
+
+        # Etiketin eklenmesi gerekiyor: başlık yeniden kurulup görüntü verisi aynen eklenir
+        try:
+            with trace.span('exif.splice', path=file_path) as span:
+                with timed(self._timings(), WRITE):
+                    span.set(strategy=splice_orientation(file_path, value, durable=self.spec.durable))
+            return 'splice'
+        except JPEGFormatError:
+            pass
+
+        # Başlık ayrıştırılamıyor: exiftool veya PIL yoluna düş
+        try:
+            # Önce kalıcı exiftool işçisi ile deneme
+            if not self.exiftool_pool:
+                raise FileNotFoundError('exiftool')
+            with trace.span('exif.exiftool', path=file_path):
+                self.exiftool_pool.set_orientation(file_path, value)
+            return 'exiftool'
+
+        except (ExifToolError, FileNotFoundError, ValueError) as exiftool_error:
+            # exiftool çalışmazsa PIL ile deneme
+            if before_reencode:
+                before_reencode()
+            fallback_reason = str(exiftool_error) or exiftool_error.__class__.__name__
+            try:
+                with trace.span('exif.pil', path=file_path, reason=fallback_reason):
+                    self.set_orientation_pil(file_path, value)
+                return 'pil'
+
+            except Exception as pil_error:
+                raise Exception(f"EXIF orientation düzeltilemedi: {str(pil_error)}")
+
+    def set_orientation_pil(self, file_path, value):
+        """Orientation etiketini PIL + piexif ile yaz (görüntü yeniden kodlanır)"""
+        from PIL import Image
+        import piexif
+
+        with Image.open(file_path) as img:
+            # Kodlama ayarları (ör. özgün nicemleme tabloları) kaynak dosyadan alınır
+            params = self.spec.encoder.params(img)
+
+            # Mevcut EXIF verilerini oku
+            exif_data = img.getexif()
+
+            if exif_data:
+                # PIL için piexif kullan
+                exif_dict = piexif.load(img.info.get('exif', b''))
+                # Orientation değerini yaz
+                exif_dict['0th'][piexif.ImageIFD.Orientation] = value
+                exif_bytes = piexif.dump(exif_dict)
+
+                # Görüntüyü kaydet
+                self._save_atomic(img, file_path, exif=exif_bytes, **params)
+            elif value != 1:
+                # EXIF verisi yoksa yalnızca Orientation içeren blok oluştur
+                exif_bytes = piexif.dump({'0th': {piexif.ImageIFD.Orientation: value}})
+                self._save_atomic(img, file_path, exif=exif_bytes, **params)
+            else:
+                # EXIF verisi yoksa basit kaydetme
+                self._save_atomic(img, file_path, **params)
+
+    def _timings(self):
+        timings = getattr(self._local, 'timings', None)
+        return timings if timings is not None else {}
+
+    def _save_atomic(self, image, file_path, **params):
+        """PIL kaydını geçici dosyaya yapıp hedefin üzerine taşı; yarıda kalan kayıt özgün dosyayı bozmaz"""
+        fd, temp_path = temp_path_for(file_path, suffix='.jpg')
+        os.close(fd)
+        try:
+            start = time.perf_counter()
+            image.save(temp_path, format='JPEG', **params)
+            seconds = time.perf_counter() - start
+            timings = self._timings()
+            timings[ENCODE] = timings.get(ENCODE, 0.0) + seconds
+            self._local.encode = {'profile': self.spec.encoder.label, 'seconds': seconds,
+                                  'bytes': os.path.getsize(temp_path)}
+            with timed(self._timings(), WRITE):
+                replace_atomic(temp_path, file_path, self.spec.durable)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def rotate_image(self, file_path):
+        """Görüntüyü 90 derece saat yönünde döndür, kullanılan arka ucu döndür"""
+        return self.apply_plan(file_path, Plan(ROTATE_90))
+
+    def plan_file(self, file_path):
+        """Dosyanın mevcut Orientation değerine göre net planı hesapla"""
+        try:
+            current = read_orientation(file_path)
+        except JPEGFormatError as e:
+            # Başlık ayrıştırılamıyor: değer PIL ile okunur; PIL de açamazsa dosya hatalıdır
+            current = self.read_orientation_pil(file_path, e)
+        return plan(self.spec, current)
+
+    def read_orientation_pil(self, file_path, parse_error):
+        """Orientation değerini PIL ile oku (etiket yoksa None); açılamazsa hata fırlat"""
+        from PIL import Image
+
+        try:
+            with Image.open(file_path) as img:
+                img.verify()
+                return img.getexif().get(0x0112)
+        except Exception as pil_error:
+            raise Exception(f"JPEG başlığı okunamadı: {parse_error}; PIL: {pil_error}")
+
+    def apply_plan(self, file_path, file_plan, before_reencode=None):
+        """Planı ilk başarılı arka uçla uygula, kullanılan arka ucu döndür"""
+        for backend in file_plan.backends():
+            if backend == NONE:
+                return NONE
+            if backend == PATCH:
+                return self.set_orientation(file_path, file_plan.orientation, before_reencode)
+            if backend == LOSSLESS:
+                with trace.span('rotate.lossless', path=file_path, transform=file_plan.transform) as span:
+                    applied = self._apply_lossless(file_path, file_plan)
+                    span.set(applied=applied)
+                if applied:
+                    return LOSSLESS
+            if backend == SIPS:
+                with trace.span('rotate.sips', path=file_path, transform=file_plan.transform) as span:
+                    applied = self._apply_sips(file_path, file_plan)
+                    span.set(applied=applied)
+                if applied:
+                    return SIPS
+            if backend == REENCODE:
+                with trace.span('rotate.pil', path=file_path, transform=file_plan.transform):
+                    self._apply_reencode(file_path, file_plan)
+                return REENCODE
+        raise Exception(f"Plan uygulanamadı: {file_plan}")
+
+    def _apply_lossless(self, file_path, file_plan):
+        """Kayıpsız dönüşüm ve etiket tek yazımda; desteklenmeyen dosyada False
+
+        jpegtran varsa o kullanılır; saf Python motoru always_lossless verilmedikçe
+        yalnızca BUILTIN_MAX_PIXELS'e kadar denenir (daha büyükleri sips/PIL'e düşer).
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            # Kısmi MCU kenarı yalnızca trim seçilirse kırpılır; aksi halde dosya sips/PIL yoluna düşer
+            if capabilities.probe().lossless == capabilities.LOSSLESS_JPEGTRAN:
+                output = transform_jpeg_jpegtran(data, file_plan.transform, trim=self.spec.trim)
+            else:
+                max_pixels = None if self.spec.always_lossless else BUILTIN_MAX_PIXELS
+                output = transform_jpeg(data, file_plan.transform, trim=self.spec.trim, max_pixels=max_pixels)
+            output = bytearray(output)
+        except (LosslessError, JPEGFormatError):
+            return False
+
+        needs_insert = False
+        if file_plan.orientation is not None and not patch_orientation_bytes(output, file_plan.orientation):
+            try:
+                output = splice_orientation_bytes(output, file_plan.orientation)
+            except JPEGFormatError:
+                # Başlık kurulamazsa etiket yazımdan sonra geri dönüş yollarıyla eklenir
+                needs_insert = True
+        with timed(self._timings(), WRITE):
+            write_atomic(file_path, output, durable=self.spec.durable)
+        if needs_insert:
+            self.set_orientation(file_path, file_plan.orientation)
+        return True
+
+    def _apply_sips(self, file_path, file_plan):
+        """macOS sips ile dönüştür; sips yoksa veya başarısızsa False"""
+        # sips geçici dosyaya yazar, etiket de geçici dosyaya yazılır; hedef tek kez,
+        # atomik olarak değişir (yeni pikseller eski etiketle hiç görünmez)
+        fd, temp_path = temp_path_for(file_path, suffix='.jpg')
+        os.close(fd)
+        try:
+            result = subprocess.run(
+                ['sips'] + SIPS_ARGS[file_plan.transform] + [file_path, '--out', temp_path],
+                capture_output=True, text=True, timeout=30,
+            )
+            if result.returncode != 0:
+                return False
+            if file_plan.orientation is not None:
+                self.set_orientation(temp_path, file_plan.orientation)
+            with timed(self._timings(), WRITE):
+                replace_atomic(temp_path, file_path, self.spec.durable)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return False
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return True
+
+    def _apply_reencode(self, file_path, file_plan):
+        """PIL ile tek çözme/kodlama: dönüşüm ve etiket aynı kayıtta"""
+        from PIL import Image
+        import piexif
+
+        try:
+            with Image.open(file_path) as img:
+                params = self.spec.encoder.params(img)
+                transformed = img.transpose(getattr(Image.Transpose, PIL_TRANSPOSE[file_plan.transform]))
+
+                # EXIF verilerini koru, gerekiyorsa Orientation'ı güncelle
+                exif = img.info.get('exif')
+                if file_plan.orientation is not None:
+                    exif_dict = piexif.load(exif) if exif else {'0th': {}}
+                    exif_dict['0th'][piexif.ImageIFD.Orientation] = file_plan.orientation
+                    exif = piexif.dump(exif_dict)
+                if exif:
+                    self._save_atomic(transformed, file_path, exif=exif, **params)
+                else:
+                    self._save_atomic(transformed, file_path, **params)
+
+        except Exception as pil_error:
+            raise Exception(f"Döndürme işlemi başarısız: {str(pil_error)}")
+
+    def prepare(self, file_path):
+        """Yedekleme aşaması: içerik özeti ve yedek; hatalar FileResult içinde döner"""
+        result = FileResult(file_path)
+        try:
+            result.size = os.path.getsize(file_path)
+            if self.spec.incremental:
+                with timed(result.timings, HASH):
+                    result.source_hash = fast_hash(file_path)
+
+            # Yedek oluştur
+            if self.spec.backup:
+                with timed(result.timings, BACKUP):
+                    strategy = self.backup(file_path)
+                if strategy:
+                    result.actions.append('backup')
+                    result.backends['backup'] = strategy
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def transform(self, result):
+        """Dönüşüm aşaması: planı hesapla ve uygula"""
+        if result.error:
+            return result
+        file_path = result.path
+        timings = result.timings
+        self._local.timings = timings
+        self._local.encode = None
+        try:
+            # EXIF düzeltme ve döndürme tek plana indirgenir: en fazla bir okuma, bir yazma
+            start = time.perf_counter()
+            nested_before = timings.get(WRITE, 0.0) + timings.get(ENCODE, 0.0)
+            file_plan = self.plan_file(file_path)
+            with trace.span('file.transform', path=file_path, transform=file_plan.transform) as span:
+                result.backends['write'] = self.apply_plan(
+                    file_path, file_plan, before_reencode=self._full_backup_hook(result))
+                span.set(backend=result.backends['write'])
+            # PIL kodlaması ve diske yazma (geçici dosya, fsync, yeniden adlandırma) ayrı aşamalardır
+            stage = EXIF if file_plan.transform == IDENTITY else ROTATE
+            timings[stage] = (timings.get(stage, 0.0) + time.perf_counter() - start
+                              - (timings.get(WRITE, 0.0) + timings.get(ENCODE, 0.0) - nested_before))
+            result.encode = self._local.encode
+            result.transform = file_plan.transform
+            result.orientation = file_plan.final_orientation
+
+            if self.spec.fix_exif:
+                result.actions.append('fix_exif')
+            if self.spec.rotate:
+                result.actions.append('rotate')
+
+            result.ok = True
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            self._local.timings = None
+            self._local.encode = None
+        return result
+
+    def _full_backup_hook(self, result):
+        """Delta yedeği alınmış dosya yeniden kodlanacaksa önce tam kopya alan geri çağrı"""
+        if result.backends.get('backup') != DELTA:
+            return None
+
+        def full_backup():
+            strategy = self.backup_engine.backup(result.path)
+            if strategy:
+                result.backends['backup'] = f"{DELTA}+{strategy}"
+        return full_backup
+
+    def verify(self, result):
+        """Doğrulama aşaması: yazılan dosyanın başlığı okunabiliyor ve Orientation beklenen değerde mi?"""
+        if not result.ok or result.skipped or result.backends.get('write', NONE) == NONE:
+            return result
+        try:
+            with timed(result.timings, VERIFY):
+                current = normalize(read_orientation(result.path))
+        except (OSError, JPEGFormatError) as e:
+            current = None
+            reason = str(e)
+        else:
+            reason = f"Orientation {current}, beklenen {result.orientation}"
+        if current != result.orientation:
+            result.ok = False
+            result.error = f"Doğrulama başarısız: {reason}"
+        return result
+
+    def process_file(self, file_path):
+        """Tek dosyayı işle; hatalar FileResult içinde döner, fırlatılmaz"""
+        return self.transform(self.prepare(file_path))
+
+    def run(self, paths, on_start=None, on_result=None, manifest=None):
+        """Dosyaları sırayla işle; (başarılı, hatalı) sayılarını döndür
+
+        manifest verilirse aynı işlemle işlenmiş ve değişmemiş dosyalar atlanır.
+        """
+        success_count = 0
+        error_count = 0
+        with self:
+            for index, file_path in enumerate(paths):
+                if on_start:
+                    on_start(index, file_path)
+                if manifest and manifest.is_current(file_path, self.spec.operation):
+                    result = FileResult.skipped_result(file_path)
+                else:
+                    result = self.process_file(file_path)
+                    if manifest and result.ok:
+                        manifest.record(file_path, self.spec.operation, result.source_hash)
+                if result.ok:
+                    success_count += 1
+                else:
+                    error_count += 1
+                if on_result:
+                    on_result(index, result)
+        return success_count, error_count
@@ -0,0 +1,186 @@
+"""
+Delta yedek günlüğü
+Yalnızca Orientation etiketi değişecek dosyaların tam kopyası yerine, sıkıştırılmış
+başlık bölgesi (SOI'den görüntü verisinin başına kadar: APP1/EXIF dahil tüm
+segmentler) ve dosyanın tam içerik özeti, çalıştırma başına tek bir yalnızca-ekleme
+günlüğüne yazılır. Geri yüklemede bu başlık dosyanın bugünkü görüntü verisinin önüne
+konur ve sonuç özetle doğrulanmadan diske yazılmaz.
+"""
+
+import hashlib
+import io
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+from .backup import BACKUP_SUFFIX
+from .jpegmeta import SOS, JPEGFormatError, iter_segments
+from .lossless import write_atomic
+
+MAGIC = b'JPEGTO-DELTA 1\n'
+JOURNAL_SUFFIX = '.delta'
+
+# Kayıt çerçevesi: meta uzunluğu, veri uzunluğu
+RECORD_HEADER = struct.Struct('>II')
+
+READ_SIZE = 1024 * 1024
+
+
+class DeltaError(Exception):
+    """Günlük okunamadı veya dosya özgün haline getirilemedi"""
+
+
+def default_journal_path(root):
+    """Kök klasörde çalıştırmaya özel günlük yolu"""
+    return os.path.join(root, time.strftime('.jpegto-%Y%m%d-%H%M%S') + JOURNAL_SUFFIX)
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def header_end(f):
+    """Görüntü verisinin (SOS segmentinden sonraki entropi verisinin) başladığı konum"""
+    for segment in iter_segments(f):
+        if segment.marker == SOS:
+            return segment.end
+    raise JPEGFormatError("SOS işaretçisi bulunamadı")
+
+
+class DeltaRecord:
+    """Bir dosyanın özgün başlığı ve tam içerik özeti"""
+
+    __slots__ = ('path', 'size', 'hash', 'header')
+
+    def __init__(self, path, size, hash, header):
+        self.path = path
+        self.size = size
+        self.hash = hash
+        self.header = header
+
+    def reconstruct(self, current):
+        """Bugünkü dosya içeriğinden özgün içeriği oluştur"""
+        end = header_end(io.BytesIO(current))
+        return self.header + current[end:]
+
+
+class DeltaJournal:
+    """Çalıştırma boyunca delta kayıtlarının eklendiği günlük; iş parçacığı güvenli"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self.records = 0
+        self.bytes_written = 0
+
+    def record(self, file_path):
+        """Dosyanın başlığını ve özetini günlüğe ekle, kaydın boyutunu döndür"""
+        digest = hashlib.blake2b(digest_size=32)
+        with open(file_path, 'rb') as f:
+            end = header_end(f)
+            f.seek(0)
+            header = f.read(end)
+            digest.update(header)
+            size = len(header)
+            while True:
+                chunk = f.read(READ_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+
+        meta = json.dumps({
+            'path': os.path.abspath(file_path),
+            'size': size,
+            'hash': digest.hexdigest(),
+        }, ensure_ascii=False).encode('utf-8')
+        data = zlib.compress(header)
+        frame = RECORD_HEADER.pack(len(meta), len(data)) + meta + data
+        with self._lock:
+            self._file.write(frame)
+            # Kayıt, dosya yazılmadan önce işletim sistemine aktarılır (süreç çökse de kalır)
+            self._file.flush()
+            self.records += 1
+            self.bytes_written += len(frame)
+        return len(frame)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(path):
+    """Günlükteki kayıtları sırayla üret; yarım kalmış son kayıt yok sayılır"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise DeltaError(f"Delta günlüğü değil: {path}")
+        while True:
+            raw = f.read(RECORD_HEADER.size)
+            if len(raw) < RECORD_HEADER.size:
+                return
+            meta_length, data_length = RECORD_HEADER.unpack(raw)
+            meta = f.read(meta_length)
+            data = f.read(data_length)
+            if len(meta) < meta_length or len(data) < data_length:
+                return
+            meta = json.loads(meta.decode('utf-8'))
+            yield DeltaRecord(meta['path'], meta['size'], meta['hash'], zlib.decompress(data))
+
+
+def restore_record(record):
+    """Dosyayı özgün haline getir; yapılan işlemi açıklayan metni döndür"""
+    with open(record.path, 'rb') as f:
+        current = f.read()
+    if content_hash(current) == record.hash:
+        return "zaten özgün"
+
+    try:
+        original = record.reconstruct(current)
+    except JPEGFormatError:
+        original = None
+    if original is not None and len(original) == record.size and content_hash(original) == record.hash:
+        write_atomic(record.path, original)
+        return "başlık geri yüklendi"
+
+    # Görüntü verisi de değişmişse (yeniden kodlama) tam kopya yedeğe bakılır
+    backup_path = record.path + BACKUP_SUFFIX
+    if os.path.exists(backup_path):
+        with open(backup_path, 'rb') as f:
+            original = f.read()
+        if content_hash(original) == record.hash:
+            write_atomic(record.path, original)
+            return "tam yedekten geri yüklendi"
+    raise DeltaError("özgün içerik doğrulanamadı (görüntü verisi değişmiş)")
+
+
+def restore(journal_path, paths=None):
+    """Günlükteki dosyaları geri yükle; (yol, hata, açıklama) üçlülerini üret
+
+    paths verilirse yalnızca bu dosyalar geri yüklenir. Aynı dosyanın birden fazla
+    kaydı varsa ilki (çalıştırmadan önceki hali) kullanılır.
+    """
+    wanted = {os.path.abspath(p) for p in paths} if paths else None
+    seen = set()
+    for record in read_journal(journal_path):
+        if record.path in seen or (wanted is not None and record.path not in wanted):
+            continue
+        seen.add(record.path)
+        try:
+            yield record.path, None, restore_record(record)
+        except (OSError, DeltaError) as e:
+            yield record.path, str(e), None
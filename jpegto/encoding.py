@@ -0,0 +1,71 @@
+"""
+Yeniden kodlama profilleri
+PIL geri dönüşü görüntüyü yeniden kodlamak zorunda kaldığında kullanılacak ayarlar:
+    original: özgün nicemleme tabloları, alt örnekleme ve aşamalı kodlama korunur
+              (kamera tablolarından büyük dosya üretmez, Huffman iyileştirmesi yapılmaz)
+    fast:     sabit kalite, Huffman iyileştirme geçişi yok
+    small:    sabit kalite, iyileştirilmiş Huffman tabloları ve aşamalı kodlama
+Kalite açıkça verilirse özgün tablolar yerine bu kalite kullanılır. Her kodlamanın
+süresi ve çıktı boyutu ölçülür (FileResult.encode, RunStats.encodes).
+"""
+
+ORIGINAL = 'original'
+FAST = 'fast'
+SMALL = 'small'
+PROFILES = (ORIGINAL, FAST, SMALL)
+
+# Tablo korunamadığında veya fast/small için kalite verilmediğinde
+DEFAULT_QUALITY = 95
+
+
+def _source_sampling(image):
+    """Kaynak JPEG'in alt örneklemesi (PIL: 0=4:4:4, 1=4:2:2, 2=4:2:0); bilinmiyorsa None"""
+    from PIL import JpegImagePlugin
+
+    try:
+        sampling = JpegImagePlugin.get_sampling(image)
+    except (AttributeError, TypeError):
+        return None
+    return sampling if sampling >= 0 else None
+
+
+class EncodeProfile:
+    """Bir yeniden kodlama profili; params() kaynak görüntüye göre PIL kayıt ayarlarını verir"""
+
+    __slots__ = ('name', 'quality', 'optimize', 'progressive', 'keep')
+
+    def __init__(self, name=ORIGINAL, quality=None):
+        if name not in PROFILES:
+            raise ValueError(f"Bilinmeyen kodlama profili: {name}")
+        if quality is not None and not 1 <= quality <= 100:
+            raise ValueError(f"Kalite 1-100 arasında olmalı: {quality}")
+        self.name = name
+        self.quality = quality
+        self.optimize = name == SMALL
+        self.progressive = name == SMALL
+        # Özgün tablolar ve alt örnekleme korunur
+        self.keep = name == ORIGINAL
+
+    @property
+    def label(self):
+        """Raporlarda görünen ad (ör. 'fast' veya 'original/q85')"""
+        return self.name if self.quality is None else f"{self.name}/q{self.quality}"
+
+    def params(self, source):
+        """Kaynak (çözülmüş JpegImageFile) görüntüye göre image.save() ayarları"""
+        params = {'optimize': self.optimize}
+        if self.keep:
+            tables = getattr(source, 'quantization', None)
+            if self.quality is None and tables:
+                params['qtables'] = tables
+            else:
+                params['quality'] = self.quality or DEFAULT_QUALITY
+            # 90°'lik dönüşümde 4:2:2, 4:4:0 olmalıdır; PIL bunu kodlayamadığından 4:2:2 kalır
+            sampling = _source_sampling(source)
+            if sampling is not None:
+                params['subsampling'] = sampling
+            params['progressive'] = bool(source.info.get('progressive') or source.info.get('progression'))
+        else:
+            params['quality'] = self.quality or DEFAULT_QUALITY
+            params['progressive'] = self.progressive
+        return params
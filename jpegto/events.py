@@ -0,0 +1,105 @@
+"""
+Arayüz için birleştirilmiş olay kuyruğu
+İşçi iş parçacıkları günlük satırlarını ve ilerlemeyi bu kuyruğa bırakır; arayüz
+kuyruğu sabit bir kare hızında tek seferde boşaltır. Bekleyen günlük satırları sınırlı
+bir halka tamponda tutulur (arayüz yetişemezse en eskiler atılır), ilerleme
+güncellemeleri son değerde birleştirilir. Böylece arayüzün maliyeti işçilerin hızından
+bağımsız kalır. İstenirse tüm satırlar ayrıca diskteki bir günlük dosyasına yazılır.
+"""
+
+import collections
+import os
+import threading
+import time
+
+# Arayüzün kuyruğu boşaltma aralığı (milisaniye, ~20 kare/sn)
+FRAME_INTERVAL_MS = 50
+
+# Günlük görünümünde ve bekleyen satırlarda tutulan en fazla satır
+LOG_LINES = 5000
+
+LOG_SUFFIX = '.log'
+
+
+def default_log_path(root):
+    """Kök klasörde çalıştırmaya özel tam günlük yolu"""
+    return os.path.join(root, time.strftime('.jpegto-%Y%m%d-%H%M%S') + LOG_SUFFIX)
+
+
+class Frame:
+    """Bir boşaltmada biriken olaylar"""
+
+    __slots__ = ('lines', 'dropped', 'total', 'progress', 'calls')
+
+    def __init__(self, lines, dropped, total, progress, calls):
+        self.lines = lines
+        self.dropped = dropped
+        self.total = total
+        self.progress = progress
+        self.calls = calls
+
+
+class EventQueue:
+    """İş parçacığı güvenli, birleştiren olay kuyruğu"""
+
+    def __init__(self, limit=LOG_LINES):
+        self._lines = collections.deque(maxlen=limit)
+        self._dropped = 0
+        self._total = None
+        self._progress = None
+        self._calls = []
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open_log(self, path):
+        """Bundan sonraki tüm satırları ayrıca bu dosyaya yaz"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+            self._file = open(path, 'a', encoding='utf-8')
+        return path
+
+    def close_log(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def log(self, message):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(message)
+            if self._file:
+                self._file.write(message + '\n')
+
+    def total(self, total):
+        """Toplam iş sayısı (ilerleme çubuğunu belirli moda geçirir)"""
+        with self._lock:
+            self._total = total
+
+    def progress(self, done):
+        """Tamamlanan iş sayısı; bir karedeki güncellemelerden yalnızca sonuncusu kalır"""
+        with self._lock:
+            self._progress = done
+
+    def call(self, function, *args):
+        """Arayüz iş parçacığında, bekleyen satırlardan sonra çağrılacak fonksiyon"""
+        with self._lock:
+            self._calls.append((function, args))
+
+    def drain(self):
+        """Biriken olayları al ve kuyruğu sıfırla; boşsa None"""
+        with self._lock:
+            if not (self._lines or self._dropped or self._total is not None
+                    or self._progress is not None or self._calls):
+                return None
+            frame = Frame(list(self._lines), self._dropped, self._total, self._progress, self._calls)
+            self._lines.clear()
+            self._dropped = 0
+            self._total = None
+            self._progress = None
+            self._calls = []
+            if self._file:
+                self._file.flush()
+        return frame
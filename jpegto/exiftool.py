@@ -0,0 +1,262 @@
+"""
+Kalıcı exiftool işçileri
+Her dosya için yeni bir exiftool süreci başlatmak yerine `-stay_open True -@ -` ile
+açık tutulan süreçlere stdin üzerinden komut gönderilir ve `-execute` işaretleriyle
+cevaplar ayrıştırılır. Perl başlangıç maliyeti işçi başına yalnızca bir kez ödenir.
+"""
+
+import os
+import queue
+import selectors
+import subprocess
+import threading
+import time
+
+from . import trace
+
+EXIFTOOL = 'exiftool'
+
+# `-stay_open` ve stderr işareti için kullanılan `-echo4` bu sürümden itibaren mevcut
+MIN_STAY_OPEN_VERSION = 10.0
+
+_version_cache = {}
+_version_lock = threading.Lock()
+
+
+class ExifToolError(Exception):
+    """exiftool komutu başarısız oldu veya işçi yanıt vermedi"""
+
+
+def probe_exiftool(executable=EXIFTOOL, timeout=5, refresh=False):
+    """exiftool sürümünü döndür, bulunamazsa None (sonuç önbelleğe alınır)"""
+    with _version_lock:
+        if executable in _version_cache and not refresh:
+            return _version_cache[executable]
+        with trace.span('exiftool.probe', executable=executable) as span:
+            try:
+                result = subprocess.run([executable, '-ver'], capture_output=True, text=True, timeout=timeout)
+                version = result.stdout.strip() if result.returncode == 0 else None
+            except (FileNotFoundError, PermissionError, subprocess.TimeoutExpired):
+                version = None
+            span.set(version=version)
+        _version_cache[executable] = version
+        return version
+
+
+def remember_version(executable, version):
+    """Başka yerde (ör. disk önbelleğinde) bilinen sürümü önbelleğe koy"""
+    with _version_lock:
+        _version_cache[executable] = version
+
+
+def _version_number(version):
+    try:
+        return float(version)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ExifToolWorker:
+    """`-stay_open` modunda çalışan tek bir exiftool süreci"""
+
+    def __init__(self, executable=EXIFTOOL, timeout=30):
+        self.executable = executable
+        self.timeout = timeout
+        self.process = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Süreci başlat (sürüm kontrolü probe_exiftool ile yapılır)"""
+        version = probe_exiftool(self.executable)
+        if version is None:
+            raise FileNotFoundError(f"{self.executable} bulunamadı")
+        if _version_number(version) < MIN_STAY_OPEN_VERSION:
+            raise ExifToolError(f"exiftool {version} -stay_open desteklemiyor")
+
+        self.process = subprocess.Popen(
+            [self.executable, '-stay_open', 'True', '-@', '-', '-common_args', '-charset', 'filename=utf8'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def execute(self, args, timeout=None):
+        """Argümanları gönder, (stdout, stderr) döndür"""
+        with self._lock:
+            if not self.alive:
+                self.start()
+
+            for arg in args:
+                if '\n' in arg or '\r' in arg:
+                    raise ValueError(f"Argüman satır sonu içeremez: {arg!r}")
+
+            self._sequence += 1
+            sentinel = f"{{ready{self._sequence}}}"
+            # -echo4 stderr'e de aynı işareti yazar, böylece iki akış da sınırlanır
+            command = list(args) + ['-echo4', sentinel, f'-execute{self._sequence}']
+            payload = ('\n'.join(command) + '\n').encode('utf-8')
+
+            try:
+                self.process.stdin.write(payload)
+                self.process.stdin.flush()
+                stdout, stderr = self._read_until(sentinel.encode('ascii'), timeout or self.timeout)
+            except (BrokenPipeError, OSError) as e:
+                self.kill()
+                raise ExifToolError(f"exiftool işçisi ile iletişim kesildi: {e}")
+
+            return stdout, stderr
+
+    def _read_until(self, sentinel, timeout):
+        """stdout ve stderr'i işaret görülene kadar oku"""
+        marker = sentinel + b'\n'
+        buffers = {'stdout': b'', 'stderr': b''}
+        pending = {'stdout', 'stderr'}
+        deadline = time.monotonic() + timeout
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.process.stdout, selectors.EVENT_READ, 'stdout')
+            selector.register(self.process.stderr, selectors.EVENT_READ, 'stderr')
+
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.kill()
+                    raise ExifToolError(f"exiftool işçisi {timeout} sn içinde yanıt vermedi")
+
+                for key, _ in selector.select(remaining):
+                    name = key.data
+                    chunk = os.read(key.fileobj.fileno(), 65536)
+                    if not chunk:
+                        self.kill()
+                        raise ExifToolError("exiftool işçisi beklenmedik şekilde kapandı")
+                    buffers[name] += chunk
+                    if buffers[name].endswith(marker) or buffers[name].endswith(sentinel + b'\r\n'):
+                        pending.discard(name)
+                        selector.unregister(key.fileobj)
+
+        stdout = buffers['stdout'].rsplit(sentinel, 1)[0]
+        stderr = buffers['stderr'].rsplit(sentinel, 1)[0]
+        return stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+
+    def ping(self, timeout=5):
+        """Sağlık kontrolü: işçi `-ver` komutuna zamanında cevap veriyor mu?"""
+        try:
+            stdout, _ = self.execute(['-ver'], timeout=timeout)
+            return bool(stdout.strip())
+        except (ExifToolError, FileNotFoundError):
+            return False
+
+    def restart(self):
+        """Takılan işçiyi öldür ve yeniden başlat"""
+        with self._lock:
+            self.kill()
+            self.start()
+
+    def kill(self):
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self._close_pipes()
+        self.process = None
+
+    def close(self):
+        """Süreci düzgün şekilde kapat"""
+        with self._lock:
+            if not self.alive:
+                self.process = None
+                return
+            try:
+                self.process.stdin.write(b'-stay_open\nFalse\n')
+                self.process.stdin.flush()
+                self.process.wait(timeout=5)
+                self._close_pipes()
+                self.process = None
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+
+    def _close_pipes(self):
+        for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class ExifToolPool:
+    """N adet kalıcı exiftool işçisinden oluşan havuz"""
+
+    def __init__(self, size=1, executable=EXIFTOOL, timeout=30):
+        self.size = max(1, size)
+        self.executable = executable
+        self.timeout = timeout
+        self._workers = [ExifToolWorker(executable, timeout) for _ in range(self.size)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._closed = False
+
+    @staticmethod
+    def available(executable=EXIFTOOL):
+        return probe_exiftool(executable) is not None
+
+    def execute(self, args, timeout=None):
+        """Boştaki bir işçide komutu çalıştır"""
+        if self._closed:
+            raise ExifToolError("exiftool havuzu kapatıldı")
+        worker = self._idle.get()
+        try:
+            return worker.execute(args, timeout=timeout)
+        finally:
+            self._idle.put(worker)
+
+    def set_orientation(self, file_path, value=1):
+        """Orientation etiketini yaz, başarısızsa ExifToolError fırlat"""
+        stdout, stderr = self.execute([f'-Orientation={value}', '-n', '-overwrite_original', file_path])
+        if 'Error' in stderr or ('updated' not in stdout and 'unchanged' not in stdout):
+            message = stderr.strip() or stdout.strip() or 'bilinmeyen hata'
+            raise ExifToolError(message)
+        return stdout
+
+    def health_check(self, timeout=5):
+        """Boştaki işçileri yokla, yanıt vermeyenleri yeniden başlat; sağlıklı işçi sayısını döndür"""
+        healthy = 0
+        checked = []
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            checked.append(worker)
+            if not worker.alive:
+                # Henüz başlatılmamış veya kapanmış işçi ilk komutta açılır
+                healthy += 1
+                continue
+            if worker.ping(timeout):
+                healthy += 1
+            else:
+                try:
+                    worker.restart()
+                    healthy += 1
+                except (ExifToolError, FileNotFoundError, OSError):
+                    pass
+        for worker in checked:
+            self._idle.put(worker)
+        return healthy
+
+    def close(self):
+        self._closed = True
+        for worker in self._workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
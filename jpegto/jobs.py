@@ -0,0 +1,283 @@
+"""
+Çökmeye dayanıklı, sürdürülebilir işler için önden yazmalı iş günlüğü
+Kök klasördeki tek bir JSON satırları dosyasına işin seçenekleri ve kaynakları,
+taranan her dosya (kimlik numarasıyla), taramanın bittiği, her dosyanın işlem
+niyeti (işlem öncesi içerik özetiyle) ve tamamlanması yazılır. Niyet kaydı dosyaya
+dokunulmadan önce diske zorlanır. İş günlüğü varken her geçici dosya yeniden
+adlandırılmadan önce fsync edilir; yeniden adlandırmaların klasörleri ve tamamlanma
+kayıtları ise aynı toplu fsync ile (bu sırayla) kalıcılaştırılır, böylece kalıcı bir
+tamamlanma kaydı kalıcı olmayan bir yeniden adlandırmayı göstermez.
+İş yarıda kalırsa --resume ile tamamlanmış dosyalar atlanır; niyeti olup tamamlanmamış
+dosyanın özeti değişmiş ve baştan sona çözülebiliyorsa yazma gerçekleşmiş sayılır
+(yazmalar atomik olduğundan dosya ya eski ya yeni haldedir); çözülemiyorsa dosya
+yeniden işlenir.
+"""
+
+import json
+import os
+import threading
+import time
+
+from .core import JobSpec
+from .manifest import fast_hash
+
+JOB_NAME = '.jpegto-job.wal'
+
+# Bu kadar tamamlanma kaydında bir toplu fsync yapılır
+SYNC_EVERY = 256
+
+# ... ya da son toplu fsync'ten bu kadar saniye geçtiyse
+SYNC_INTERVAL = 1.0
+
+# write_atomic, yedekleme ve PIL/sips kayıtlarının geçici dosya uzantıları
+TEMP_SUFFIXES = ('.tmp', '.jpg')
+
+
+class JobError(Exception):
+    """İş günlüğü okunamadı veya oluşturulamadı"""
+
+
+def default_job_path(root):
+    return os.path.join(root, JOB_NAME)
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Windows'ta klasörler açılamaz
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _decodes(path):
+    """Dosya baştan sona çözülebiliyor mu? (yalnızca başlık değil, eksik veri de yakalanır)"""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image.load()
+    except Exception:
+        return False
+    return True
+
+
+class JobJournal:
+    """Bir toplu işin önden yazmalı günlüğü; iş parçacığı güvenli"""
+
+    def __init__(self, path, spec, sources, sniff=False):
+        self.path = path
+        self.spec = spec
+        self.sources = sources
+        self.sniff = sniff
+        # Taranan yollar (kimlik = listedeki sıra)
+        self.paths = []
+        self.ids = {}
+        self.scan_complete = False
+        self.intents = {}
+        self.completed = set()
+        self._file = None
+        self._lock = threading.Lock()
+        # Toplu fsync'leri sıraya koyar; fsync'ler _lock tutulmadan yapılır
+        self._sync_lock = threading.Lock()
+        self._unsynced_intents = 0
+        # Klasörleri fsync edilene kadar dosyaya yazılmayan tamamlanma kayıtları
+        self._pending_completes = []
+        self._dirty_directories = set()
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, path, spec, sources, sniff=False):
+        """Yeni iş günlüğü oluştur; tamamlanmamış bir iş varsa JobError"""
+        sources = [os.path.abspath(p) for p in sources]
+        job = cls(path, spec, sources, sniff)
+        try:
+            job._file = open(path, 'x', encoding='utf-8')
+        except FileExistsError:
+            raise JobError(f"Tamamlanmamış bir iş var: {path} (--resume ile sürdürün veya silin)")
+        job._append({'job': 1, 'spec': spec.to_dict(), 'sources': sources, 'sniff': sniff,
+                     'created': time.time()})
+        job.sync()
+        return job
+
+    @classmethod
+    def resume(cls, path):
+        """Yarıda kalmış işin günlüğünü oku ve kaldığı yerden eklemeye hazırla"""
+        job = None
+        valid_end = 0
+        try:
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Çökmede yarım kalmış son satır
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    valid_end += len(line)
+                    if job is None:
+                        if record.get('job') != 1:
+                            raise JobError(f"İş günlüğü değil: {path}")
+                        job = cls(path, JobSpec.from_dict(record['spec']), record['sources'],
+                                  record.get('sniff', False))
+                    elif 's' in record:
+                        job.ids[record['p']] = record['s']
+                        job.paths.append(record['p'])
+                    elif 'i' in record:
+                        job.intents[record['i']] = record['h']
+                    elif 'c' in record:
+                        job.completed.add(record['c'])
+                    elif 't' in record:
+                        job.scan_complete = True
+        except FileNotFoundError:
+            raise JobError(f"Sürdürülecek iş bulunamadı: {path}")
+        if job is None:
+            raise JobError(f"İş günlüğü boş: {path}")
+        # Yarım satır atılır, yeni kayıtlar sona eklenir
+        os.truncate(path, valid_end)
+        job._file = open(path, 'a', encoding='utf-8')
+        job._remove_stale_temps()
+        return job
+
+    def _remove_stale_temps(self):
+        """Yarıda kalan yazmalardan kalmış geçici dosyaları sil"""
+        interrupted = {os.path.dirname(self.paths[file_id])
+                       for file_id in self.intents if file_id not in self.completed}
+        for directory in interrupted:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if name.startswith('.jpegto-') and name.endswith(TEMP_SUFFIXES):
+                    try:
+                        os.unlink(os.path.join(directory, name))
+                    except OSError:
+                        pass
+
+    @property
+    def remaining(self):
+        return len(self.paths) - len(self.completed)
+
+    def _append(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def register(self, file_path):
+        """Taranan dosyanın kimliğini döndür; yeni dosyaysa günlüğe ekle"""
+        with self._lock:
+            file_id = self.ids.get(file_path)
+            if file_id is None:
+                file_id = len(self.paths)
+                self.ids[file_path] = file_id
+                self.paths.append(file_path)
+                self._append({'s': file_id, 'p': file_path})
+            return file_id
+
+    def finish_scan(self, total):
+        with self._lock:
+            self.scan_complete = True
+            self._append({'t': total})
+
+    def pending_paths(self):
+        """Taraması bitmiş işte henüz tamamlanmamış dosyalar"""
+        for file_id, file_path in enumerate(self.paths):
+            if file_id not in self.completed:
+                yield file_path
+
+    def is_complete(self, file_path):
+        file_id = self.ids.get(file_path)
+        return file_id is not None and file_id in self.completed
+
+    def recover(self, file_path):
+        """Niyeti yazılmış ama tamamlanmamış dosya çökmeden önce yazıldıysa tamamlanmış say"""
+        file_id = self.ids.get(file_path)
+        source_hash = self.intents.get(file_id)
+        if source_hash is None:
+            return False
+        try:
+            if fast_hash(file_path) == source_hash:
+                # Dosyaya henüz dokunulmamış: yeniden işlenecek
+                return False
+        except OSError:
+            return False
+        # Başlık sağlam olsa da verinin bir kısmı eksik kalmış olabilir
+        if not _decodes(file_path):
+            return False
+        self.complete(file_path, True)
+        return True
+
+    def intent(self, file_path, source_hash):
+        """Dosyaya dokunmadan önceki niyet kaydı; sync() ile kalıcılaşır"""
+        with self._lock:
+            file_id = self.ids[file_path]
+            self.intents[file_id] = source_hash
+            self._append({'i': file_id, 'h': source_hash})
+            self._unsynced_intents += 1
+
+    def complete(self, file_path, ok, written=False):
+        """Dosyanın tamamlanma kaydı; yazılan dosyanın klasörü toplu fsync'e eklenir"""
+        with self._lock:
+            file_id = self.ids[file_path]
+            self.completed.add(file_id)
+            self._pending_completes.append({'c': file_id, 'ok': ok})
+            if written:
+                self._dirty_directories.add(os.path.dirname(os.path.abspath(file_path)))
+            due = (len(self._pending_completes) >= SYNC_EVERY
+                   or time.monotonic() - self._last_sync >= SYNC_INTERVAL)
+        if due:
+            self.sync()
+
+    def sync_intents(self):
+        """Bekleyen niyet kayıtlarını diske zorla (dosyaya dokunmadan önce çağrılır)"""
+        with self._lock:
+            pending = self._unsynced_intents
+        if pending:
+            self.sync()
+
+    def sync(self):
+        """Toplu fsync: yeniden adlandırmaların klasörleri, ardından günlük
+
+        Tamamlanma kayıtları ancak klasörleri fsync edildikten sonra günlüğe yazılır.
+        fsync'ler _lock dışında yapılır; beklerken diğer iş parçacıkları kayıt ekleyebilir.
+        """
+        with self._sync_lock:
+            with self._lock:
+                completes = self._pending_completes
+                directories = self._dirty_directories
+                self._pending_completes = []
+                self._dirty_directories = set()
+                self._last_sync = time.monotonic()
+            for directory in directories:
+                _fsync_directory(directory)
+            with self._lock:
+                for record in completes:
+                    self._append(record)
+                # Buraya kadar eklenen niyetler de aşağıdaki fsync ile kalıcılaşır
+                self._unsynced_intents = 0
+                self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def finish(self):
+        """İş kesintisiz bitti: günlüğü sil"""
+        self.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
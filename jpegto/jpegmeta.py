@@ -0,0 +1,281 @@
+"""
+JPEG segment ayrıştırıcı ve yerinde EXIF Orientation yamalayıcı
+SOI/APPn işaretçileri dolaşılır, APP1 içindeki TIFF IFD0 Orientation girdisi bulunur
+ve değer iki/dört baytlık konumlu yazma ile değiştirilir. Piksel verisine dokunulmaz.
+"""
+
+import io
+import os
+import struct
+
+SOI = 0xD8
+EOI = 0xD9
+SOS = 0xDA
+APP1 = 0xE1
+
+# Kare başlığı (SOFn) işaretçileri; C4 (DHT), C8 (JPG) ve CC (DAC) hariç
+SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+PROGRESSIVE_SOF = {0xC2, 0xC6, 0xCA, 0xCE}
+
+# Başlık taramasında dosya bu boyutta parçalarla okunur; segment yükleri atlanır
+HEADER_BUFFER = 16 * 1024
+
+EXIF_HEADER = b'Exif\x00\x00'
+ORIENTATION_TAG = 0x0112
+
+# Uzunluk alanı olmayan tek başına işaretçiler (TEM, RSTn)
+STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD8))
+
+TIFF_SHORT = 3
+TIFF_LONG = 4
+
+
+class JPEGFormatError(ValueError):
+    """Dosya geçerli bir JPEG değil veya segment yapısı bozuk"""
+
+
+class Segment:
+    """Bir JPEG başlık segmentinin konumu"""
+
+    __slots__ = ('marker', 'offset', 'length')
+
+    def __init__(self, marker, offset, length):
+        self.marker = marker
+        # 0xFF işaretçi baytının dosya içindeki konumu
+        self.offset = offset
+        # Uzunluk alanı dahil yük uzunluğu (tek başına işaretçilerde 0)
+        self.length = length
+
+    @property
+    def payload_offset(self):
+        return self.offset + 4
+
+    @property
+    def end(self):
+        return self.offset + 2 + self.length
+
+    def __repr__(self):
+        return f"Segment(0x{self.marker:02X}, offset={self.offset}, length={self.length})"
+
+
+class OrientationEntry:
+    """IFD0 içindeki Orientation girdisi"""
+
+    __slots__ = ('value_offset', 'byteorder', 'type', 'value')
+
+    def __init__(self, value_offset, byteorder, type, value):
+        # Değer alanının dosya içindeki mutlak konumu
+        self.value_offset = value_offset
+        self.byteorder = byteorder
+        self.type = type
+        self.value = value
+
+    def encode(self, value):
+        """Yeni değeri girdinin türüne ve bayt sırasına göre kodla"""
+        if self.type == TIFF_LONG:
+            return struct.pack(self.byteorder + 'I', value)
+        return struct.pack(self.byteorder + 'H', value)
+
+
+def iter_segments(f):
+    """SOI'den SOS'a kadar olan başlık segmentlerini sırayla üret (SOS dahil)"""
+    f.seek(0)
+    if f.read(2) != b'\xff\xd8':
+        raise JPEGFormatError("SOI işaretçisi bulunamadı")
+
+    position = 2
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return
+        if byte != b'\xff':
+            raise JPEGFormatError(f"{position} konumunda işaretçi bekleniyordu")
+        # Dolgu 0xFF baytlarını atla
+        marker_offset = position
+        marker = f.read(1)
+        position += 2
+        while marker == b'\xff':
+            marker_offset += 1
+            marker = f.read(1)
+            position += 1
+        if not marker:
+            return
+        marker = marker[0]
+
+        if marker in STANDALONE_MARKERS:
+            yield Segment(marker, marker_offset, 0)
+            continue
+        if marker == EOI:
+            yield Segment(marker, marker_offset, 0)
+            return
+
+        raw = f.read(2)
+        if len(raw) != 2:
+            raise JPEGFormatError("Segment uzunluğu okunamadı")
+        length = struct.unpack('>H', raw)[0]
+        if length < 2:
+            raise JPEGFormatError(f"Geçersiz segment uzunluğu: {length}")
+        yield Segment(marker, marker_offset, length)
+        if marker == SOS:
+            return
+        position = marker_offset + 2 + length
+        f.seek(position)
+
+
+class HeaderInfo:
+    """Başlıktan okunan özet: boyutlar, bileşen sayısı, EXIF ve Orientation"""
+
+    __slots__ = ('width', 'height', 'components', 'progressive', 'exif', 'orientation')
+
+    def __init__(self):
+        self.width = None
+        self.height = None
+        self.components = None
+        self.progressive = False
+        self.exif = False
+        # Etiket yoksa None
+        self.orientation = None
+
+    def to_dict(self):
+        return {
+            'width': self.width,
+            'height': self.height,
+            'components': self.components,
+            'progressive': self.progressive,
+            'exif': self.exif,
+            'orientation': self.orientation,
+        }
+
+
+def read_header(path):
+    """SOS'a kadar yalnızca segment başlıklarını, EXIF APP1 ve SOF yüklerini okuyarak özet çıkar"""
+    info = HeaderInfo()
+    with open(path, 'rb', buffering=HEADER_BUFFER) as f:
+        for segment in iter_segments(f):
+            if segment.marker == SOS:
+                break
+            if segment.marker in SOF_MARKERS and info.width is None:
+                f.seek(segment.payload_offset)
+                frame = f.read(6)
+                if len(frame) != 6:
+                    raise JPEGFormatError("SOF segmenti kısa")
+                info.height, info.width = struct.unpack('>HH', frame[1:5])
+                info.components = frame[5]
+                info.progressive = segment.marker in PROGRESSIVE_SOF
+            elif (segment.marker == APP1 and not info.exif
+                  and segment.length >= 2 + len(EXIF_HEADER) + 8):
+                f.seek(segment.payload_offset)
+                payload = f.read(segment.length - 2)
+                if payload.startswith(EXIF_HEADER):
+                    info.exif = True
+                    tiff_offset = segment.payload_offset + len(EXIF_HEADER)
+                    entry = parse_tiff_orientation(payload[len(EXIF_HEADER):], tiff_offset)
+                    info.orientation = entry.value if entry else None
+    return info
+
+
+def find_exif_segment(f):
+    """EXIF verisi taşıyan APP1 segmentini ve yükünü döndür, yoksa (None, None)"""
+    for segment in iter_segments(f):
+        if segment.marker == SOS:
+            break
+        if segment.marker != APP1 or segment.length < 2 + len(EXIF_HEADER) + 8:
+            continue
+        f.seek(segment.payload_offset)
+        payload = f.read(segment.length - 2)
+        if payload.startswith(EXIF_HEADER):
+            return segment, payload
+    return None, None
+
+
+def parse_tiff_orientation(tiff, base_offset):
+    """TIFF bloğundaki IFD0 Orientation girdisini bul; base_offset TIFF başlığının dosya konumu"""
+    if len(tiff) < 8:
+        return None
+    if tiff[:4] == b'II*\x00':
+        byteorder = '<'
+    elif tiff[:4] == b'MM\x00*':
+        byteorder = '>'
+    else:
+        raise JPEGFormatError("Geçersiz TIFF başlığı")
+
+    ifd_offset = struct.unpack_from(byteorder + 'I', tiff, 4)[0]
+    if ifd_offset + 2 > len(tiff):
+        raise JPEGFormatError("IFD0 segment dışında")
+    count = struct.unpack_from(byteorder + 'H', tiff, ifd_offset)[0]
+
+    for index in range(count):
+        entry = ifd_offset + 2 + index * 12
+        if entry + 12 > len(tiff):
+            raise JPEGFormatError("IFD0 girdileri segment dışında")
+        tag, type_, n = struct.unpack_from(byteorder + 'HHI', tiff, entry)
+        if tag != ORIENTATION_TAG:
+            continue
+        if n != 1 or type_ not in (TIFF_SHORT, TIFF_LONG):
+            raise JPEGFormatError(f"Beklenmeyen Orientation girdisi (tür={type_}, adet={n})")
+        value_field = entry + 8
+        fmt = byteorder + ('I' if type_ == TIFF_LONG else 'H')
+        value = struct.unpack_from(fmt, tiff, value_field)[0]
+        return OrientationEntry(base_offset + value_field, byteorder, type_, value)
+    return None
+
+
+def locate_orientation(f):
+    """Açık dosya nesnesindeki Orientation girdisini döndür; EXIF ya da etiket yoksa None"""
+    segment, payload = find_exif_segment(f)
+    if segment is None:
+        return None
+    tiff_offset = segment.payload_offset + len(EXIF_HEADER)
+    return parse_tiff_orientation(payload[len(EXIF_HEADER):], tiff_offset)
+
+
+def find_orientation(path):
+    """Dosyadaki Orientation girdisini döndür; EXIF ya da etiket yoksa None"""
+    with open(path, 'rb') as f:
+        return locate_orientation(f)
+
+
+def patch_orientation_bytes(buffer, value):
+    """Bellekteki JPEG (bytearray) içinde Orientation'ı değiştir; etiket yoksa False"""
+    entry = locate_orientation(io.BytesIO(buffer))
+    if entry is None:
+        return False
+    data = entry.encode(value)
+    buffer[entry.value_offset:entry.value_offset + len(data)] = data
+    return True
+
+
+def read_orientation(path):
+    """Orientation değerini oku (etiket yoksa None)"""
+    entry = find_orientation(path)
+    return entry.value if entry else None
+
+
+def patch_orientation(path, value=1, durable=False):
+    """
+    Orientation değerini yerinde yaz.
+    Etiket mevcutsa True döner (değer zaten aynıysa dosyaya yazılmaz);
+    EXIF veya Orientation girdisi yoksa False döner ve ekleme çağırana bırakılır.
+    Tek sektörlük yazma çökmede yarım kalmaz; durable verilirse ayrıca fsync yapılır.
+    """
+    entry = find_orientation(path)
+    if entry is None:
+        return False
+    if entry.value == value:
+        return True
+
+    fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+    try:
+        data = entry.encode(value)
+        if hasattr(os, 'pwrite'):
+            written = os.pwrite(fd, data, entry.value_offset)
+        else:
+            os.lseek(fd, entry.value_offset, os.SEEK_SET)
+            written = os.write(fd, data)
+        if written != len(data):
+            raise OSError(f"Orientation yazılamadı: {path}")
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    return True
@@ -0,0 +1,791 @@
+"""
+Kayıpsız JPEG dönüşüm motoru
+jpegtran'in yaptığı gibi piksel verisi çözülmeden, nicemlenmiş DCT katsayı blokları
+yer değiştirilip (transpoze) işaretleri çevrilerek 90/180/270 döndürme ve aynalama yapılır.
+Bellek kullanımı RGB piksel sayısıyla değil katsayı sayısıyla (katsayı başına 2 bayt) orantılıdır.
+
+Desteklenen: 8 bit baseline / extended sequential Huffman (SOF0, SOF1), tek tarama.
+Progressive ve aritmetik kodlanmış dosyalar için UnsupportedJPEGError fırlatılır.
+
+Saf Python motoru yavaştır: megapiksel başına ~2 s, PIL ile çözüp kodlamanın yaklaşık
+40 katı (3 MP'de 6,4 s'ye karşı 0,15 s). jpegtran kuruluysa aynı dönüşüm onunla yapılır
+(transform_jpeg_jpegtran); değilse Processor bu motoru varsayılan olarak yalnızca
+BUILTIN_MAX_PIXELS'e kadar kullanır.
+"""
+
+import io
+import os
+import struct
+import subprocess
+import tempfile
+from array import array
+
+from . import trace
+from .jpegmeta import SOS, JPEGFormatError, iter_segments
+
+# Dönüşümler
+ROTATE_90 = 'rotate90'
+ROTATE_180 = 'rotate180'
+ROTATE_270 = 'rotate270'
+FLIP_HORIZONTAL = 'flip_horizontal'
+FLIP_VERTICAL = 'flip_vertical'
+TRANSPOSE = 'transpose'
+TRANSVERSE = 'transverse'
+
+# Her dönüşüm (transpoze, yatay aynalama, dikey aynalama) olarak ifade edilir;
+# transpoze önce, aynalamalar hedef koordinatlarda sonra uygulanır.
+TRANSFORMS = {
+    ROTATE_90: (True, True, False),
+    ROTATE_180: (False, True, True),
+    ROTATE_270: (True, False, True),
+    FLIP_HORIZONTAL: (False, True, False),
+    FLIP_VERTICAL: (False, False, True),
+    TRANSPOSE: (True, False, False),
+    TRANSVERSE: (True, True, True),
+}
+
+# Kenar politikaları: kısmi MCU kenarı aynalanacak eksene düşerse
+# (varsayılan PERFECT: kenar pikselleri hiçbir zaman örtük olarak kırpılmaz)
+TRIM = 'trim'          # kısmi MCU satır/sütununu at (jpegtran -trim)
+PERFECT = 'perfect'    # dönüşüm kusursuz değilse NotPerfectError fırlat (jpegtran -perfect)
+TRIM_POLICIES = (TRIM, PERFECT)
+
+# Saf Python motorunun varsayılan üst sınırı (~2 s); üstündeki dosyalar jpegtran yoksa
+# sips/PIL ile yeniden kodlanır (JobSpec.always_lossless ile kaldırılır)
+BUILTIN_MAX_PIXELS = 1_000_000
+
+# jpegtran komut satırı karşılıkları
+JPEGTRAN = 'jpegtran'
+JPEGTRAN_ARGS = {
+    ROTATE_90: ['-rotate', '90'],
+    ROTATE_180: ['-rotate', '180'],
+    ROTATE_270: ['-rotate', '270'],
+    FLIP_HORIZONTAL: ['-flip', 'horizontal'],
+    FLIP_VERTICAL: ['-flip', 'vertical'],
+    TRANSPOSE: ['-transpose'],
+    TRANSVERSE: ['-transverse'],
+}
+JPEGTRAN_TIMEOUT = 60
+
+SOF0 = 0xC0
+SOF1 = 0xC1
+DHT = 0xC4
+DAC = 0xCC
+DQT = 0xDB
+DRI = 0xDD
+UNSUPPORTED_SOF = {0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+ZIGZAG = [
+    0, 1, 8, 16, 9, 2, 3, 10,
+    17, 24, 32, 25, 18, 11, 4, 5,
+    12, 19, 26, 33, 40, 48, 41, 34,
+    27, 20, 13, 6, 7, 14, 21, 28,
+    35, 42, 49, 56, 57, 50, 43, 36,
+    29, 22, 15, 23, 30, 37, 44, 51,
+    58, 59, 52, 45, 38, 31, 39, 46,
+    53, 60, 61, 54, 47, 55, 62, 63,
+]
+NATURAL_TO_ZIGZAG = [0] * 64
+for _k, _n in enumerate(ZIGZAG):
+    NATURAL_TO_ZIGZAG[_n] = _k
+
+
+class LosslessError(Exception):
+    """Kayıpsız dönüşüm uygulanamadı"""
+
+
+class UnsupportedJPEGError(LosslessError):
+    """Dosya türü bu motor tarafından desteklenmiyor (progressive, aritmetik, 12 bit...)"""
+
+
+class NotPerfectError(LosslessError):
+    """Görüntü boyutu MCU katı değil ve politika kırpmaya izin vermiyor"""
+
+
+class TooLargeError(LosslessError):
+    """Görüntü saf Python motoru için verilen piksel sınırından büyük"""
+
+
+class Component:
+    __slots__ = ('id', 'h', 'v', 'tq', 'td', 'ta', 'blocks_w', 'blocks_h', 'coefs')
+
+    def __init__(self, id, h, v, tq):
+        self.id = id
+        self.h = h
+        self.v = v
+        self.tq = tq
+        self.td = 0
+        self.ta = 0
+        self.blocks_w = 0
+        self.blocks_h = 0
+        self.coefs = None
+
+
+def _coefficient_map(transpose, flip_h, flip_v):
+    """Zigzag sırasında hedef katsayı -> (kaynak indeksi, işaret) tablosu"""
+    perm = [0] * 64
+    sign = [1] * 64
+    for k in range(64):
+        natural = ZIGZAG[k]
+        v, u = divmod(natural, 8)
+        src = u * 8 + v if transpose else natural
+        perm[k] = NATURAL_TO_ZIGZAG[src]
+        s = 1
+        if flip_h and u & 1:
+            s = -s
+        if flip_v and v & 1:
+            s = -s
+        sign[k] = s
+    return perm, sign
+
+
+# --- Huffman tabloları ---
+
+def _lookup_table(bits, values):
+    """16 bitlik önden bakış tablosu: giriş = (uzunluk << 8) | sembol, 0 = geçersiz"""
+    table = [0] * 65536
+    code = 0
+    index = 0
+    for length in range(1, 17):
+        for _ in range(bits[length - 1]):
+            entry = (length << 8) | values[index]
+            shift = 16 - length
+            start = code << shift
+            table[start:start + (1 << shift)] = [entry] * (1 << shift)
+            code += 1
+            index += 1
+        code <<= 1
+    return table
+
+
+def _encode_table(bits, values):
+    """Sembol -> (kod, uzunluk) tablosu"""
+    codes = {}
+    code = 0
+    index = 0
+    for length in range(1, 17):
+        for _ in range(bits[length - 1]):
+            codes[values[index]] = (code, length)
+            code += 1
+            index += 1
+        code <<= 1
+    return codes
+
+
+def _optimal_table(frequencies):
+    """Sembol frekanslarından 16 bit sınırlı en uygun Huffman tablosu (ITU T.81 Ek K.2)"""
+    freq = list(frequencies) + [1]  # 256: tüm-birler koduna denk gelen ayrılmış sembol
+    codesize = [0] * 257
+    others = [-1] * 257
+
+    while True:
+        c1 = -1
+        best = None
+        for i in range(257):
+            if freq[i] and (best is None or freq[i] <= best):
+                best = freq[i]
+                c1 = i
+        c2 = -1
+        best = None
+        for i in range(257):
+            if freq[i] and i != c1 and (best is None or freq[i] <= best):
+                best = freq[i]
+                c2 = i
+        if c2 < 0:
+            break
+
+        freq[c1] += freq[c2]
+        freq[c2] = 0
+        codesize[c1] += 1
+        while others[c1] >= 0:
+            c1 = others[c1]
+            codesize[c1] += 1
+        others[c1] = c2
+        codesize[c2] += 1
+        while others[c2] >= 0:
+            c2 = others[c2]
+            codesize[c2] += 1
+
+    bits = [0] * 33
+    for size in codesize:
+        if size:
+            bits[size] += 1
+
+    # Kod uzunluklarını 16 bit ile sınırla
+    for i in range(32, 16, -1):
+        while bits[i] > 0:
+            j = i - 2
+            while bits[j] == 0:
+                j -= 1
+            bits[i] -= 2
+            bits[i - 1] += 1
+            bits[j + 1] += 2
+            bits[j] -= 1
+
+    # Ayrılmış sembolü çıkar
+    i = 16
+    while bits[i] == 0:
+        i -= 1
+    bits[i] -= 1
+
+    values = []
+    for length in range(1, 33):
+        for symbol in range(256):
+            if codesize[symbol] == length:
+                values.append(symbol)
+    return bits[1:17], values
+
+
+# --- Ayrıştırma ---
+
+class _Frame:
+    def __init__(self):
+        self.sof_marker = SOF0
+        self.width = 0
+        self.height = 0
+        self.components = []
+        self.qtables = {}      # id -> (precision, zigzag sıralı 64 değer)
+        self.dc_tables = {}    # id -> (bits, values)
+        self.ac_tables = {}
+        self.restart_interval = 0
+        self.scan_components = []
+        self.extra_segments = []   # APPn/COM gibi korunacak ham segmentler
+        self.scan_offset = 0
+        self.transform = None
+
+    @property
+    def hmax(self):
+        return max(c.h for c in self.components)
+
+    @property
+    def vmax(self):
+        return max(c.v for c in self.components)
+
+
+def _parse_tables(marker, payload, frame):
+    pos = 0
+    if marker == DQT:
+        while pos < len(payload):
+            pq, tq = payload[pos] >> 4, payload[pos] & 15
+            pos += 1
+            if pq:
+                values = list(struct.unpack_from('>64H', payload, pos))
+                pos += 128
+            else:
+                values = list(payload[pos:pos + 64])
+                pos += 64
+            frame.qtables[tq] = (pq, values)
+    elif marker == DHT:
+        while pos < len(payload):
+            tc, th = payload[pos] >> 4, payload[pos] & 15
+            bits = list(payload[pos + 1:pos + 17])
+            count = sum(bits)
+            values = list(payload[pos + 17:pos + 17 + count])
+            pos += 17 + count
+            (frame.ac_tables if tc else frame.dc_tables)[th] = (bits, values)
+
+
+def _parse(data):
+    frame = _Frame()
+    stream = io.BytesIO(data)
+    sof_seen = False
+
+    for segment in iter_segments(stream):
+        marker = segment.marker
+        if segment.length == 0:
+            continue
+        payload = data[segment.payload_offset:segment.end]
+
+        if marker in UNSUPPORTED_SOF or marker == DAC:
+            raise UnsupportedJPEGError(f"Desteklenmeyen JPEG türü (SOF 0x{marker:02X})")
+        if marker in (SOF0, SOF1):
+            precision, height, width, count = struct.unpack_from('>BHHB', payload, 0)
+            if precision != 8:
+                raise UnsupportedJPEGError(f"{precision} bit hassasiyet desteklenmiyor")
+            if height == 0:
+                raise UnsupportedJPEGError("DNL ile tanımlanan yükseklik desteklenmiyor")
+            frame.sof_marker = marker
+            frame.width = width
+            frame.height = height
+            for i in range(count):
+                cid, sampling, tq = struct.unpack_from('>BBB', payload, 6 + i * 3)
+                frame.components.append(Component(cid, sampling >> 4, sampling & 15, tq))
+            if count == 1:
+                # Tek bileşende örnekleme oranı anlamsızdır
+                frame.components[0].h = frame.components[0].v = 1
+            sof_seen = True
+        elif marker in (DQT, DHT):
+            _parse_tables(marker, payload, frame)
+        elif marker == DRI:
+            frame.restart_interval = struct.unpack_from('>H', payload, 0)[0]
+        elif marker == SOS:
+            if not sof_seen:
+                raise JPEGFormatError("SOS'tan önce SOF bulunamadı")
+            count = payload[0]
+            by_id = {c.id: c for c in frame.components}
+            for i in range(count):
+                cid, tables = payload[1 + i * 2], payload[2 + i * 2]
+                if cid not in by_id:
+                    raise JPEGFormatError(f"Taramada bilinmeyen bileşen: {cid}")
+                component = by_id[cid]
+                component.td, component.ta = tables >> 4, tables & 15
+                frame.scan_components.append(component)
+            ss, se, approx = payload[1 + count * 2:4 + count * 2]
+            if ss != 0 or se != 63 or approx != 0:
+                raise UnsupportedJPEGError("Sıralı olmayan tarama parametreleri")
+            if len(frame.scan_components) != len(frame.components):
+                raise UnsupportedJPEGError("Birden fazla taramalı baseline dosyalar desteklenmiyor")
+            frame.scan_offset = segment.end
+            return frame
+        else:
+            frame.extra_segments.append(data[segment.offset:segment.end])
+
+    raise JPEGFormatError("SOS segmenti bulunamadı")
+
+
+def _entropy_chunks(data, start):
+    """Entropi kodlu veriyi restart aralıklarına böl, bayt doldurmayı kaldır; (parçalar, bitiş) döndür"""
+    chunks = []
+    chunk_start = start
+    i = start
+    length = len(data)
+    while True:
+        i = data.find(b'\xff', i)
+        if i < 0 or i + 1 >= length:
+            chunks.append(data[chunk_start:length])
+            return [c.replace(b'\xff\x00', b'\xff') for c in chunks], length
+        nxt = data[i + 1]
+        if nxt == 0x00:
+            i += 2
+        elif nxt == 0xFF:
+            i += 1
+        elif 0xD0 <= nxt <= 0xD7:
+            chunks.append(data[chunk_start:i])
+            i += 2
+            chunk_start = i
+        else:
+            chunks.append(data[chunk_start:i])
+            return [c.replace(b'\xff\x00', b'\xff') for c in chunks], i
+
+
+def _mcu_layout(frame):
+    """Her bileşen için MCU dolgulu blok ızgarasını ve MCU sayılarını hesapla"""
+    hmax, vmax = frame.hmax, frame.vmax
+    mcux = -(-frame.width // (8 * hmax))
+    mcuy = -(-frame.height // (8 * vmax))
+    for c in frame.components:
+        c.blocks_w = mcux * c.h
+        c.blocks_h = mcuy * c.v
+    return mcux, mcuy
+
+
+def _decode(data, frame):
+    """Taramayı çöz, her bileşenin katsayılarını zigzag sırasında array('h') içine yaz"""
+    mcux, mcuy = _mcu_layout(frame)
+    for c in frame.components:
+        c.coefs = array('h', bytes(2 * 64 * c.blocks_w * c.blocks_h))
+
+    try:
+        dc_lookup = {i: _lookup_table(*t) for i, t in frame.dc_tables.items()}
+        ac_lookup = {i: _lookup_table(*t) for i, t in frame.ac_tables.items()}
+        plan = [(c.coefs, dc_lookup[c.td], ac_lookup[c.ta], c.h, c.v, c.blocks_w, index)
+                for index, c in enumerate(frame.scan_components)]
+    except KeyError:
+        raise JPEGFormatError("Taramada tanımsız Huffman tablosu")
+
+    chunks, scan_end = _entropy_chunks(data, frame.scan_offset)
+    if data[scan_end:scan_end + 2] not in (b'\xff\xd9', b''):
+        raise UnsupportedJPEGError("Birden fazla taramalı dosyalar desteklenmiyor")
+
+    total = mcux * mcuy
+    interval = frame.restart_interval or total
+    mcu = 0
+
+    for chunk in chunks:
+        if mcu >= total:
+            break
+        acc = 0
+        nbits = 0
+        pos = 0
+        size = len(chunk)
+        preds = [0] * len(plan)
+        end = min(mcu + interval, total)
+
+        while mcu < end:
+            my, mx = divmod(mcu, mcux)
+            for coefs, dc_table, ac_table, h, v, blocks_w, index in plan:
+                for by in range(v):
+                    for bx in range(h):
+                        base = ((my * v + by) * blocks_w + mx * h + bx) * 64
+
+                        # DC
+                        while nbits < 16:
+                            acc = (acc << 8) | (chunk[pos] if pos < size else 0xFF)
+                            pos += 1
+                            nbits += 8
+                        entry = dc_table[(acc >> (nbits - 16)) & 0xFFFF]
+                        if not entry:
+                            raise JPEGFormatError("Geçersiz Huffman kodu")
+                        nbits -= entry >> 8
+                        s = entry & 0xFF
+                        diff = 0
+                        if s:
+                            while nbits < s:
+                                acc = (acc << 8) | (chunk[pos] if pos < size else 0xFF)
+                                pos += 1
+                                nbits += 8
+                            diff = (acc >> (nbits - s)) & ((1 << s) - 1)
+                            nbits -= s
+                            if diff < (1 << (s - 1)):
+                                diff -= (1 << s) - 1
+                        acc &= (1 << nbits) - 1
+                        preds[index] += diff
+                        coefs[base] = preds[index]
+
+                        # AC
+                        k = 1
+                        while k < 64:
+                            while nbits < 16:
+                                acc = (acc << 8) | (chunk[pos] if pos < size else 0xFF)
+                                pos += 1
+                                nbits += 8
+                            entry = ac_table[(acc >> (nbits - 16)) & 0xFFFF]
+                            if not entry:
+                                raise JPEGFormatError("Geçersiz Huffman kodu")
+                            nbits -= entry >> 8
+                            rs = entry & 0xFF
+                            r, s = rs >> 4, rs & 15
+                            if s == 0:
+                                acc &= (1 << nbits) - 1
+                                if r != 15:
+                                    break
+                                k += 16
+                                continue
+                            k += r
+                            if k > 63:
+                                raise JPEGFormatError("AC katsayısı blok dışında")
+                            while nbits < s:
+                                acc = (acc << 8) | (chunk[pos] if pos < size else 0xFF)
+                                pos += 1
+                                nbits += 8
+                            value = (acc >> (nbits - s)) & ((1 << s) - 1)
+                            nbits -= s
+                            acc &= (1 << nbits) - 1
+                            if value < (1 << (s - 1)):
+                                value -= (1 << s) - 1
+                            coefs[base + k] = value
+                            k += 1
+            mcu += 1
+
+    if mcu < total:
+        raise JPEGFormatError("Entropi verisi beklenenden erken bitti")
+
+
+# --- Dönüşüm ve yeniden kodlama ---
+
+def _plan_destination(frame, transform, trim):
+    """Hedef boyutları, örnekleme oranlarını ve blok ızgaralarını hesapla"""
+    transpose, flip_h, flip_v = TRANSFORMS[transform]
+    if transpose:
+        width, height = frame.height, frame.width
+        sampling = [(c.v, c.h) for c in frame.components]
+    else:
+        width, height = frame.width, frame.height
+        sampling = [(c.h, c.v) for c in frame.components]
+
+    mcu_w = 8 * max(h for h, _ in sampling)
+    mcu_h = 8 * max(v for _, v in sampling)
+
+    # Aynalanan eksendeki kısmi MCU, görüntünün öbür kenarına taşınamaz
+    if flip_h and width % mcu_w:
+        if trim == PERFECT:
+            raise NotPerfectError(f"Genişlik {width}, {mcu_w} pikselin katı değil")
+        width -= width % mcu_w
+    if flip_v and height % mcu_h:
+        if trim == PERFECT:
+            raise NotPerfectError(f"Yükseklik {height}, {mcu_h} pikselin katı değil")
+        height -= height % mcu_h
+    if width <= 0 or height <= 0:
+        raise NotPerfectError("Görüntü kırpma sonrası boş kalıyor")
+
+    mcux = -(-width // mcu_w)
+    mcuy = -(-height // mcu_h)
+    grids = [(h, v, mcux * h, mcuy * v) for h, v in sampling]
+    return width, height, grids, mcux, mcuy
+
+
+def _source_bases(component, grid, transform):
+    """Hedef blok sırasına göre kaynak blok başlangıç indekslerini üret (-1 = boş blok)"""
+    transpose, flip_h, flip_v = TRANSFORMS[transform]
+    _, _, dest_w, dest_h = grid
+    bases = array('l')
+    for dy in range(dest_h):
+        y1 = dest_h - 1 - dy if flip_v else dy
+        for dx in range(dest_w):
+            x1 = dest_w - 1 - dx if flip_h else dx
+            sx, sy = (y1, x1) if transpose else (x1, y1)
+            if sx < component.blocks_w and sy < component.blocks_h:
+                bases.append((sy * component.blocks_w + sx) * 64)
+            else:
+                bases.append(-1)
+    return bases
+
+
+def _encode(frame, grids, mcux, mcuy, perm, sign, codes=None, out=None):
+    """
+    Hedef taramayı kodla. codes None ise yalnızca sembol frekanslarını say ve
+    ({td: frekanslar}, {ta: frekanslar}) döndür; aksi halde out'a entropi verisi yaz.
+    """
+    counting = codes is None
+    dc_freq = {}
+    ac_freq = {}
+    components = frame.components
+    plan = []
+    for index, component in enumerate(frame.scan_components):
+        position = components.index(component)
+        grid = grids[position]
+        bases = _source_bases(component, grid, frame.transform)
+        if counting:
+            dc = dc_freq.setdefault(component.td, [0] * 256)
+            ac = ac_freq.setdefault(component.ta, [0] * 256)
+        else:
+            dc, ac = codes[0][component.td], codes[1][component.ta]
+        plan.append((component.coefs, bases, grid[0], grid[1], grid[2], dc, ac, index))
+
+    zero_block = array('h', bytes(128))
+    pairs = list(zip(range(1, 64), perm[1:], sign[1:]))
+    dc_sign = sign[0]
+    preds = [0] * len(plan)
+    acc = 0
+    nbits = 0
+
+    def flush(acc, nbits):
+        while nbits >= 8:
+            nbits -= 8
+            byte = (acc >> nbits) & 0xFF
+            out.append(byte)
+            if byte == 0xFF:
+                out.append(0)
+        return acc & ((1 << nbits) - 1), nbits
+
+    for my in range(mcuy):
+        for mx in range(mcux):
+            for coefs, bases, h, v, blocks_w, dc, ac, index in plan:
+                for by in range(v):
+                    row = (my * v + by) * blocks_w + mx * h
+                    for bx in range(h):
+                        base = bases[row + bx]
+                        if base < 0:
+                            block, base = zero_block, 0
+                        else:
+                            block = coefs
+
+                        value = dc_sign * block[base]
+                        diff = value - preds[index]
+                        preds[index] = value
+                        magnitude = diff if diff >= 0 else -diff
+                        s = magnitude.bit_length()
+                        if counting:
+                            dc[s] += 1
+                        else:
+                            code, length = dc[s]
+                            bits = diff if diff >= 0 else diff + (1 << s) - 1
+                            acc = (((acc << length) | code) << s) | bits
+                            nbits += length + s
+                            if nbits >= 32:
+                                acc, nbits = flush(acc, nbits)
+
+                        run = 0
+                        for k, src, sg in pairs:
+                            value = block[base + src]
+                            if not value:
+                                run += 1
+                                continue
+                            if sg < 0:
+                                value = -value
+                            while run > 15:
+                                if counting:
+                                    ac[0xF0] += 1
+                                else:
+                                    code, length = ac[0xF0]
+                                    acc = (acc << length) | code
+                                    nbits += length
+                                run -= 16
+                            magnitude = value if value > 0 else -value
+                            s = magnitude.bit_length()
+                            rs = (run << 4) | s
+                            if counting:
+                                ac[rs] += 1
+                            else:
+                                code, length = ac[rs]
+                                bits = value if value > 0 else value + (1 << s) - 1
+                                acc = (((acc << length) | code) << s) | bits
+                                nbits += length + s
+                                if nbits >= 32:
+                                    acc, nbits = flush(acc, nbits)
+                            run = 0
+                        if run:
+                            if counting:
+                                ac[0x00] += 1
+                            else:
+                                code, length = ac[0x00]
+                                acc = (acc << length) | code
+                                nbits += length
+                                if nbits >= 32:
+                                    acc, nbits = flush(acc, nbits)
+
+    if counting:
+        return dc_freq, ac_freq
+
+    # Son baytı 1 bitleriyle doldur
+    if nbits % 8:
+        pad = 8 - nbits % 8
+        acc = (acc << pad) | ((1 << pad) - 1)
+        nbits += pad
+    flush(acc, nbits)
+    return None
+
+
+def _segment(marker, payload):
+    return b'\xff' + bytes([marker]) + struct.pack('>H', len(payload) + 2) + payload
+
+
+def transform_jpeg(data, transform, trim=PERFECT, max_pixels=None):
+    """JPEG baytlarına kayıpsız dönüşüm uygula ve yeni JPEG baytlarını döndür
+
+    Megapiksel başına ~2 s sürer. max_pixels verilirse daha büyük görüntüler çözülmeden
+    TooLargeError ile reddedilir.
+    """
+    if transform not in TRANSFORMS:
+        raise ValueError(f"Bilinmeyen dönüşüm: {transform}")
+    if trim not in TRIM_POLICIES:
+        raise ValueError(f"Bilinmeyen kırpma politikası: {trim}")
+
+    frame = _parse(data)
+    if max_pixels is not None and frame.width * frame.height > max_pixels:
+        raise TooLargeError(f"{frame.width}x{frame.height} saf Python motoru için fazla büyük")
+    _decode(data, frame)
+    frame.transform = transform
+
+    transpose = TRANSFORMS[transform][0]
+    width, height, grids, mcux, mcuy = _plan_destination(frame, transform, trim)
+    perm, sign = _coefficient_map(*TRANSFORMS[transform])
+
+    # Sembol istatistiklerinden en uygun Huffman tabloları (transpoze koşu uzunluklarını değiştirir)
+    dc_freq, ac_freq = _encode(frame, grids, mcux, mcuy, perm, sign)
+    dc_tables = {i: _optimal_table(f) for i, f in dc_freq.items()}
+    ac_tables = {i: _optimal_table(f) for i, f in ac_freq.items()}
+    codes = (
+        {i: _encode_table(*t) for i, t in dc_tables.items()},
+        {i: _encode_table(*t) for i, t in ac_tables.items()},
+    )
+
+    out = bytearray(b'\xff\xd8')
+    for raw in frame.extra_segments:
+        out += raw
+
+    # Nicemleme tabloları katsayılarla birlikte transpoze edilir
+    transpose_perm = _coefficient_map(True, False, False)[0]
+    used_tables = sorted({c.tq for c in frame.components})
+    for tq in used_tables:
+        if tq not in frame.qtables:
+            raise JPEGFormatError(f"Tanımsız nicemleme tablosu: {tq}")
+        precision, values = frame.qtables[tq]
+        if transpose:
+            values = [values[transpose_perm[k]] for k in range(64)]
+        if precision:
+            body = struct.pack('>64H', *values)
+        else:
+            body = bytes(values)
+        out += _segment(DQT, bytes([(precision << 4) | tq]) + body)
+
+    sof = struct.pack('>BHHB', 8, height, width, len(frame.components))
+    for component, (h, v, _, _) in zip(frame.components, grids):
+        sof += struct.pack('>BBB', component.id, (h << 4) | v, component.tq)
+    out += _segment(frame.sof_marker, sof)
+
+    for tc, tables in ((0, dc_tables), (1, ac_tables)):
+        for th, (bits, values) in sorted(tables.items()):
+            out += _segment(DHT, bytes([(tc << 4) | th] + bits + values))
+
+    sos = bytes([len(frame.scan_components)])
+    for component in frame.scan_components:
+        sos += bytes([component.id, (component.td << 4) | component.ta])
+    sos += b'\x00\x3f\x00'
+    out += _segment(SOS, sos)
+
+    _encode(frame, grids, mcux, mcuy, perm, sign, codes, out)
+    out += b'\xff\xd9'
+    return bytes(out)
+
+
+def transform_jpeg_jpegtran(data, transform, trim=PERFECT, binary=JPEGTRAN):
+    """Aynı kayıpsız dönüşümü jpegtran ile yap (progressive dosyalar da desteklenir)
+
+    Tüm işaretleyici segmentleri korunur; Orientation etiketi çağırana kalır.
+    """
+    if transform not in TRANSFORMS:
+        raise ValueError(f"Bilinmeyen dönüşüm: {transform}")
+    if trim not in TRIM_POLICIES:
+        raise ValueError(f"Bilinmeyen kırpma politikası: {trim}")
+    try:
+        result = subprocess.run(
+            [binary, '-copy', 'all', '-optimize', f'-{trim}'] + JPEGTRAN_ARGS[transform],
+            input=data, capture_output=True, timeout=JPEGTRAN_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise LosslessError(f"jpegtran çalıştırılamadı: {e}")
+    message = result.stderr.decode('utf-8', 'replace').strip()
+    if result.returncode != 0 or not result.stdout:
+        if 'perfect' in message.lower():
+            raise NotPerfectError(message)
+        raise LosslessError(f"jpegtran başarısız: {message}")
+    return result.stdout
+
+
+def transform_file(path, transform, trim=PERFECT, output=None):
+    """Dosyaya kayıpsız dönüşüm uygula; output verilmezse dosyanın yerine yazılır"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return write_atomic(output or path, transform_jpeg(data, transform, trim))
+
+
+def temp_path_for(target, suffix='.tmp'):
+    """Hedefle aynı klasörde (aynı dosya sisteminde) geçici dosya oluştur: (fd, yol)"""
+    directory = os.path.dirname(os.path.abspath(target))
+    return tempfile.mkstemp(dir=directory, prefix='.jpegto-', suffix=suffix)
+
+
+def replace_atomic(temp_path, target, durable=False):
+    """Hazır geçici dosyayı hedefin izinleriyle hedefin üzerine atomik olarak taşı
+
+    durable verilirse veri yeniden adlandırmadan önce diske zorlanır; böylece çökme
+    sonrasında hedef ya eski ya yeni içeriğin tamamını taşır.
+    """
+    with trace.span('write.replace', path=target, durable=durable):
+        if os.path.exists(target):
+            os.chmod(temp_path, os.stat(target).st_mode & 0o7777)
+        if durable:
+            fd = os.open(temp_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        os.replace(temp_path, target)
+    return target
+
+
+def write_atomic(target, data, durable=False):
+    """Veriyi geçici dosyaya yazıp hedefin üzerine atomik olarak taşı"""
+    fd, temp_path = temp_path_for(target)
+    try:
+        with trace.span('write.data', path=target, bytes=len(data)):
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+        return replace_atomic(temp_path, target, durable)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,155 @@
+"""
+Artımlı çalışma manifestosu
+Her kök klasör için bir SQLite veritabanında dosyanın yolu, boyutu, değiştirilme zamanı,
+hızlı içerik özeti ve uygulanan işlem tutulur. Sonraki çalıştırmalarda değişmemiş
+dosyalar yalnızca stat() ile tanınıp atlanır.
+"""
+
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+MANIFEST_NAME = '.jpegto-manifest.sqlite'
+
+# Hızlı özet: boyut + baştan ve sondan birer blok
+HASH_BLOCK = 64 * 1024
+
+# Bu kadar kayıtta bir toplu commit yapılır
+COMMIT_EVERY = 500
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    source_hash TEXT,
+    result_hash TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+'''
+
+
+def fast_hash(path, size=None):
+    """Dosyanın boyutu ile ilk ve son 64 KB'ından oluşan hızlı içerik özeti"""
+    if size is None:
+        size = os.path.getsize(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, 'little'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(HASH_BLOCK))
+        if size > 2 * HASH_BLOCK:
+            f.seek(size - HASH_BLOCK)
+            digest.update(f.read(HASH_BLOCK))
+        elif size > HASH_BLOCK:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def default_root(paths):
+    """Dosya, klasör ve glob desenlerinin ortak üst klasörü"""
+    directories = set()
+    for path in paths:
+        if glob.has_magic(path):
+            # Desenin joker içermeyen baş kısmı
+            parts = []
+            for part in path.split(os.sep):
+                if glob.has_magic(part):
+                    break
+                parts.append(part)
+            path = os.sep.join(parts) or os.curdir
+        path = os.path.abspath(path)
+        directories.add(path if os.path.isdir(path) else os.path.dirname(path))
+    if not directories:
+        return os.getcwd()
+    return os.path.commonpath(list(directories))
+
+
+class Manifest:
+    """Bir kök klasöre ait işlenmiş dosya kayıtları"""
+
+    def __init__(self, root, path=None):
+        self.root = os.path.abspath(root)
+        self.path = path or os.path.join(self.root, MANIFEST_NAME)
+        # Akış hattında birden fazla aşama aynı bağlantıyı kilitle paylaşır
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(SCHEMA)
+        self._pending = 0
+
+    def _key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.root)
+
+    def lookup(self, file_path):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT size, mtime_ns, operation, result_hash FROM files WHERE path = ?',
+                (self._key(file_path),),
+            ).fetchone()
+
+    def is_current(self, file_path, operation, stat=None):
+        """Dosya aynı işlemle işlenmiş ve o zamandan beri değişmemiş mi?"""
+        row = self.lookup(file_path)
+        if row is None or row[2] != operation:
+            return False
+        try:
+            stat = stat or os.stat(file_path)
+        except OSError:
+            return False
+        size, mtime_ns, _, result_hash = row
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            # O(stat): içerik okunmaz
+            return True
+        # Yalnızca zaman damgası değiştiyse (ör. kopyalama) özetle doğrula
+        if fast_hash(file_path, stat.st_size) == result_hash:
+            self._update_mtime(file_path, stat.st_mtime_ns)
+            return True
+        return False
+
+    def _update_mtime(self, file_path, mtime_ns):
+        with self._lock:
+            self.connection.execute(
+                'UPDATE files SET mtime_ns = ? WHERE path = ?', (mtime_ns, self._key(file_path))
+            )
+            self._count()
+
+    def record(self, file_path, operation, source_hash=None):
+        """İşlenmiş dosyanın son durumunu kaydet"""
+        stat = os.stat(file_path)
+        result_hash = fast_hash(file_path, stat.st_size)
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime_ns, operation, source_hash, result_hash, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self._key(file_path), stat.st_size, stat.st_mtime_ns, operation, source_hash,
+                 result_hash, time.time()),
+            )
+            self._count()
+
+    def _count(self):
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        with self._lock:
+            self.connection.commit()
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self.commit()
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,127 @@
+"""
+Bellek bütçesi
+PIL geri dönüşü görüntüyü tamamen çözer ve döndürülmüş ikinci bir tam çözünürlüklü
+tampon ayırır; birkaç 100 MP panorama aynı anda işlenirse işçiler bellek yetersizliğinden
+öldürülebilir. Her dosyanın çözülmüş boyutu SOF başlığından tahmin edilir
+(genişlik × yükseklik × bileşen, döndürmede ×2) ve iş havuza ancak tahmini toplam
+bütçeye sığıyorsa verilir. Küçük dosyalar büyük bir dosyayla yan yana çalışabilir;
+bütçeden büyük dosyalar tek başına (sırayla) işlenir. Yalnızca etiket yazan planlar
+görüntüyü çözmediğinden bütçeden düşmez.
+"""
+
+import os
+import sys
+import threading
+
+from .jpegmeta import JPEGFormatError, read_header
+from .orientation import IDENTITY
+from .planner import plan
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+# Döndürmede kaynak ve hedef tampon birlikte bellekte durur
+ROTATE_FACTOR = 2
+
+# Bütçe verilmezse fiziksel belleğin bu oranı kullanılır
+DEFAULT_FRACTION = 0.5
+
+
+def default_budget():
+    """Varsayılan bütçe (bayt): fiziksel belleğin yarısı; öğrenilemiyorsa None (sınırsız)"""
+    try:
+        physical = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+    return int(physical * DEFAULT_FRACTION) if physical > 0 else None
+
+
+def estimate(header, file_plan):
+    """Planın çözülmüş görüntü için gerektirdiği tahmini bellek (bayt)"""
+    if file_plan.transform == IDENTITY or not header.width or not header.height:
+        return 0
+    return header.width * header.height * (header.components or 3) * ROTATE_FACTOR
+
+
+def estimate_file(spec, path):
+    """Dosyanın başlığını okuyup tahmini belleği hesapla; başlık okunamazsa 0"""
+    try:
+        header = read_header(path)
+    except (JPEGFormatError, OSError):
+        # Başlığı okunamayan dosya çözülemez de; dönüşüm aşaması hatayı bildirir
+        return 0
+    return estimate(header, plan(spec, header.orientation))
+
+
+class MemoryBudget:
+    """Tahmini bellek toplamını sınırlayan kabul denetimi; iş parçacığı güvenli
+
+    fits()/charge() bloklamayan dağıtıcılar için, acquire() ise her işi kendi
+    iş parçacığında bekleyen servisler içindir. Bütçeden büyük bir iş bütçenin
+    tamamını tutar: yalnızca hiçbir iş çalışmıyorken kabul edilir ve bitene kadar
+    çözme gerektiren başka iş kabul edilmez.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        # Aynı anda kabul edilmiş tahmini belleğin tepe değeri
+        self.peak = 0
+        # Bütçeden büyük olduğu için tek başına çalışan dosya sayısı
+        self.serialized = 0
+        # Condition varsayılan olarak RLock kullanır; acquire() içinden charge() çağrılabilir
+        self._condition = threading.Condition()
+
+    def cost(self, estimate):
+        return min(estimate, self.limit)
+
+    def fits(self, estimate, reserved=0):
+        """İş şimdi kabul edilebilir mi? reserved, sırada bekleyen büyük iş için ayrılan pay"""
+        with self._condition:
+            if not estimate:
+                return True
+            if self.used == 0 and reserved == 0:
+                return True
+            return self.used + self.cost(estimate) + reserved <= self.limit
+
+    def charge(self, estimate):
+        with self._condition:
+            if estimate >= self.limit:
+                self.serialized += 1
+            self.used += self.cost(estimate)
+            self.peak = max(self.peak, self.used)
+
+    def release(self, estimate):
+        with self._condition:
+            self.used -= self.cost(estimate)
+            self._condition.notify_all()
+
+    def acquire(self, estimate, stop=None):
+        """Bütçeye sığana kadar bekle ve ayır; stop (Event) kurulursa False döner"""
+        with self._condition:
+            while estimate and self.used and self.used + self.cost(estimate) > self.limit:
+                if stop is not None and stop.is_set():
+                    return False
+                self._condition.wait(0.1)
+            self.charge(estimate)
+        return True
+
+    def to_dict(self):
+        with self._condition:
+            return {'limit': self.limit, 'peak': self.peak, 'serialized': self.serialized}
+
+
+def peak_rss():
+    """Bu sürecin tepe RSS'i (bayt); ölçülemiyorsa None
+
+    Havuz işçileri forkserver'ın çocuklarıdır, RUSAGE_CHILDREN ile görülmez;
+    onların tepesi FileResult.worker_rss ile taşınır.
+    """
+    if resource is None:
+        return None
+    # Linux'ta KiB, macOS'ta bayt
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
@@ -0,0 +1,75 @@
+"""
+EXIF Orientation değerleri ve D4 grup işlemleri
+Sekiz Orientation değerinin her biri, kayıtlı pikselleri doğru görüntüye taşıyan bir
+kare simetrisidir (D4 grubu). Bir döndürme/aynalama isteği, dosyanın mevcut değeriyle
+bu grup tablosu üzerinden birleştirilir; pikseller yerine yalnızca etiket yazılır.
+"""
+
+from .lossless import (
+    ROTATE_90, ROTATE_180, ROTATE_270, FLIP_HORIZONTAL, FLIP_VERTICAL,
+    TRANSPOSE, TRANSVERSE, TRANSFORMS,
+)
+
+IDENTITY = 'identity'
+
+# Orientation değeri -> kayıtlı görüntüyü doğru göstermek için gereken dönüşüm
+ORIENTATION_TRANSFORMS = {
+    1: IDENTITY,
+    2: FLIP_HORIZONTAL,
+    3: ROTATE_180,
+    4: FLIP_VERTICAL,
+    5: TRANSPOSE,
+    6: ROTATE_90,
+    7: TRANSVERSE,
+    8: ROTATE_270,
+}
+TRANSFORM_ORIENTATIONS = {t: o for o, t in ORIENTATION_TRANSFORMS.items()}
+
+
+def _matrix(transform):
+    """Dönüşümün (x, y) koordinatlarına etkisi: önce transpoze, sonra aynalamalar"""
+    if transform == IDENTITY:
+        return (1, 0, 0, 1)
+    transpose, flip_h, flip_v = TRANSFORMS[transform]
+    a, b, c, d = (0, 1, 1, 0) if transpose else (1, 0, 0, 1)
+    if flip_h:
+        a, b = -a, -b
+    if flip_v:
+        c, d = -c, -d
+    return (a, b, c, d)
+
+
+def _multiply(m, n):
+    a, b, c, d = m
+    e, f, g, h = n
+    return (a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h)
+
+
+_BY_MATRIX = {_matrix(t): t for t in ORIENTATION_TRANSFORMS.values()}
+
+
+def compose_transforms(first, then):
+    """Önce first, ardından then uygulanmasına eşdeğer tek dönüşüm"""
+    return _BY_MATRIX[_multiply(_matrix(then), _matrix(first))]
+
+
+# COMPOSE[işlem][mevcut Orientation] = yeni Orientation (8x8 grup tablosu)
+COMPOSE = {
+    op: {o: TRANSFORM_ORIENTATIONS[compose_transforms(t, op)] for o, t in ORIENTATION_TRANSFORMS.items()}
+    for op in ORIENTATION_TRANSFORMS.values()
+}
+
+
+def normalize(orientation):
+    """Eksik veya geçersiz değerler 1 (normal) sayılır"""
+    return orientation if orientation in ORIENTATION_TRANSFORMS else 1
+
+
+def compose(orientation, operation):
+    """Görüntülenen resme operation uygulandığında yazılması gereken Orientation değeri"""
+    return COMPOSE[operation][normalize(orientation)]
+
+
+def transform_for(orientation):
+    """Orientation değerini piksellere uygulamak için gereken dönüşüm (1 için IDENTITY)"""
+    return ORIENTATION_TRANSFORMS[normalize(orientation)]
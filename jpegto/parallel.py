@@ -0,0 +1,169 @@
+"""
+Çok çekirdekli paralel yürütücü
+CPU ağırlıklı yollar (kayıpsız döndürme, PIL yeniden kodlama) süreç havuzunda,
+alt süreç ve G/Ç ağırlıklı yollar (yerinde yama, exiftool, sips, yedekleme) iş
+parçacığı havuzunda çalışır. Eşzamanlı iş sayısı sınırlıdır; sonuçlar tamamlanma
+sırasıyla toplanır ve ilerleme sayacı sıradan bağımsız olarak doğru kalır.
+"""
+
+import concurrent.futures
+import multiprocessing
+import multiprocessing.util
+import os
+import shutil
+
+from . import trace
+from .core import FileResult, Processor
+from .memory import peak_rss
+
+AUTO = 'auto'
+PROCESS = 'process'
+THREAD = 'thread'
+MODES = (AUTO, PROCESS, THREAD)
+
+# Süreç havuzundaki her işçinin kendi Processor'ı (ve exiftool işçisi) olur
+_worker_processor = None
+
+
+def _init_worker(spec, trace_path=None, profile_dir=None):
+    global _worker_processor
+    if trace_path:
+        # Olaylar süreç kapanırken ana sürecin birleştireceği parça dosyasına yazılır
+        tracer = trace.enable(trace_path, 'jpegto işçi')
+        multiprocessing.util.Finalize(None, tracer.save_part, exitpriority=5)
+    if profile_dir:
+        profiler = trace.Profiler(profile_dir)
+        profiler.start()
+        multiprocessing.util.Finalize(None, profiler.save, exitpriority=5)
+    _worker_processor = Processor(spec).open()
+    # İşçi süreç kapanırken exiftool sürecini de kapat
+    multiprocessing.util.Finalize(None, _worker_processor.close, exitpriority=10)
+
+
+def _process_in_worker(file_path):
+    return _worker_processor.process_file(file_path)
+
+
+def _transform_in_worker(result):
+    result = _worker_processor.transform(result)
+    # İşçinin belleği ana süreçten ölçülemez; sonuçla taşınır
+    result.worker_rss = peak_rss()
+    return result
+
+
+def _process_context():
+    """İşçi süreçleri temiz bir sunucudan çatallanır: iş parçacıkları çalışırken fork() kilitlenebilir"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+class ParallelExecutor:
+    """Processor.run ile aynı arayüzde, dosyaları paralel işleyen yürütücü"""
+
+    def __init__(self, spec, workers=None, mode=AUTO, max_in_flight=None, profile_dir=None):
+        if mode not in MODES:
+            raise ValueError(f"Bilinmeyen yürütme modu: {mode}")
+        self.spec = spec
+        self.workers = max(1, workers or default_workers())
+        self.mode = mode
+        # Bellekte bekleyen iş sayısı üst sınırı
+        self.max_in_flight = max_in_flight or self.workers * 2
+        # Verilirse işçiler cProfile ile profillenir (klasöre işçi başına .prof)
+        self.profile_dir = profile_dir
+        self._profiler = None
+
+    def resolve_mode(self):
+        """auto modunda döndürme sips olmadan yapılacaksa CPU ağırlıklıdır"""
+        if self.mode != AUTO:
+            return self.mode
+        if self.spec.rotate and not shutil.which('sips'):
+            return PROCESS
+        return THREAD
+
+    def create_pool(self):
+        """Moda göre havuzu oluştur; iş parçacığı modunda paylaşılan Processor da döner"""
+        if self.resolve_mode() == THREAD:
+            processor = Processor(self.spec, exiftool_workers=self.workers).open()
+            initializer = None
+            if self.profile_dir:
+                self._profiler = trace.Profiler(self.profile_dir)
+                initializer = self._profiler.start
+            return concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, initializer=initializer), processor
+        # İz kaydı açıksa işçiler de aynı iz dosyasına (parça olarak) yazar
+        tracer = trace.current()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(self.spec, tracer.path if tracer else None, self.profile_dir),
+            mp_context=_process_context(),
+        )
+        return executor, None
+
+    def save_profiles(self):
+        """İş parçacığı modundaki profilleri yaz (havuz kapandıktan sonra); süreç
+        modunda işçiler kendi profillerini kapanırken yazar"""
+        if self._profiler:
+            self._profiler.save()
+            self._profiler = None
+
+    def run(self, paths, on_start=None, on_result=None, manifest=None):
+        """Dosyaları paralel işle; (başarılı, hatalı) sayılarını döndür
+
+        on_result(i, result) çağrısındaki i tamamlanan dosya sayısının bir eksiğidir,
+        dosyanın listedeki sırası değildir. manifest verilirse güncel dosyalar
+        işçilere gönderilmeden atlanır.
+        """
+        operation = self.spec.operation
+        executor, processor = self.create_pool()
+        task = processor.process_file if processor else _process_in_worker
+
+        counts = {'success': 0, 'error': 0, 'done': 0}
+        pending = {}
+
+        def finish(result):
+            if result.ok:
+                counts['success'] += 1
+            else:
+                counts['error'] += 1
+            if on_result:
+                on_result(counts['done'], result)
+            counts['done'] += 1
+
+        def collect(futures):
+            for future in futures:
+                file_path = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # İşçi süreç çöktüyse dosya hatalı sayılır
+                    result = FileResult(file_path)
+                    result.error = str(e) or e.__class__.__name__
+                if manifest and result.ok:
+                    manifest.record(file_path, operation, result.source_hash)
+                finish(result)
+
+        try:
+            with executor:
+                for index, file_path in enumerate(paths):
+                    while len(pending) >= self.max_in_flight:
+                        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        collect(done)
+                    if on_start:
+                        on_start(index, file_path)
+                    if manifest and manifest.is_current(file_path, operation):
+                        finish(FileResult.skipped_result(file_path))
+                        continue
+                    pending[executor.submit(task, file_path)] = file_path
+
+                while pending:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+        finally:
+            if processor:
+                processor.close()
+
+        return counts['success'], counts['error']
@@ -0,0 +1,381 @@
+"""
+Akışlı üretici/tüketici hattı
+Tarama → yedekleme → dönüşüm → doğrulama aşamaları sınırlı kuyruklarla bağlanır.
+Tarayıcı dosyaları buldukça sonraki aşamalara aktarır; ilk sonuçlar tarama bitmeden
+gelir ve bellek kullanımı ağacın büyüklüğünden bağımsız olarak sabit kalır. Toplam
+dosya sayısı tarama bittiğinde on_total ile bildirilir. Dönüşüm aşaması işleri bellek
+bütçesine göre kabul eder (bkz. memory.py). Hat duraklatılabilir, sürdürülebilir ve
+durdurulabilir; yazılmakta olan dosyalar her durumda tamamlanır. Sıra (order) verilirse
+aşamalar arası kuyruklar öncelik kuyruğudur; share verilirse dönüşüm yuvaları diğer
+işlerle adil paylaşılır (bkz. priority.py, scheduler.py).
+"""
+
+import concurrent.futures
+import queue
+import threading
+import time
+
+from .core import FileResult, JobSpec, Processor, iter_jpeg_paths
+from .manifest import fast_hash
+from .memory import MemoryBudget, default_budget, estimate_file, peak_rss
+from .parallel import AUTO, ParallelExecutor, _transform_in_worker
+from .planner import NONE
+from .priority import PriorityBuffer
+from .stats import SCAN
+
+# Aşamalar arası kuyrukların kapasitesi
+QUEUE_SIZE = 256
+
+# Sıra verildiğinde tarama kuyruğunun kapasitesi; öncelik bu pencere içinde uygulanır
+PRIORITY_WINDOW = 4096
+
+# Yedekleme ve doğrulama G/Ç ağırlıklıdır; bu kadar iş parçacığı yeterli
+IO_WORKERS = 4
+
+_DONE = object()
+
+
+class PipelineStopped(Exception):
+    """Hat durdurulduğunda kuyruk beklemelerini sonlandırır"""
+
+
+class Pipeline:
+    """Kaynakları (dosya, klasör, glob) tarayıp bulundukça işleyen akış hattı"""
+
+    def __init__(self, spec, workers=None, mode=AUTO, sniff=False, verify=True, queue_size=QUEUE_SIZE,
+                 profile_dir=None, memory_budget=None, order=None, share=None):
+        self.spec = spec
+        self.executor = ParallelExecutor(spec, workers=workers, mode=mode, profile_dir=profile_dir)
+        self.sniff = sniff
+        self.verify = verify
+        self.queue_size = queue_size
+        # Bayt; None fiziksel belleğin yarısı, 0 sınırsız
+        self.memory_budget = default_budget() if memory_budget is None else memory_budget
+        # FileOrder; None ise bulunma sırası
+        self.order = order
+        # ShareTicket; None ise havuz yalnızca bu hattındır
+        self.share = share
+        # Son çalıştırma kesintisiz tamamlandı mı?
+        self.completed = False
+        self._stop = threading.Event()
+        # Kuruluysa çalışıyor, değilse duraklatılmış
+        self._running = threading.Event()
+        self._running.set()
+
+    def stop(self):
+        """Hattı durdur; yazılmakta olan dosyalar tamamlanır
+
+        Çalıştırmadan önce çağrılırsa run() hiçbir dosyaya dokunmadan döner.
+        """
+        self._stop.set()
+
+    def pause(self):
+        """Yeni dosya başlatma; yedeklenmekte ve dönüştürülmekte olanlar tamamlanır"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def _wait_running(self):
+        while not self._running.wait(0.1):
+            if self._stop.is_set():
+                raise PipelineStopped()
+        if self._stop.is_set():
+            raise PipelineStopped()
+
+    def _queue(self, size):
+        if self.order is None:
+            return queue.Queue(size)
+        return PriorityBuffer(size, self.order)
+
+    def _put(self, q, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise PipelineStopped()
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise PipelineStopped()
+
+    def _stage(self, function, inbox, outbox, count, pausable=False):
+        """inbox'taki her öğeye function uygulayıp outbox'a aktaran iş parçacıkları
+
+        pausable ise duraklatılmışken inbox'tan yeni öğe alınmaz (öğeler sıralı kuyrukta kalır).
+        """
+        remaining = [count]
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    if pausable:
+                        self._wait_running()
+                    item = self._get(inbox)
+                    if item is _DONE:
+                        # Kardeş iş parçacıkları da görsün; sonuncusu bitişi aşağı iletir
+                        self._put(inbox, _DONE)
+                        break
+                    self._put(outbox, function(item))
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self._put(outbox, _DONE)
+            except PipelineStopped:
+                pass
+
+        return [threading.Thread(target=worker, daemon=True) for _ in range(count)]
+
+    def run(self, sources, on_start=None, on_result=None, on_total=None, manifest=None, journal=None,
+            job=None, stats=None):
+        """Kaynakları akış halinde işle; (başarılı, hatalı) sayılarını döndür
+
+        on_start(i, yol) yedekleme aşamasına girerken, on_total(toplam) tarama bitince,
+        on_result(i, sonuç) her dosya tamamlandığında çağrılır (i tamamlanan dosya
+        sayısıdır). Geri çağrılar farklı iş parçacıklarından gelebilir. journal verilirse
+        delta yedekleme modunda başlıklar bu DeltaJournal'a yazılır. job (JobJournal)
+        verilirse her dosyanın niyeti dosyaya dokunulmadan önce kalıcılaştırılır, yazılan
+        her dosya yeniden adlandırmadan önce fsync edilir, tamamlanmış dosyalar atlanır ve taraması bitmiş iş yeniden taranmaz. stats
+        (RunStats) verilirse verim ve aşama süreleri toplanır.
+        """
+        self.completed = False
+        if job and not self.spec.durable:
+            # Günlüğün tamamlanma kaydı yalnızca verisi diske ulaşmış dosyayı gösterebilir
+            self.spec = self.executor.spec = JobSpec.from_dict(dict(self.spec.to_dict(), durable=True))
+        operation = self.spec.operation
+        scanned = self._queue(max(self.queue_size, PRIORITY_WINDOW) if self.order else self.queue_size)
+        prepared = self._queue(self.queue_size)
+        transformed = queue.Queue(self.queue_size)
+        finished = queue.Queue(self.queue_size)
+
+        pool, shared = self.executor.create_pool()
+        # Süreç modunda yedekleme/doğrulama ana süreçteki ayrı bir Processor ile yapılır
+        local = shared or Processor(self.spec)
+        local.journal = journal
+        task = shared.transform if shared else _transform_in_worker
+        budget = MemoryBudget(self.memory_budget) if self.memory_budget else None
+        # Dosya -> tahmini çözülmüş bellek (hazırlık aşamasında başlıktan)
+        estimates = {}
+        # Süreç modunda işçilerin bildirdiği en yüksek tepe RSS
+        worker_peak = [None]
+        started = [0]
+        start_lock = threading.Lock()
+
+        def scan():
+            count = 0
+            try:
+                if job and job.scan_complete:
+                    # Sürdürülen işin dosya listesi günlükte: yeniden taranmaz
+                    found = job.pending_paths()
+                else:
+                    found = iter_jpeg_paths(sources, sniff=self.sniff)
+                last = time.perf_counter()
+                for file_path in found:
+                    if stats:
+                        # Tarama aşaması: önceki dosya kuyruğa verildikten bu dosya bulunana kadar
+                        stats.record(SCAN, time.perf_counter() - last)
+                    if job:
+                        job.register(file_path)
+                        if job.is_complete(file_path):
+                            continue
+                    self._put(scanned, file_path)
+                    count += 1
+                    last = time.perf_counter()
+                if job and not job.scan_complete:
+                    job.finish_scan(len(job.paths))
+                if stats:
+                    stats.set_total(count)
+                if on_total:
+                    on_total(count)
+                self._put(scanned, _DONE)
+            except PipelineStopped:
+                pass
+
+        def prepare(file_path):
+            with start_lock:
+                index = started[0]
+                started[0] += 1
+            if on_start:
+                on_start(index, file_path)
+            if manifest and manifest.is_current(file_path, operation):
+                return FileResult.skipped_result(file_path)
+            if job and job.recover(file_path):
+                # Çökmeden önce yazılmış ama tamamlandığı kaydedilememiş
+                return FileResult.skipped_result(file_path)
+            result = local.prepare(file_path)
+            if job and not result.error:
+                if result.source_hash is None:
+                    result.source_hash = fast_hash(file_path)
+                job.intent(file_path, result.source_hash)
+            if budget and not result.error:
+                estimates[file_path] = estimate_file(self.spec, file_path)
+            return result
+
+        def dispatch():
+            # Dönüşüm aşaması: havuzdaki iş sayısı ve tahmini bellek toplamı sınırlı tutulur
+            pending = {}
+            # Bütçeye sığmadığı için bekleyen büyük dosya; küçükler ancak onun payı
+            # ayrıldıktan sonra da sığıyorsa yanından geçer (büyük dosya aç kalmaz)
+            blocked = None
+
+            def submit(item):
+                # Duraklatılmışken biten işler toplanır, yeni iş verilmez
+                while not self._running.is_set():
+                    if self._stop.is_set():
+                        raise PipelineStopped()
+                    if pending:
+                        collect(0.05)
+                    else:
+                        self._running.wait(0.1)
+                if self.share:
+                    # Sıra diğer işlerle adil paylaşılır; beklerken bitenler toplanır
+                    while not self.share.acquire(0.05):
+                        if self._stop.is_set():
+                            raise PipelineStopped()
+                        if pending:
+                            collect(0)
+                if budget:
+                    budget.charge(estimates.get(item.path, 0))
+                try:
+                    future = pool.submit(task, item)
+                except BaseException:
+                    if self.share:
+                        self.share.release()
+                    raise
+                if self.share:
+                    future.add_done_callback(self.share.release)
+                pending[future] = item
+
+            def collect(timeout):
+                done, _ = concurrent.futures.wait(
+                    pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    result = pending.pop(future)
+                    if budget:
+                        budget.release(estimates.pop(result.path, 0))
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # İşçi süreç çöktüyse dosya hatalı sayılır
+                        result.error = str(e) or e.__class__.__name__
+                    if result.worker_rss:
+                        worker_peak[0] = max(worker_peak[0] or 0, result.worker_rss)
+                    self._put(transformed, result)
+
+            def admit_blocked():
+                while not budget.fits(estimates.get(blocked.path, 0)):
+                    collect(None)
+                submit(blocked)
+
+            try:
+                while True:
+                    while len(pending) >= self.executor.max_in_flight:
+                        collect(None)
+                    if blocked is not None and budget.fits(estimates.get(blocked.path, 0)):
+                        submit(blocked)
+                        blocked = None
+                        continue
+                    try:
+                        item = prepared.get(timeout=0.05 if pending else 0.1)
+                    except queue.Empty:
+                        if self._stop.is_set():
+                            raise PipelineStopped()
+                        if pending:
+                            collect(0)
+                        continue
+                    if item is _DONE:
+                        break
+                    if item.skipped or item.error:
+                        self._put(transformed, item)
+                        continue
+                    if job:
+                        # Niyet kayıtları dosyaya dokunulmadan önce toplu fsync ile kalıcılaşır
+                        job.sync_intents()
+                    if budget is None:
+                        submit(item)
+                        continue
+                    cost = estimates.get(item.path, 0)
+                    reserved = budget.cost(estimates.get(blocked.path, 0)) if blocked is not None else 0
+                    if budget.fits(cost, reserved):
+                        submit(item)
+                    elif blocked is None:
+                        blocked = item
+                    else:
+                        # İkisi de sığmıyor: önce bekleyen büyük dosya kabul edilir
+                        admit_blocked()
+                        blocked = item
+                if blocked is not None:
+                    admit_blocked()
+                    blocked = None
+                while pending:
+                    collect(None)
+                self._put(transformed, _DONE)
+            except PipelineStopped:
+                for future in pending:
+                    future.cancel()
+
+        threads = [threading.Thread(target=scan, daemon=True)]
+        threads += self._stage(prepare, scanned, prepared, IO_WORKERS, pausable=True)
+        threads.append(threading.Thread(target=dispatch, daemon=True))
+        if self.verify:
+            threads += self._stage(local.verify, transformed, finished, IO_WORKERS)
+            results = finished
+        else:
+            results = transformed
+
+        counts = {'success': 0, 'error': 0}
+        try:
+            for thread in threads:
+                thread.start()
+            done = 0
+            while True:
+                result = self._get(results)
+                if result is _DONE:
+                    self.completed = True
+                    break
+                if job and not job.is_complete(result.path):
+                    job.complete(result.path, result.ok, written=result.backends.get('write', NONE) != NONE)
+                if manifest and result.ok and not result.skipped:
+                    manifest.record(result.path, operation, result.source_hash)
+                if stats:
+                    stats.add(result)
+                if result.ok:
+                    counts['success'] += 1
+                else:
+                    counts['error'] += 1
+                if on_result:
+                    on_result(done, result)
+                done += 1
+        except PipelineStopped:
+            pass
+        finally:
+            self._stop.set()
+            if stats:
+                stats.finish()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.executor.save_profiles()
+            if shared:
+                shared.close()
+            if stats:
+                memory = budget.to_dict() if budget else {'limit': None}
+                memory.update(rss=peak_rss(), worker_rss=worker_peak[0])
+                stats.set_memory(memory)
+            # Hat yeniden çalıştırılabilir
+            self._stop.clear()
+
+        return counts['success'], counts['error']
@@ -0,0 +1,92 @@
+"""
+Tek geçişli dönüşüm planlayıcı
+İstenen işlemler (EXIF düzeltme, döndürme, döndürme modu) dosyanın mevcut Orientation
+değeriyle birleştirilerek tek bir net piksel dönüşümüne ve tek bir hedef etikete
+indirgenir. Ardından bu planı uygulayabilen en ucuz arka uç seçilir; böylece her dosya
+en fazla bir kez okunup bir kez yazılır.
+"""
+
+from .lossless import (
+    ROTATE_90, ROTATE_180, ROTATE_270, FLIP_HORIZONTAL, FLIP_VERTICAL,
+)
+from .orientation import IDENTITY, compose, normalize, transform_for
+
+# Arka uçlar, ucuzdan pahalıya
+NONE = 'none'           # dosyaya dokunulmaz
+PATCH = 'patch'         # yalnızca etiket yazılır (yerinde yama, gerekirse ekleme)
+LOSSLESS = 'lossless'   # DCT katsayı dönüşümü + aynı yazımda etiket
+SIPS = 'sips'           # macOS sips (yeniden kodlar)
+REENCODE = 'pil'        # PIL ile çöz/döndür/kodla, etiket aynı kayıtta
+
+# Döndürme modları
+PIXELS = 'pixels'     # pikseller yeniden yazılır
+VIRTUAL = 'virtual'   # yalnızca Orientation etiketi birleştirilip yazılır
+BAKE = 'bake'         # etiket birleştirilir, sonra EXIF okumayan tüketiciler için piksellere uygulanır
+ROTATE_MODES = (PIXELS, VIRTUAL, BAKE)
+
+# sips'in tek komutla uygulayabildiği dönüşümler
+SIPS_ARGS = {
+    ROTATE_90: ['-r', '90'],
+    ROTATE_180: ['-r', '180'],
+    ROTATE_270: ['-r', '270'],
+    FLIP_HORIZONTAL: ['-f', 'horizontal'],
+    FLIP_VERTICAL: ['-f', 'vertical'],
+}
+
+
+class Plan:
+    """Bir dosya için net dönüşüm ve hedef Orientation"""
+
+    __slots__ = ('transform', 'orientation', 'current')
+
+    def __init__(self, transform=IDENTITY, orientation=None, current=None):
+        # Piksellere uygulanacak net dönüşüm
+        self.transform = transform
+        # Yazılacak Orientation değeri (None = etikete dokunma)
+        self.orientation = orientation
+        # Dosyadaki mevcut değer (etiket yoksa None)
+        self.current = current
+
+    @property
+    def final_orientation(self):
+        return self.orientation if self.orientation is not None else normalize(self.current)
+
+    def backends(self):
+        """Planı uygulayabilecek arka uçlar, ucuzdan pahalıya"""
+        if self.transform == IDENTITY:
+            return [PATCH] if self.orientation is not None else [NONE]
+        candidates = [LOSSLESS]
+        if self.transform in SIPS_ARGS:
+            candidates.append(SIPS)
+        candidates.append(REENCODE)
+        return candidates
+
+    def to_dict(self):
+        return {
+            'transform': self.transform,
+            'orientation': self.final_orientation,
+            'previous_orientation': self.current,
+        }
+
+    def __repr__(self):
+        return f"Plan({self.transform}, orientation={self.orientation}, current={self.current})"
+
+
+def plan(spec, current, operation=ROTATE_90):
+    """JobSpec ve mevcut Orientation değerinden net planı hesapla"""
+    if spec.rotate and spec.rotate_mode != PIXELS:
+        # EXIF düzeltmesi de istendiyse mevcut değer yok sayılır
+        base = 1 if spec.fix_exif else normalize(current)
+        value = compose(base, operation)
+        if spec.rotate_mode == BAKE:
+            transform, orientation = transform_for(value), 1
+        else:
+            transform, orientation = IDENTITY, value
+    else:
+        transform = operation if spec.rotate else IDENTITY
+        orientation = 1 if spec.fix_exif else None
+
+    # Etiket zaten istenen değerdeyse (yok = 1) yazmaya gerek yok
+    if orientation is not None and orientation == (current if current is not None else 1):
+        orientation = None
+    return Plan(transform, orientation, current)
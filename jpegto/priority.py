@@ -0,0 +1,192 @@
+"""
+Öncelik ve adil paylaşım
+FileOrder dosyaların hatta hangi sırayla ilerleyeceğini belirler: bulunma sırası,
+küçük dosyalar önce (hızlı geri bildirim) veya odak klasörü önce (kullanıcının baktığı
+klasör; çalışırken değiştirilebilir). PriorityBuffer, hattın aşamaları arasında
+queue.Queue yerine kullanılan sınırlı öncelik kuyruğudur; sıra değişince bekleyen
+öğeler yeniden sıralanır. FairShare, aynı anda çalışan işlerin dönüşüm yuvalarını
+ağırlıklarına göre paylaştırır: yuva boşaldığında, ağırlığına oranla en az yuva
+kullanan bekleyen iş sıradaki yuvayı alır.
+"""
+
+import heapq
+import itertools
+import os
+import queue
+import threading
+
+FIFO = 'fifo'
+SMALLEST = 'smallest'
+FOCUS = 'focus'
+ORDERS = (FIFO, SMALLEST, FOCUS)
+
+
+class FileOrder:
+    """Dosya sırası; set() ile çalışırken değiştirilebilir (bekleyen öğeler yeniden sıralanır)"""
+
+    def __init__(self, order=FIFO, focus=None):
+        self.order = FIFO
+        self.focus = None
+        # Her değişiklikte artar; tamponlar anahtarları buna göre yeniler
+        self.version = 0
+        self._lock = threading.Lock()
+        self.set(order, focus)
+
+    def set(self, order, focus=None):
+        if order not in ORDERS:
+            raise ValueError(f"Bilinmeyen sıra: {order}")
+        if order == FOCUS and not focus:
+            raise ValueError("Odak sırası için klasör gerekli")
+        with self._lock:
+            self.order = order
+            self.focus = os.path.abspath(focus) if focus else None
+            self.version += 1
+
+    def key(self, path, size=None):
+        """Küçük anahtar önce işlenir; eşit anahtarlar bulunma sırasını korur"""
+        order, focus = self.order, self.focus
+        if order == SMALLEST:
+            if size is None:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+            return size
+        if order == FOCUS:
+            path = os.path.abspath(path)
+            return 0 if path == focus or path.startswith(focus + os.sep) else 1
+        return 0
+
+
+class PriorityBuffer:
+    """queue.Queue gibi put/get yapan sınırlı öncelik kuyruğu
+
+    Öğeler yol (str) veya path/size öznitelikli sonuçlardır; bunların dışındaki
+    nesneler (ör. bitiş işareti) tüm öğelerden sonra gelir.
+    """
+
+    def __init__(self, maxsize, order):
+        self.maxsize = maxsize
+        self.order = order
+        self._version = order.version
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def _key(self, item):
+        if isinstance(item, str):
+            return (0, self.order.key(item))
+        path = getattr(item, 'path', None)
+        if path is None:
+            return (1, 0)
+        return (0, self.order.key(path, getattr(item, 'size', None)))
+
+    def _reorder(self):
+        if self._version == self.order.version:
+            return
+        self._version = self.order.version
+        self._heap = [(self._key(item), sequence, item) for _, sequence, item in self._heap]
+        heapq.heapify(self._heap)
+
+    def put(self, item, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._heap) < self.maxsize, timeout):
+                raise queue.Full
+            heapq.heappush(self._heap, (self._key(item), next(self._counter), item))
+            self._condition.notify_all()
+
+    def get(self, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._heap, timeout):
+                raise queue.Empty
+            self._reorder()
+            item = heapq.heappop(self._heap)[2]
+            self._condition.notify_all()
+            return item
+
+    def qsize(self):
+        with self._condition:
+            return len(self._heap)
+
+
+class ShareTicket:
+    """Bir işin FairShare'deki payı"""
+
+    __slots__ = ('share', 'key')
+
+    def __init__(self, share, key):
+        self.share = share
+        self.key = key
+
+    def acquire(self, timeout=None):
+        return self.share.acquire(self.key, timeout)
+
+    def release(self, *args):
+        # Future.add_done_callback ile de çağrılabilir
+        self.share.release(self.key)
+
+    def close(self):
+        self.share.unregister(self.key)
+
+
+class FairShare:
+    """Eşzamanlı işler arasında ağırlıklı adil yuva paylaşımı; iş parçacığı güvenli"""
+
+    def __init__(self, slots):
+        self.slots = max(1, slots)
+        self._used = {}
+        self._weights = {}
+        # İş anahtarı -> bekleyen iş parçacığı sayısı
+        self._waiting = {}
+        self._keys = itertools.count()
+        self._condition = threading.Condition()
+
+    def register(self, weight=1):
+        """Yeni bir iş için pay aç; ağırlığı büyük iş daha çok yuva alır"""
+        with self._condition:
+            key = next(self._keys)
+            self._used[key] = 0
+            self._weights[key] = max(weight, 1e-3)
+        return ShareTicket(self, key)
+
+    def unregister(self, key):
+        with self._condition:
+            self._used.pop(key, None)
+            self._weights.pop(key, None)
+            self._waiting.pop(key, None)
+            self._condition.notify_all()
+
+    def _turn(self, key):
+        if sum(self._used.values()) >= self.slots:
+            return False
+        # Kullandığı yuva / ağırlık oranı en düşük bekleyen iş (eşitlikte önce kaydolan)
+        return key == min(self._waiting, key=lambda waiting: (self._used[waiting] / self._weights[waiting], waiting))
+
+    def acquire(self, key, timeout=None):
+        """Sıra bu işe gelince yuva al; süre dolarsa False"""
+        with self._condition:
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+            try:
+                if not self._condition.wait_for(lambda: self._turn(key), timeout):
+                    return False
+                self._used[key] += 1
+                return True
+            finally:
+                count = self._waiting.get(key, 0) - 1
+                if count > 0:
+                    self._waiting[key] = count
+                else:
+                    self._waiting.pop(key, None)
+                # Sıradaki bekleyen yeniden değerlendirilsin
+                self._condition.notify_all()
+
+    def release(self, key):
+        with self._condition:
+            if self._used.get(key):
+                self._used[key] -= 1
+            self._condition.notify_all()
+
+    def usage(self):
+        """İş anahtarı -> kullanılan yuva"""
+        with self._condition:
+            return dict(self._used)
@@ -0,0 +1,159 @@
+"""
+os.scandir tabanlı paralel klasör tarayıcı
+Alt klasörler bir iş parçacığı havuzunda eşzamanlı dolaşılır, DirEntry'nin önbelleğe
+aldığı tür bilgisi kullanılır (dosya başına ek stat() yok) ve bulunan JPEG'ler
+tarama bitmeden tek tek üretilir. Klasörlerde uzantı süzgeci kullanılır; istenirse
+(sniff) uzantısı yanlış dosyalar da `FF D8 FF` imzasıyla (3 baytlık okuma) tanınır.
+Doğrudan verilen dosyalar (argüman, dosya penceresi, sürükle-bırak) uzantıları ne olursa
+olsun imzalarıyla da tanınır.
+"""
+
+import os
+import queue
+import threading
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+JPEG_EXTENSIONS = ('.jpg', '.jpeg', '.jpe', '.jfif')
+
+# jpegto'nun kendi ürettiği dosyalar taramaya dahil edilmez
+IGNORED_SUFFIXES = ('.backup', '.delta', '.wal', '.tmp', '.sqlite', '.sqlite-wal', '.sqlite-shm')
+
+# Atomik yazmaların geçici dosyaları
+TEMP_PREFIX = '.jpegto-'
+
+_DONE = object()
+
+
+def has_jpeg_magic(path):
+    """Dosyanın ilk 3 baytı JPEG imzası mı?"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(3) == JPEG_MAGIC
+    except OSError:
+        return False
+
+
+def is_candidate(name, path, sniff):
+    lowered = name.lower()
+    if lowered.startswith(TEMP_PREFIX) or lowered.endswith(IGNORED_SUFFIXES):
+        return False
+    if lowered.endswith(JPEG_EXTENSIONS):
+        return True
+    return sniff and has_jpeg_magic(path)
+
+
+class Scanner:
+    """Klasör ağaçlarını paralel tarayıp JPEG yollarını akış olarak üreten tarayıcı"""
+
+    def __init__(self, workers=8, sniff=False, follow_symlinks=False):
+        self.workers = max(1, workers)
+        self.sniff = sniff
+        self.follow_symlinks = follow_symlinks
+        self.errors = []
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Taramayı durdur (üretilmiş yollar geçerli kalır)"""
+        self._stop.set()
+
+    def scan(self, roots):
+        """Kök klasörlerdeki JPEG yollarını bulundukça üret"""
+        self._stop.clear()
+        directories = queue.Queue()
+        results = queue.Queue(maxsize=4096)
+        # Henüz dolaşılmamış klasör sayısı; sıfıra inince tarama biter
+        outstanding = [0]
+        lock = threading.Lock()
+        visited = set()
+
+        def enqueue(path):
+            if self.follow_symlinks:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    return
+                key = stat.st_ino, stat.st_dev
+                with lock:
+                    if key in visited:
+                        return
+                    visited.add(key)
+            with lock:
+                outstanding[0] += 1
+            directories.put(path)
+
+        def walk_one(path):
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if self._stop.is_set():
+                            return
+                        try:
+                            if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                                enqueue(entry.path)
+                            elif entry.is_file(follow_symlinks=self.follow_symlinks):
+                                if is_candidate(entry.name, entry.path, self.sniff):
+                                    results.put(entry.path)
+                        except OSError as e:
+                            self.errors.append((entry.path, str(e)))
+            except OSError as e:
+                self.errors.append((path, str(e)))
+
+        def worker():
+            while True:
+                path = directories.get()
+                if path is _DONE:
+                    return
+                walk_one(path)
+                with lock:
+                    outstanding[0] -= 1
+                    finished = outstanding[0] == 0
+                if finished:
+                    results.put(_DONE)
+
+        for root in roots:
+            enqueue(root)
+        if outstanding[0] == 0:
+            return
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stop.set()
+            # Kuyrukta kalan klasörler boşaltılır, işçiler kapatılır
+            while True:
+                try:
+                    directories.get_nowait()
+                except queue.Empty:
+                    break
+            for _ in threads:
+                directories.put(_DONE)
+            # Sonuç kuyruğunda bekleyen işçilerin takılmaması için boşalt
+            while any(t.is_alive() for t in threads):
+                try:
+                    results.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+
+
+def iter_jpegs(paths, sniff=False, workers=8):
+    """Dosya ve klasör yollarından JPEG dosyalarını bulundukça üret
+
+    sniff yalnızca klasör taramasını etkiler; doğrudan verilen dosyaların imzasına
+    her zaman bakılır.
+    """
+    directories = []
+    for path in paths:
+        if os.path.isdir(path):
+            directories.append(path)
+        elif os.path.isfile(path) and is_candidate(os.path.basename(path), path, sniff=True):
+            yield path
+    if directories:
+        yield from Scanner(workers=workers, sniff=sniff).scan(directories)
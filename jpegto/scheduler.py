@@ -0,0 +1,203 @@
+"""
+İptal edilebilir, öncelikli iş zamanlayıcısı
+Her iş kendi (daemon olmayan) iş parçacığında çalışır ve hattını zamanlayıcıdan alır;
+böylece iş duraklatılabilir, sürdürülebilir ve iptal edilebilir. İptalde yeni dosya
+başlatılmaz, yazılmakta olan dosyalar tamamlanır (yazmalar zaten geçici dosya ve
+atomik yeniden adlandırma ile yapılır); süreç de bunlar bitmeden kapanmaz. Dosya
+sırası iş başına seçilir (bulunma sırası, küçükler önce, odak klasörü önce) ve
+çalışırken değiştirilebilir. Aynı anda birden fazla iş verilirse dönüşüm yuvaları
+işlerin ağırlıklarına göre adil paylaşılır.
+"""
+
+import itertools
+import threading
+
+from .memory import default_budget
+from .parallel import AUTO, default_workers
+from .priority import FairShare, FileOrder
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PAUSED = 'paused'
+CANCELLING = 'cancelling'
+CANCELLED = 'cancelled'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATES = (CANCELLED, DONE, FAILED)
+
+# Kullanıcının seçebileceği iş ağırlıkları
+LOW = 0.5
+NORMAL = 1
+HIGH = 2
+
+
+class JobCancelled(Exception):
+    """İş hattı oluşturulmadan iptal edildi"""
+
+
+class Job:
+    """Zamanlayıcıdaki bir iş; target(job, *args) iş parçacığında çalışır
+
+    target hattını job.pipeline(spec, ...) ile alır; durum, duraklatma ve iptal
+    bu hatta uygulanır. target'ın dönüş değeri job.result'tadır.
+    """
+
+    def __init__(self, scheduler, target, args, name, order, weight, on_done):
+        self.scheduler = scheduler
+        self.id = None
+        self.name = name
+        self.target = target
+        self.args = args
+        self.order = order or FileOrder()
+        self.weight = weight
+        self.on_done = on_done
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self._pipeline = None
+        self._paused = False
+        self._cancelled = False
+        self._ticket = None
+        self._thread = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def pipeline(self, spec, **options):
+        """İşin hattını oluştur (sıra, adil pay ve bellek bütçesi zamanlayıcıdan)"""
+        from .pipeline import Pipeline
+
+        scheduler = self.scheduler
+        with self._lock:
+            if self._cancelled:
+                raise JobCancelled()
+            options.setdefault('workers', scheduler.workers)
+            options.setdefault('mode', scheduler.mode)
+            options.setdefault('memory_budget', scheduler.memory_budget)
+            self._pipeline = Pipeline(spec, order=self.order, share=self._ticket, **options)
+            if self._paused:
+                self._pipeline.pause()
+            return self._pipeline
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def pause(self):
+        with self._lock:
+            if self.state != RUNNING:
+                return
+            self._paused = True
+            self.state = PAUSED
+            if self._pipeline:
+                self._pipeline.pause()
+
+    def resume(self):
+        with self._lock:
+            if self.state != PAUSED:
+                return
+            self._paused = False
+            self.state = RUNNING
+            if self._pipeline:
+                self._pipeline.resume()
+
+    def cancel(self):
+        """Yeni dosya başlatma; yazılmakta olanlar tamamlanınca iş biter"""
+        with self._lock:
+            if self.state in FINISHED_STATES:
+                return
+            self._cancelled = True
+            self.state = CANCELLING
+            if self._pipeline:
+                self._pipeline.stop()
+
+    def set_order(self, order, focus=None):
+        """Dosya sırasını çalışırken değiştir; bekleyen dosyalar yeniden sıralanır"""
+        self.order.set(order, focus)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _run(self):
+        state = DONE
+        try:
+            self.result = self.target(self, *self.args)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            self.error = str(e) or e.__class__.__name__
+            state = FAILED
+        finally:
+            self._ticket.close()
+            with self._lock:
+                self.state = CANCELLED if self._cancelled and state == DONE else state
+            self.scheduler._finished(self)
+            self._done.set()
+            if self.on_done:
+                self.on_done(self)
+
+
+class Scheduler:
+    """İşleri ayrı iş parçacıklarında çalıştırıp adil paylaştıran zamanlayıcı"""
+
+    def __init__(self, workers=None, mode=AUTO, memory_budget=None):
+        self.workers = max(1, workers or default_workers())
+        self.mode = mode
+        self.memory_budget = default_budget() if memory_budget is None else memory_budget
+        # Tüm işlerin aynı anda havuzlarda tutabileceği dönüşüm sayısı
+        self.share = FairShare(self.workers * 2)
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, target, args=(), name=None, order=None, weight=NORMAL, on_done=None):
+        """target(job, *args)'ı yeni bir işte başlat; Job döndür"""
+        job = Job(self, target, args, name, order, weight, on_done)
+        with self._lock:
+            job.id = next(self._ids)
+            job.name = name or f"iş {job.id}"
+            job._ticket = self.share.register(weight)
+            job.state = RUNNING
+            self.jobs.append(job)
+        # Daemon değil: yorumlayıcı kapanırken yazılmakta olan dosyalar yarıda kesilmez
+        job._thread = threading.Thread(target=job._run, name=f"jpegto-job-{job.id}")
+        job._thread.start()
+        return job
+
+    def _finished(self, job):
+        with self._lock:
+            if job in self.jobs:
+                self.jobs.remove(job)
+
+    @property
+    def active(self):
+        with self._lock:
+            return list(self.jobs)
+
+    def pause_all(self):
+        for job in self.active:
+            job.pause()
+
+    def resume_all(self):
+        for job in self.active:
+            job.resume()
+
+    def cancel_all(self):
+        for job in self.active:
+            job.cancel()
+
+    def wait(self, timeout=None):
+        """Tüm işlerin bitmesini bekle; süre dolduysa False"""
+        for job in self.active:
+            if not job.wait(timeout):
+                return False
+        return True
+
+    def shutdown(self, wait=True):
+        """Tüm işleri iptal et; wait verilirse yazılmakta olan dosyaların bitmesini bekle"""
+        self.cancel_all()
+        if wait:
+            self.wait()
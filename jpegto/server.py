@@ -0,0 +1,505 @@
+"""
+Yerel asyncio HTTP servisi
+Kullanım:
+    python3 -m jpegto.server [--host 127.0.0.1] [--port 8765] [--root KLASÖR ...] [-j 4]
+
+Uç noktalar:
+    GET  /health              arka uçlar ve anlık yük (JSON)
+    POST /fix?rotate=1&...    gövde JPEG baytları; düzeltilmiş JPEG akış olarak döner,
+                              sonuç özeti X-Jpegto-Result başlığında (JSON)
+    POST /batch               gövde {"paths": [...], "rotate": true, ...}; --root altındaki
+                              dosya ve klasörler işlenir, her dosyanın sonucu bittikçe bir
+                              NDJSON satırı olarak akar
+
+Seçenekler (sorgu parametresi veya JSON alanı): fix_exif, rotate, rotate_mode, encode,
+quality, backup (yalnızca /batch; varsayılan açık). İşlem CLI ve GUI'lerle aynı
+Processor/ParallelExecutor yolundan geçer; CPU ağırlıklı dönüşümler havuzda, yedekleme ve
+doğrulama iş parçacıklarında çalışır, olay döngüsü yalnızca G/Ç yapar. Eşzamanlı dosya
+sayısı --limit ile sınırlıdır; bekleyen istek sayısı --queue'yu aşarsa 503 ve Retry-After
+döner. Gövde 64 KB'lık parçalarla diske akıtılır, yanıt yazılırken istemcinin okuması
+beklenir (drain); yavaş istemci belleği şişirmez. Görüntüyü çözen dönüşümler bellek
+bütçesine (--memory-budget) göre kabul edilir. Yalnızca standart kütüphane kullanılır.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.parse
+
+from . import capabilities
+from .core import JobSpec, Processor, find_jpegs
+from .encoding import PROFILES
+from .memory import MemoryBudget, default_budget, estimate_file
+from .parallel import MODES, AUTO, ParallelExecutor, _transform_in_worker, default_workers
+from .planner import ROTATE_MODES
+from .scanner import JPEG_MAGIC
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+CHUNK = 64 * 1024
+MAX_HEADER = 64 * 1024
+MAX_UPLOAD = 256 * 1024 * 1024
+MAX_BATCH_BODY = 16 * 1024 * 1024
+
+# Bekleyen (yer bekleyen) istek sayısı üst sınırı, eşzamanlılık sınırının katı olarak
+QUEUE_FACTOR = 4
+RETRY_AFTER = 1
+
+# Ayrı havuz tutulan en fazla farklı seçenek kümesi
+MAX_POOLS = 4
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 415: 'Unsupported Media Type', 422: 'Unprocessable Entity',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+BOOLEAN_TRUE = ('1', 'true', 'yes', 'on')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _boolean(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in BOOLEAN_TRUE
+
+
+def spec_from_options(options, backup):
+    """Sorgu veya JSON seçeneklerinden JobSpec; geçersiz değerlerde HTTPError(400)"""
+    try:
+        quality = options.get('quality')
+        spec = JobSpec(
+            fix_exif=_boolean(options.get('fix_exif', True)),
+            rotate=_boolean(options.get('rotate', False)),
+            backup=_boolean(options.get('backup', backup)),
+            rotate_mode=options.get('rotate_mode', ROTATE_MODES[0]),
+            encode=options.get('encode', PROFILES[0]),
+            quality=int(quality) if quality not in (None, '') else None,
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPError(400, str(e))
+    if not spec.has_work:
+        raise HTTPError(400, "en az bir işlem seçilmeli (fix_exif veya rotate)")
+    return spec
+
+
+class _Workers:
+    """Bir seçenek kümesi için havuz ve yedekleme/doğrulama işleyicisi"""
+
+    def __init__(self, spec, workers, mode):
+        self.executor = ParallelExecutor(spec, workers=workers, mode=mode)
+        self.pool, self.shared = self.executor.create_pool()
+        self.local = self.shared or Processor(spec)
+        self.task = self.shared.transform if self.shared else _transform_in_worker
+        # Havuzu kullanan istek sayısı; çıkarılan havuz son kullanıcı bırakınca kapatılır
+        self.users = 0
+
+    def close(self):
+        # Kullanıcısı kalmamış havuz kapatılır; kuyruktaki işler iptal edilmez, tamamlanır
+        self.pool.shutdown(wait=True)
+        if self.shared:
+            self.shared.close()
+
+
+class Service:
+    """HTTP isteklerini jpegto işleyicisine bağlayan servis"""
+
+    def __init__(self, roots=(), workers=None, mode=AUTO, limit=None, queue=None, spool=None,
+                 max_upload=MAX_UPLOAD, memory_budget=None):
+        # /batch yalnızca bu klasörlerin altındaki yollara izin verir (boşsa kapalı)
+        self.roots = [os.path.realpath(root) for root in roots]
+        self.workers = max(1, workers or default_workers())
+        self.mode = mode
+        self.limit = max(1, limit or self.workers)
+        self.queue = queue if queue is not None else self.limit * QUEUE_FACTOR
+        self.spool = spool
+        self.max_upload = max_upload
+        # Bayt; None fiziksel belleğin yarısı, 0 sınırsız
+        budget = default_budget() if memory_budget is None else memory_budget
+        self.budget = MemoryBudget(budget) if budget else None
+        self._slots = None
+        self._waiting = 0
+        self._active = 0
+        self._pools = {}
+        # Çıkarılmış ama hâlâ kullanılan havuzlar
+        self._retired = set()
+        self._pools_lock = threading.Lock()
+        # Yedekleme, doğrulama ve gövde dosyası işlemleri (olay döngüsünü bloklamasın)
+        self._io = concurrent.futures.ThreadPoolExecutor(max_workers=self.limit + 2,
+                                                         thread_name_prefix='jpegto-http')
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Dinlemeye başla; port 0 ise boş bir port seçilir. (host, port) döndür"""
+        self._slots = asyncio.Semaphore(self.limit)
+        self._server = await asyncio.start_server(self._connection, host, port, limit=MAX_HEADER)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self):
+        self._io.shutdown(wait=True)
+        with self._pools_lock:
+            pools = list(self._pools.values()) + list(self._retired)
+            self._pools.clear()
+            self._retired.clear()
+        for workers in pools:
+            workers.close()
+
+    def _checkout(self, spec):
+        """Seçenek kümesinin havuzunu al; işi bitince _checkin ile bırakılmalı"""
+        key = json.dumps(spec.to_dict(), sort_keys=True)
+        idle = []
+        with self._pools_lock:
+            workers = self._pools.get(key)
+            if workers is None:
+                if len(self._pools) >= MAX_POOLS:
+                    # En eski seçenek kümesinin havuzu çıkarılır; kullanımdaysa son istek
+                    # bitince kapatılır (işleri iptal edilmez)
+                    oldest = self._pools.pop(next(iter(self._pools)))
+                    if oldest.users:
+                        self._retired.add(oldest)
+                    else:
+                        idle.append(oldest)
+                workers = self._pools[key] = _Workers(spec, self.workers, self.mode)
+            workers.users += 1
+        # Kapatma bekleyen işleri bekler; kilit tutulmaz
+        for retired in idle:
+            retired.close()
+        return workers
+
+    def _checkin(self, workers):
+        with self._pools_lock:
+            workers.users -= 1
+            idle = workers in self._retired and not workers.users
+            if idle:
+                self._retired.discard(workers)
+        if idle:
+            workers.close()
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io, function, *args)
+
+    async def _acquire(self):
+        """İşlem yeri al; kuyruk doluysa 503 (istemci Retry-After kadar bekleyip yeniden denemeli)"""
+        if self._slots.locked() and self._waiting >= self.queue:
+            raise HTTPError(503, "servis meşgul", {'Retry-After': str(RETRY_AFTER)})
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+
+    def _release(self):
+        self._active -= 1
+        self._slots.release()
+
+    def _transform_budgeted(self, workers, spec, result):
+        cost = estimate_file(spec, result.path)
+        self.budget.acquire(cost)
+        try:
+            return workers.pool.submit(workers.task, result).result()
+        finally:
+            self.budget.release(cost)
+
+    async def process(self, spec, path):
+        """Tek dosyayı hazırla, havuzda dönüştür, doğrula; FileResult döndür"""
+        workers = await self._run(self._checkout, spec)
+        try:
+            result = await self._run(workers.local.prepare, path)
+            if not result.error:
+                try:
+                    if self.budget:
+                        # Bütçe beklemesi ve dönüşüm G/Ç iş parçacığında; istek iptal edilse de pay geri verilir
+                        result = await self._run(self._transform_budgeted, workers, spec, result)
+                    else:
+                        result = await asyncio.wrap_future(workers.pool.submit(workers.task, result))
+                except Exception as e:
+                    # İşçi süreç çöktüyse dosya hatalı sayılır
+                    result.error = str(e) or e.__class__.__name__
+            return await self._run(workers.local.verify, result)
+        finally:
+            # İstek iptal edilse de havuz bırakılır (G/Ç yürütücüsünde; kapatma bekleyebilir)
+            try:
+                self._io.submit(self._checkin, workers)
+            except RuntimeError:
+                # Servis kapanıyor; havuzlar _shutdown'da kapatılır
+                pass
+
+    # --- HTTP ---
+
+    async def _connection(self, reader, writer):
+        try:
+            try:
+                method, target, headers = await self._read_head(reader)
+                url = urllib.parse.urlsplit(target)
+                await self._route(method, url, headers, reader, writer)
+            except HTTPError as e:
+                await self._send_json(writer, e.status, {'error': str(e)}, e.headers)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+                await self._send_json(writer, 400, {'error': str(e) or "geçersiz istek"})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            try:
+                await self._send_json(writer, 500, {'error': str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def _read_head(self, reader):
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('iso-8859-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise HTTPError(400, "geçersiz istek satırı")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        return parts[0].upper(), parts[1], headers
+
+    async def _route(self, method, url, headers, reader, writer):
+        if url.path == '/health':
+            if method != 'GET':
+                raise HTTPError(405, "GET bekleniyordu")
+            backends = await self._run(capabilities.probe)
+            await self._send_json(writer, 200, {
+                'ok': True, 'backends': backends.to_dict(), 'workers': self.workers, 'limit': self.limit,
+                'active': self._active, 'waiting': self._waiting, 'batch': bool(self.roots),
+                'memory': self.budget.to_dict() if self.budget else None,
+            })
+        elif url.path == '/fix':
+            if method != 'POST':
+                raise HTTPError(405, "POST bekleniyordu")
+            options = dict(urllib.parse.parse_qsl(url.query))
+            await self._fix(spec_from_options(options, backup=False), headers, reader, writer)
+        elif url.path == '/batch':
+            if method != 'POST':
+                raise HTTPError(405, "POST bekleniyordu")
+            await self._batch(headers, reader, writer)
+        else:
+            raise HTTPError(404, f"bilinmeyen yol: {url.path}")
+
+    def _content_length(self, headers, maximum):
+        if 'chunked' in headers.get('transfer-encoding', '').lower() or 'content-length' not in headers:
+            raise HTTPError(411, "Content-Length gerekli")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(400, "geçersiz Content-Length")
+        if length < 0:
+            raise HTTPError(400, "geçersiz Content-Length")
+        if length > maximum:
+            raise HTTPError(413, f"gövde en fazla {maximum} bayt olabilir")
+        return length
+
+    async def _fix(self, spec, headers, reader, writer):
+        length = self._content_length(headers, self.max_upload)
+        await self._acquire()
+        directory = None
+        try:
+            directory = await self._run(tempfile.mkdtemp, '', '.jpegto-http-', self.spool)
+            path = os.path.join(directory, 'upload.jpg')
+            # Gövde parça parça diske akar; TCP akış denetimi istemciyi yavaşlatır. Disk
+            # işlemleri G/Ç iş parçacığında yapılır: yavaş bir disk diğer bağlantıları bekletmez
+            f = await self._run(open, path, 'wb')
+            try:
+                remaining = length
+                while remaining:
+                    chunk = await reader.read(min(CHUNK, remaining))
+                    if not chunk:
+                        raise HTTPError(400, "gövde eksik")
+                    if remaining == length and not chunk.startswith(JPEG_MAGIC[:len(chunk)]):
+                        raise HTTPError(415, "gövde bir JPEG değil (FF D8 FF imzası yok)")
+                    remaining -= len(chunk)
+                    await self._run(f.write, chunk)
+            finally:
+                await self._run(f.close)
+            if length < len(JPEG_MAGIC):
+                raise HTTPError(415, "gövde bir JPEG değil (FF D8 FF imzası yok)")
+
+            result = await self.process(spec, path)
+            summary = result.to_dict()
+            del summary['path']
+            if not result.ok:
+                raise HTTPError(422, result.error or "işlenemedi")
+            size = await self._run(os.path.getsize, path)
+            await self._send_head(writer, 200, {
+                'Content-Type': 'image/jpeg', 'Content-Length': str(size),
+                'X-Jpegto-Result': json.dumps(summary, ensure_ascii=True, separators=(',', ':')),
+            })
+            f = await self._run(open, path, 'rb')
+            try:
+                while True:
+                    chunk = await self._run(f.read, CHUNK)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    # İstemci okudukça yazılır (geri basınç)
+                    await writer.drain()
+            finally:
+                await self._run(f.close)
+        finally:
+            self._release()
+            if directory:
+                await self._run(shutil.rmtree, directory, True)
+
+    def _allowed(self, path):
+        real = os.path.realpath(path)
+        return any(real == root or real.startswith(root + os.sep) for root in self.roots)
+
+    async def _batch(self, headers, reader, writer):
+        if not self.roots:
+            raise HTTPError(403, "sunucu tarafı yollar kapalı (--root ile izin verin)")
+        length = self._content_length(headers, MAX_BATCH_BODY)
+        try:
+            body = json.loads(await reader.readexactly(length))
+        except ValueError:
+            raise HTTPError(400, "gövde JSON olmalı")
+        paths = body.get('paths') if isinstance(body, dict) else None
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            raise HTTPError(400, "paths bir yol listesi olmalı")
+        denied = [path for path in paths if not self._allowed(path)]
+        if denied:
+            raise HTTPError(403, f"izin verilen köklerin dışında: {', '.join(denied[:5])}")
+        spec = spec_from_options(body, backup=True)
+        files = await self._run(find_jpegs, paths, _boolean(body.get('sniff', False)))
+
+        await self._send_head(writer, 200, {'Content-Type': 'application/x-ndjson',
+                                            'Transfer-Encoding': 'chunked'})
+
+        async def one(path):
+            await self._acquire_waiting()
+            try:
+                return await self.process(spec, path)
+            finally:
+                self._release()
+
+        counts = {'ok': 0, 'error': 0}
+        # Dosyalar sınırlı pencereyle başlatılır; bitenler sırası beklenmeden yazılır
+        pending = set()
+        queued = iter(files)
+        for path in queued:
+            pending.add(asyncio.ensure_future(one(path)))
+            if len(pending) >= self.limit * 2:
+                break
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    counts['ok' if result.ok else 'error'] += 1
+                    await self._send_chunk(writer, json.dumps(result.to_dict(), ensure_ascii=False) + '\n')
+                    path = next(queued, None)
+                    if path is not None:
+                        pending.add(asyncio.ensure_future(one(path)))
+            await self._send_chunk(writer, json.dumps({'done': True, 'files': len(files), **counts}) + '\n')
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _acquire_waiting(self):
+        """Toplu işin dosyaları kuyruk sınırına takılmaz; yalnızca eşzamanlılık sınırlanır"""
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+
+    async def _send_head(self, writer, status, headers):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", 'Connection: close', 'Server: jpegto']
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+    async def _send_chunk(self, writer, text):
+        data = text.encode('utf-8')
+        writer.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+        await writer.drain()
+
+    async def _send_json(self, writer, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await self._send_head(writer, status, {'Content-Type': 'application/json; charset=utf-8',
+                                               'Content-Length': str(len(data)), **(headers or {})})
+        writer.write(data)
+        await writer.drain()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='jpegto.server', description="jpegto yerel HTTP servisi")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Dinlenecek adres (varsayılan: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port (varsayılan: %(default)s, 0: boş port)")
+    parser.add_argument('--root', action='append', default=[],
+                        help="/batch ile işlenebilecek sunucu tarafı klasör (birden fazla verilebilir)")
+    parser.add_argument('-j', '--workers', type=int, default=default_workers(),
+                        help="Havuzdaki işçi sayısı (varsayılan: CPU çekirdek sayısı)")
+    parser.add_argument('--mode', choices=MODES, default=AUTO,
+                        help="process: CPU ağırlıklı yollar, thread: exiftool/sips/G/Ç yolları")
+    parser.add_argument('--limit', type=int, help="Aynı anda işlenen en fazla dosya (varsayılan: işçi sayısı)")
+    parser.add_argument('--queue', type=int,
+                        help=f"Yer bekleyen en fazla /fix isteği; aşılırsa 503 (varsayılan: limit × {QUEUE_FACTOR})")
+    parser.add_argument('--spool', help="Yüklenen dosyaların geçici klasörü (varsayılan: sistem geçici klasörü)")
+    parser.add_argument('--max-upload', type=int, default=MAX_UPLOAD, help="En büyük yükleme (bayt)")
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help="Aynı anda çözülen görüntülerin tahmini bellek üst sınırı"
+                             " (varsayılan: fiziksel belleğin yarısı, 0: sınırsız)")
+    return parser
+
+
+async def _serve(args):
+    service = Service(args.root, workers=args.workers, mode=args.mode, limit=args.limit, queue=args.queue,
+                      spool=args.spool, max_upload=args.max_upload,
+                      memory_budget=None if args.memory_budget is None else args.memory_budget * 1024 * 1024)
+    host, port = await service.start(args.host, args.port)
+    print(f"jpegto.server: http://{host}:{port} (eşzamanlı {service.limit}, kuyruk {service.queue})",
+          file=sys.stderr)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Yeniden kodlamasız Orientation ekleme
+Etiket yoksa görüntü PIL ile yeniden kodlanmaz: yalnızca başlık yeniden kurulur.
+EXIF yoksa tek girdili IFD0 taşıyan yeni bir APP1 segmenti SOI/APP0'dan sonra
+eklenir; EXIF var ama Orientation yoksa IFD0, Orientation girdisiyle büyütülüp TIFF
+bloğunun sonuna taşınır. Böylece blok içindeki diğer veriler (alt IFD'ler, küçük
+resim, MakerNote) yerinde kalır ve konumları geçerliliğini korur.
+
+Yeni başlık geçici dosyaya yazılır, dosyanın geri kalanı (kalan segmentler ve
+entropi kodlu veri) çekirdek içinde (copy_file_range/sendfile) olduğu gibi eklenir
+ve sonuç hedefin üzerine atomik olarak taşınır. Piksel verisi bayt bayt aynı kalır.
+"""
+
+import io
+import os
+import struct
+
+from .backup import copy_range
+from .jpegmeta import APP1, EXIF_HEADER, ORIENTATION_TAG, SOS, TIFF_SHORT, JPEGFormatError, iter_segments
+from .lossless import replace_atomic, temp_path_for
+
+APP0 = 0xE0
+
+# Segment uzunluk alanının üst sınırı (uzunluk alanı dahil)
+MAX_SEGMENT_LENGTH = 0xFFFF
+
+
+class SpliceError(JPEGFormatError):
+    """Başlık yeniden kurulamıyor (ör. büyütülen EXIF bloğu tek segmente sığmıyor)"""
+
+
+def _orientation_entry(byteorder, value):
+    # SHORT değer, 4 baytlık değer alanının başına yaslanır
+    return struct.pack(byteorder + 'HHIHH', ORIENTATION_TAG, TIFF_SHORT, 1, value, 0)
+
+
+def _new_tiff(value):
+    """Yalnızca Orientation girdisi olan TIFF bloğu (Motorola bayt sırası)"""
+    return b'MM\x00*' + struct.pack('>IH', 8, 1) + _orientation_entry('>', value) + struct.pack('>I', 0)
+
+
+def _grow_tiff(tiff, value):
+    """IFD0'a Orientation girdisini ekle; büyütülen IFD0 bloğun sonuna taşınır"""
+    if tiff[:4] == b'II*\x00':
+        byteorder = '<'
+    elif tiff[:4] == b'MM\x00*':
+        byteorder = '>'
+    else:
+        raise JPEGFormatError("Geçersiz TIFF başlığı")
+
+    ifd_offset = struct.unpack_from(byteorder + 'I', tiff, 4)[0]
+    if ifd_offset + 2 > len(tiff):
+        raise JPEGFormatError("IFD0 segment dışında")
+    count = struct.unpack_from(byteorder + 'H', tiff, ifd_offset)[0]
+    end = ifd_offset + 2 + count * 12
+    if end + 4 > len(tiff):
+        raise JPEGFormatError("IFD0 girdileri segment dışında")
+
+    entries = [tiff[offset:offset + 12] for offset in range(ifd_offset + 2, end, 12)]
+    tags = [struct.unpack_from(byteorder + 'H', entry)[0] for entry in entries]
+    if ORIENTATION_TAG in tags:
+        raise JPEGFormatError("Orientation girdisi zaten var")
+    # Girdiler etiket numarasına göre artan sırada olmalı
+    position = sum(1 for tag in tags if tag < ORIENTATION_TAG)
+    entries.insert(position, _orientation_entry(byteorder, value))
+    next_ifd = tiff[end:end + 4]
+
+    # IFD'ler çift konumda başlar
+    padding = b'\x00' * (len(tiff) % 2)
+    new_offset = len(tiff) + len(padding)
+    header = tiff[:4] + struct.pack(byteorder + 'I', new_offset)
+    return (header + tiff[8:] + padding
+            + struct.pack(byteorder + 'H', len(entries)) + b''.join(entries) + next_ifd)
+
+
+def build_segment(payload, value):
+    """Mevcut EXIF yükünden (yoksa None) Orientation taşıyan yeni APP1 segmentini kur"""
+    if payload is None:
+        tiff = _new_tiff(value)
+    else:
+        tiff = _grow_tiff(payload[len(EXIF_HEADER):], value)
+    length = 2 + len(EXIF_HEADER) + len(tiff)
+    if length > MAX_SEGMENT_LENGTH:
+        raise SpliceError(f"EXIF bloğu tek segmente sığmıyor ({length} bayt)")
+    return b'\xff' + bytes([APP1]) + struct.pack('>H', length) + EXIF_HEADER + tiff
+
+
+def plan_splice(f):
+    """Değiştirilecek aralık ve mevcut EXIF yükü: (başlangıç, bitiş, yük)
+
+    EXIF varsa aralık APP1 segmentinin kendisidir; yoksa SOI ve JFIF/JFXX (APP0)
+    segmentlerinden hemen sonraki boş aralıktır.
+    """
+    insert_at = 2
+    leading = True
+    for segment in iter_segments(f):
+        if segment.marker == SOS:
+            break
+        if segment.marker == APP1 and segment.length >= 2 + len(EXIF_HEADER) + 8:
+            f.seek(segment.payload_offset)
+            payload = f.read(segment.length - 2)
+            if payload.startswith(EXIF_HEADER):
+                return segment.offset, segment.end, payload
+        if leading and segment.marker == APP0:
+            insert_at = segment.end
+        else:
+            leading = False
+    else:
+        raise JPEGFormatError("SOS işaretçisi bulunamadı")
+    return insert_at, insert_at, None
+
+
+def splice_orientation_bytes(data, value):
+    """Bellekteki JPEG'e Orientation girdisini ekle; yeni baytları döndür"""
+    start, end, payload = plan_splice(io.BytesIO(data))
+    return bytes(data[:start]) + build_segment(payload, value) + bytes(data[end:])
+
+
+def splice_orientation(path, value, durable=False):
+    """Dosyaya Orientation girdisini ekle; geri kalan veri çekirdek içinde kopyalanır
+
+    Kullanılan kopyalama stratejisini döndürür (copy_file_range, sendfile veya buffered).
+    """
+    with open(path, 'rb') as f:
+        start, end, payload = plan_splice(f)
+        segment = build_segment(payload, value)
+        f.seek(0)
+        head = f.read(start)
+        size = os.fstat(f.fileno()).st_size
+
+        fd, temp_path = temp_path_for(path, suffix='.jpg')
+        try:
+            try:
+                for chunk in (head, segment):
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(fd, view):]
+                strategy = copy_range(f.fileno(), fd, end, size - end)
+            finally:
+                os.close(fd)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    # Kaynak kapatıldıktan sonra taşınır (Windows açık dosyanın üzerine yazamaz)
+    try:
+        replace_atomic(temp_path, path, durable)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return strategy
@@ -0,0 +1,257 @@
+"""
+Çalıştırma istatistikleri
+Canlı verim (dosya/sn, MB/sn) ve kalan süre tahmini, aşama başına (tarama, özet,
+yedekleme, EXIF yazma, döndürme, PIL kodlaması, diske yazma, doğrulama) gecikme
+histogramları ve p50/p95/p99 değerleri, kodlama profili başına süre ve boyut, bellek
+bütçesi ve tepe RSS. Süreler FileResult.timings içinde işçi süreçlerden taşınır; özet
+JSON olarak da alınabilir.
+"""
+
+import collections
+import contextlib
+import math
+import threading
+import time
+
+SCAN = 'scan'
+HASH = 'hash'
+BACKUP = 'backup'
+EXIF = 'exif'
+ROTATE = 'rotate'
+ENCODE = 'encode'
+WRITE = 'write'
+VERIFY = 'verify'
+STAGES = (SCAN, HASH, BACKUP, EXIF, ROTATE, ENCODE, WRITE, VERIFY)
+
+PERCENTILES = (50, 95, 99)
+
+# Histogram kovaları: 1 µs'den başlayıp %10 büyüyen aralıklar (göreli hata ~%5)
+MIN_SECONDS = 1e-6
+GROWTH = 1.1
+
+# Canlı verim bu kadar saniyelik pencerede hesaplanır
+RATE_WINDOW = 5.0
+
+MB = 1024 * 1024
+
+
+@contextlib.contextmanager
+def timed(timings, stage):
+    """Bloğun süresini timings[stage]'e ekle"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    if hours:
+        return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+    return f"{rest // 60:02d}:{rest % 60:02d}"
+
+
+def format_bytes(value):
+    if value is None:
+        return "?"
+    if value >= 1024 * MB:
+        return f"{value / (1024 * MB):.1f} GB"
+    return f"{value / MB:.0f} MB"
+
+
+def format_latency(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+class Histogram:
+    """Logaritmik kovalı gecikme histogramı; bellek kullanımı örnek sayısından bağımsız"""
+
+    def __init__(self):
+        self.buckets = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        index = int(math.log(max(seconds, MIN_SECONDS) / MIN_SECONDS, GROWTH))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Kovanın geometrik ortası, gözlenen en büyük değeri aşmaz
+                return min(MIN_SECONDS * GROWTH ** (index + 0.5), self.max)
+        return self.max
+
+    def to_dict(self):
+        data = {'count': self.count, 'total': self.total, 'mean': self.total / self.count if self.count else None}
+        for p in PERCENTILES:
+            data[f'p{p}'] = self.percentile(p)
+        data['max'] = self.max
+        return data
+
+
+class RunStats:
+    """Bir çalıştırmanın verim ve aşama süreleri; iş parçacığı güvenli"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.finished = None
+        self.total = None
+        self.files = 0
+        self.skipped = 0
+        self.errors = 0
+        self.bytes = 0
+        self.stages = {stage: Histogram() for stage in STAGES}
+        # Kodlama profili -> {'files', 'seconds', 'bytes_in', 'bytes_out'}
+        self.encodes = {}
+        # Bellek bütçesi ve tepe RSS (bayt); çalıştırma bitince hat tarafından doldurulur
+        self.memory = None
+        # (zaman, dosya, bayt) örnekleri; canlı verim penceresi
+        self._samples = collections.deque()
+        self._lock = threading.Lock()
+
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.stages[stage].add(seconds)
+
+    def add(self, result):
+        """Tamamlanan dosyanın boyutunu ve aşama sürelerini ekle"""
+        now = time.monotonic()
+        with self._lock:
+            self.files += 1
+            if result.skipped:
+                self.skipped += 1
+            elif not result.ok:
+                self.errors += 1
+            self.bytes += result.size or 0
+            for stage, seconds in result.timings.items():
+                self.stages[stage].add(seconds)
+            if result.encode:
+                encode = self.encodes.setdefault(result.encode['profile'],
+                                                 {'files': 0, 'seconds': 0.0, 'bytes_in': 0, 'bytes_out': 0})
+                encode['files'] += 1
+                encode['seconds'] += result.encode['seconds']
+                encode['bytes_in'] += result.size or 0
+                encode['bytes_out'] += result.encode['bytes']
+            self._samples.append((now, self.files, self.bytes))
+            while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW:
+                self._samples.popleft()
+
+    def set_memory(self, memory):
+        with self._lock:
+            self.memory = memory
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def rates(self):
+        """(dosya/sn, MB/sn): çalışırken son pencere, bitince tüm çalıştırma"""
+        with self._lock:
+            if self.finished is None and len(self._samples) >= 2:
+                (t0, f0, b0), (t1, f1, b1) = self._samples[0], self._samples[-1]
+                span = max(time.monotonic(), t1) - t0
+            else:
+                f0 = b0 = 0
+                f1, b1 = self.files, self.bytes
+                span = self.elapsed
+        if span <= 0:
+            return 0.0, 0.0
+        return (f1 - f0) / span, (b1 - b0) / MB / span
+
+    def eta(self):
+        """Kalan süre tahmini (saniye); toplam henüz bilinmiyorsa None"""
+        files_per_second, _ = self.rates()
+        if self.total is None or not files_per_second:
+            return None
+        return max(self.total - self.files, 0) / files_per_second
+
+    def format_live(self):
+        files_per_second, mb_per_second = self.rates()
+        done = f"{self.files}/{self.total}" if self.total is not None else f"{self.files}"
+        return (f"{done} dosya · {files_per_second:.1f} dosya/sn · {mb_per_second:.1f} MB/sn"
+                f" · kalan {format_duration(self.eta())}")
+
+    def format_stages(self):
+        """Aşama başına gecikme satırları (örneği olmayan aşamalar atlanır)"""
+        lines = []
+        for stage in STAGES:
+            histogram = self.stages[stage]
+            if not histogram.count:
+                continue
+            percentiles = "  ".join(f"p{p} {format_latency(histogram.percentile(p))}" for p in PERCENTILES)
+            lines.append(f"{stage:<7} n={histogram.count:<7} {percentiles}  max {format_latency(histogram.max)}"
+                         f"  toplam {histogram.total:.2f}s")
+        return lines
+
+    def format_encodes(self):
+        """Kodlama profili başına süre ve giriş/çıkış boyutu satırları"""
+        lines = []
+        with self._lock:
+            encodes = sorted(self.encodes.items())
+        for profile, encode in encodes:
+            ratio = encode['bytes_out'] / encode['bytes_in'] if encode['bytes_in'] else 0.0
+            lines.append(f"{profile:<7} n={encode['files']:<7} kodlama {encode['seconds']:.2f}s"
+                         f" (ort {format_latency(encode['seconds'] / encode['files'])})"
+                         f"  {encode['bytes_in'] / MB:.1f} MB → {encode['bytes_out'] / MB:.1f} MB (×{ratio:.2f})")
+        return lines
+
+    def format_memory(self):
+        """Tepe bellek satırı; bilgi yoksa None"""
+        with self._lock:
+            memory = self.memory
+        if not memory:
+            return None
+        line = f"tepe RSS {format_bytes(memory['rss'])}"
+        if memory.get('worker_rss'):
+            line += f", en büyük işçi {format_bytes(memory['worker_rss'])}"
+        if memory['limit']:
+            line += (f"; tahmini çözme tepesi {format_bytes(memory['peak'])}"
+                     f" / bütçe {format_bytes(memory['limit'])}")
+            if memory['serialized']:
+                line += f", tek başına işlenen {memory['serialized']}"
+        return line
+
+    def to_dict(self):
+        files_per_second, mb_per_second = self.rates()
+        with self._lock:
+            return {
+                'files': self.files,
+                'total': self.total,
+                'skipped': self.skipped,
+                'errors': self.errors,
+                'bytes': self.bytes,
+                'elapsed': self.elapsed,
+                'files_per_second': files_per_second,
+                'mb_per_second': mb_per_second,
+                'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()
+                           if histogram.count},
+                'encodes': {profile: dict(encode) for profile, encode in self.encodes.items()},
+                'memory': self.memory,
+            }
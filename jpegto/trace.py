@@ -0,0 +1,194 @@
+"""
+İsteğe bağlı iz kaydı (Chrome/Perfetto trace event biçimi)
+Arka uç çağrılarının (exiftool sorgusu, yedek kopyası, EXIF yazma yolları, döndürme
+yolları, atomik yazmalar) etrafına açılan aralıklar kaydedilir; hangi geri dönüş
+yolunun çalıştığı ve sürenin nereye gittiği chrome://tracing veya ui.perfetto.dev
+ile görülebilir. Kayıt kapalıyken span() paylaşılan boş bir nesne döndürür.
+
+İşçi süreçler olaylarını `<iz>.<pid>.part` dosyalarına yazar; ana süreç kaydederken
+bunları birleştirir. Zaman damgaları tüm süreçlerde ortak olan monotonik saatten
+alınır. Ayrıca işçi süreçler ve iş parçacıkları için cProfile kaydı da alınabilir.
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+
+PART_SUFFIX = '.part'
+
+# Python 3.12+ cProfile sys.monitoring ile çalışır: süreçte aynı anda tek profil etkin
+# olabilir (ikincisi ValueError) ve o profil tüm iş parçacıklarını kaydeder
+SHARED_PROFILE = sys.version_info >= (3, 12)
+
+
+def _now_us():
+    return time.monotonic_ns() // 1000
+
+
+class _NullSpan:
+    """Kayıt kapalıyken kullanılan, hiçbir şey yapmayan aralık"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Bir süre aralığı; set() ile sonuç bilgisi (ör. seçilen arka uç) eklenebilir"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args['error'] = str(exc) or exc_type.__name__
+        self.tracer.add({
+            'name': self.name, 'cat': self.category, 'ph': 'X', 'ts': self.start,
+            'dur': _now_us() - self.start, 'pid': self.tracer.pid, 'tid': threading.get_ident(),
+            'args': self.args,
+        })
+        return False
+
+
+class Tracer:
+    """Bir süreçteki aralıkları toplayan kaydedici; iş parçacığı güvenli"""
+
+    def __init__(self, path, process_name='jpegto'):
+        self.path = path
+        self.pid = os.getpid()
+        self.process_name = process_name
+        self.events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def span(self, name, args):
+        return Span(self, name, name.split('.', 1)[0], args)
+
+    def add(self, event):
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(event['tid'], thread.name)
+
+    def _metadata(self):
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                   'args': {'name': f"{self.process_name} ({self.pid})"}}]
+        for tid, name in self._threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}})
+        return events
+
+    def save_part(self):
+        """İşçi süreç: olayları ana sürecin birleştireceği parça dosyasına yaz"""
+        with self._lock:
+            events = self._metadata() + self.events
+        with open(f"{self.path}.{self.pid}{PART_SUFFIX}", 'w', encoding='utf-8') as f:
+            json.dump(events, f, ensure_ascii=False)
+
+    def save(self):
+        """İşçilerin parçalarıyla birleştirip iz dosyasını yaz; olay sayısını döndür"""
+        with self._lock:
+            events = self._metadata() + self.events
+        for part in glob.glob(glob.escape(self.path) + '.*' + PART_SUFFIX):
+            try:
+                with open(part, encoding='utf-8') as f:
+                    events.extend(json.load(f))
+                os.unlink(part)
+            except (OSError, ValueError):
+                pass
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return sum(1 for event in events if event['ph'] != 'M')
+
+
+_tracer = None
+
+
+def enable(path, process_name='jpegto'):
+    """Bu süreçte iz kaydını başlat"""
+    global _tracer
+    _tracer = Tracer(path, process_name)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def current():
+    return _tracer
+
+
+def span(name, **args):
+    """`with span('exif.exiftool', path=...) as s:` — kayıt kapalıysa maliyetsiz"""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, args)
+
+
+class Profiler:
+    """İş parçacığı başına cProfile; her iş parçacığı kendi .prof dosyasını üretir
+
+    Python 3.12+ üzerinde süreç başına tek profil açılır (`<pid>-all.prof`). Profil
+    başlatılamazsa (başka bir profil aracı etkin) uyarı verilir, işlem sürer.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Çağıran iş parçacığında profillemeyi başlat (havuz başlatıcısından çağrılır)"""
+        import cProfile
+
+        with self._lock:
+            if SHARED_PROFILE and self._profiles:
+                # Süreçteki tek profil bu iş parçacığını da kaydediyor
+                return
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                warnings.warn(f"cProfile başlatılamadı, profil kaydı alınmayacak: {e}", RuntimeWarning)
+                return
+            self._profiles.append(('all' if SHARED_PROFILE else threading.current_thread().name, profile))
+
+    def save(self):
+        """Profilleri `<klasör>/<pid>-<iş parçacığı>.prof` dosyalarına yaz; yolları döndür"""
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        for thread_name, profile in profiles:
+            path = os.path.join(self.directory, f"{os.getpid()}-{thread_name}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
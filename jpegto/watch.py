@@ -0,0 +1,462 @@
+"""
+Klasör izleme servisi
+Yapılandırılan kök klasörler sürekli izlenir; yeni gelen veya değişen JPEG'ler yazılması
+bittiğinde hattan geçirilir. Linux'ta inotify (ctypes ile, ek bağımlılık yok) kullanılır:
+dosya IN_CLOSE_WRITE veya IN_MOVED_TO ile tamamlanmış sayılır, ardından kısa bir
+sessizlik süresi (debounce) beklenir. Boşta beklerken süreç çekirdekte uyur, CPU harcamaz.
+inotify yoksa (macOS, Windows, ağ dosya sistemleri) belirli aralıklarla stat() ile
+taranır; iki taramada boyutu ve zamanı değişmeyen dosya tamamlanmış sayılır.
+
+Nokta ile başlayan dosyalar izlenmez: eşitleme araçları (rsync vb.) önce böyle bir
+geçici ada yazıp sonra asıl ada taşır. Hazır olduğunda artık var olmayan yollar
+sessizce bırakılır.
+
+Yazılan dosyanın son (boyut, mtime) bilgisi tutulur; jpegto'nun kendi yazmasının
+ürettiği olaylar bu sayede yeniden işlenmez. Bilgi o yolun bir sonraki olayıyla
+karşılaştırılınca silinir ve en fazla WRITTEN_LIMIT yol tutulur. Manifesto verilirse
+servis yeniden başlatıldığında zaten işlenmiş dosyalar atlanır.
+"""
+
+import collections
+import concurrent.futures
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from .core import FileResult, Processor, iter_jpeg_paths
+from .memory import MemoryBudget, default_budget, estimate_file
+from .parallel import AUTO, ParallelExecutor, _transform_in_worker
+from .planner import NONE
+from .scanner import is_candidate, iter_jpegs
+
+# Yazması biten dosyada bu kadar saniye yeni olay gelmezse işlenir
+DEBOUNCE = 0.25
+
+# Yazılmakta olan (kapanış olayı gelmemiş) dosya bu kadar sessiz kalırsa yine de işlenir
+WRITE_TIMEOUT = 30.0
+
+# inotify kullanılamadığında tarama aralığı (saniye)
+POLL_INTERVAL = 2.0
+
+# Kendi yazmamızı tanımak için tutulan en fazla yol (en eskisi önce atılır)
+WRITTEN_LIMIT = 4096
+
+# inotify olay maskeleri (bkz. inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+
+# İzleyici olayları
+CHANGED = 'changed'   # yazılıyor; kapanış bekleniyor
+READY = 'ready'       # yazma bitti (close_write, moved_to veya kararlı stat)
+RESCAN = 'rescan'     # olay kuyruğu taştı; kökler yeniden taranmalı
+
+
+def is_hidden(path):
+    """Nokta ile başlayan (gizli veya yazılmakta olan geçici) dosya mı?"""
+    return os.path.basename(path).startswith('.')
+
+
+def iter_visible(roots, sniff=False):
+    """Köklerdeki gizli olmayan JPEG'ler"""
+    return (path for path in iter_jpeg_paths(roots, sniff=sniff) if not is_hidden(path))
+
+INOTIFY = 'inotify'
+POLLING = 'polling'
+
+
+def _libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """Kökleri ve alt klasörlerini inotify ile izleyen izleyici (yalnızca Linux)"""
+
+    method = INOTIFY
+
+    def __init__(self, roots, sniff=False):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.sniff = sniff
+        self._libc = _libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify kullanılamıyor")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+        # İzleme tanımlayıcısı -> klasör
+        self._directories = {}
+        # wake() ile select() beklemesini kesen boru
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        for root in self.roots:
+            self._watch_tree(root)
+
+    def _watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            # İzin yok veya klasör bu arada silindi; max_user_watches dolmuş olabilir
+            return False
+        self._directories[wd] = directory
+        return True
+
+    def _watch_tree(self, root):
+        """Klasörü ve alt klasörlerini izlemeye al; içlerindeki aday dosyaları döndür"""
+        found = []
+        for directory, subdirectories, files in os.walk(root):
+            # Gizli klasörler (ör. .git) izlenmez
+            subdirectories[:] = [name for name in subdirectories if not name.startswith('.')]
+            if not self._watch(directory):
+                subdirectories[:] = []
+                continue
+            for name in files:
+                path = os.path.join(directory, name)
+                if not name.startswith('.') and is_candidate(name, path, self.sniff):
+                    found.append(path)
+        return found
+
+    def wake(self):
+        try:
+            os.write(self._wake_write, b'\0')
+        except OSError:
+            pass
+
+    def read(self, timeout=None):
+        """Olay gelene, wake() çağrılana veya zaman aşımına kadar bekle; (tür, yol) listesi döndür"""
+        readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            try:
+                os.read(self._wake_read, 4096)
+            except BlockingIOError:
+                pass
+        if self._fd not in readable:
+            return []
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((RESCAN, None))
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith('.'):
+                    # Yeni klasör: izlenmeye başlanmadan önce içine yazılmış dosyalar da bulunur.
+                    # Taşınarak gelen klasörün dosyaları tamdır; yeni oluşturulanınkiler yazılıyor olabilir.
+                    kind = READY if mask & IN_MOVED_TO else CHANGED
+                    events.extend((kind, found) for found in self._watch_tree(path))
+                continue
+            if name.startswith('.'):
+                # Geçici adlar yok sayılır; asıl ada taşınınca IN_MOVED_TO gelir
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                if is_candidate(name, path, self.sniff):
+                    events.append((READY, path))
+            elif is_candidate(name, path, False):
+                # Yazılmakta olan dosyanın imzası okunmaz; uzantısızlar kapanışta tanınır
+                events.append((CHANGED, path))
+        return events
+
+    def close(self):
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class PollingWatcher:
+    """stat() ile periyodik tarayan yedek izleyici; iki taramada değişmeyen dosya hazırdır"""
+
+    method = POLLING
+
+    def __init__(self, roots, sniff=False, interval=POLL_INTERVAL):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.sniff = sniff
+        self.interval = interval
+        self._wake = threading.Event()
+        # Yol -> (boyut, mtime); başlangıçta var olan dosyalar değişmedikçe olay üretmez
+        self._known = self._snapshot()
+        # Değişti ama henüz kararlı değil: yol -> (boyut, mtime)
+        self._changing = {}
+        self._next = time.monotonic() + interval
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in iter_jpegs(self.roots, sniff=self.sniff):
+            if is_hidden(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wake(self):
+        self._wake.set()
+
+    def read(self, timeout=None):
+        wait = self._next - time.monotonic()
+        if timeout is not None:
+            wait = min(wait, timeout)
+        if wait > 0 and self._wake.wait(wait):
+            self._wake.clear()
+            return []
+        if time.monotonic() < self._next:
+            return []
+        self._next = time.monotonic() + self.interval
+
+        events = []
+        current = self._snapshot()
+        for path, signature in current.items():
+            if self._known.get(path) == signature:
+                continue
+            if self._changing.get(path) == signature:
+                # Bir tarama aralığı boyunca değişmedi: yazma bitmiş sayılır
+                del self._changing[path]
+                self._known[path] = signature
+                events.append((READY, path))
+            else:
+                self._changing[path] = signature
+                events.append((CHANGED, path))
+        for path in list(self._known):
+            if path not in current:
+                del self._known[path]
+        return events
+
+    def remember(self, path, signature):
+        """İşleyicinin yazdığı dosyanın son durumu; bir sonraki taramada değişiklik sayılmaz"""
+        self._known[path] = signature
+        self._changing.pop(path, None)
+
+    def close(self):
+        pass
+
+
+def open_watcher(roots, sniff=False, poll_interval=None):
+    """inotify kullanılabiliyorsa onu, değilse (veya poll_interval verildiyse) yoklamayı aç"""
+    if poll_interval is None:
+        try:
+            return InotifyWatcher(roots, sniff)
+        except OSError:
+            pass
+    return PollingWatcher(roots, sniff, poll_interval or POLL_INTERVAL)
+
+
+class Debouncer:
+    """Olayları yol başına birleştirir; yazması bitip sessiz kalan yolları hazır verir"""
+
+    def __init__(self, delay=DEBOUNCE, write_timeout=WRITE_TIMEOUT):
+        self.delay = delay
+        self.write_timeout = write_timeout
+        # Yol -> (hazır mı, son olay zamanı); ekleme sırası korunur
+        self._pending = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, kind, path, now=None):
+        now = time.monotonic() if now is None else now
+        ready = kind == READY
+        self._pending[path] = (ready, now)
+        self._pending.move_to_end(path)
+
+    def due(self, now=None):
+        """Süresi dolan yolları çıkarıp döndür"""
+        now = time.monotonic() if now is None else now
+        due = [path for path, (ready, last) in self._pending.items()
+               if now - last >= (self.delay if ready else self.write_timeout)]
+        for path in due:
+            del self._pending[path]
+        return due
+
+    def timeout(self, now=None):
+        """Bir sonraki yolun hazır olmasına kalan süre; bekleyen yoksa None (süresiz bekle)"""
+        if not self._pending:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(last + (self.delay if ready else self.write_timeout) - now
+                            for ready, last in self._pending.values()))
+
+
+class WatchDaemon:
+    """Kökleri izleyip gelen dosyaları işleyen uzun ömürlü servis"""
+
+    def __init__(self, spec, roots, workers=None, mode=AUTO, sniff=False, verify=True, manifest=None,
+                 debounce=DEBOUNCE, poll_interval=None, initial_scan=True, memory_budget=None):
+        self.spec = spec
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.executor = ParallelExecutor(spec, workers=workers, mode=mode)
+        self.sniff = sniff
+        self.verify = verify
+        self.manifest = manifest
+        self.debouncer = Debouncer(debounce)
+        self.poll_interval = poll_interval
+        self.initial_scan = initial_scan
+        # Bayt; None fiziksel belleğin yarısı, 0 sınırsız (bkz. memory.py)
+        limit = default_budget() if memory_budget is None else memory_budget
+        self.budget = MemoryBudget(limit) if limit else None
+        self.watcher = None
+        self._stop = threading.Event()
+        # Yol -> jpegto'nun yazmasından sonraki (boyut, mtime); kendi olaylarımız yok sayılır
+        self._written = collections.OrderedDict()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def stop(self):
+        """Servisi durdur; işlenmekte olan dosyalar tamamlanır"""
+        self._stop.set()
+        if self.watcher:
+            self.watcher.wake()
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def run(self, on_ready=None, on_result=None, on_watching=None):
+        """stop() çağrılana kadar izle ve işle
+
+        on_watching(yöntem) izleme başlayınca, on_ready(yol) dosya kuyruğa alınınca,
+        on_result(sonuç, gecikme) dosya bittiğinde çağrılır; gecikme dosyanın hazır
+        olmasından sonucun yazılmasına kadar geçen saniyedir.
+        """
+        self._stop.clear()
+        operation = self.spec.operation
+        pool, shared = self.executor.create_pool()
+        local = shared or Processor(self.spec)
+        task = shared.transform if shared else _transform_in_worker
+        handlers = concurrent.futures.ThreadPoolExecutor(max_workers=self.executor.workers,
+                                                         thread_name_prefix='jpegto-watch')
+
+        def process(path):
+            if self.manifest and self.manifest.is_current(path, operation):
+                return FileResult.skipped_result(path)
+            result = local.prepare(path)
+            if not result.error:
+                cost = estimate_file(self.spec, path) if self.budget else 0
+                if self.budget and not self.budget.acquire(cost, self._stop):
+                    result.error = "servis durduruldu"
+                    return result
+                try:
+                    result = pool.submit(task, result).result()
+                except Exception as e:
+                    # İşçi süreç çöktüyse dosya hatalı sayılır
+                    result.error = str(e) or e.__class__.__name__
+                finally:
+                    if self.budget:
+                        self.budget.release(cost)
+            if self.verify:
+                result = local.verify(result)
+            if self.manifest and result.ok:
+                self.manifest.record(path, operation, result.source_hash)
+                self.manifest.commit()
+            return result
+
+        def handle(path, ready_at):
+            try:
+                try:
+                    result = process(path)
+                except Exception as e:
+                    result = FileResult(path)
+                    result.error = str(e) or e.__class__.__name__
+                signature = self._signature(path)
+                if signature and result.backends.get('write', NONE) != NONE:
+                    with self._lock:
+                        self._written[path] = signature
+                        self._written.move_to_end(path)
+                        while len(self._written) > WRITTEN_LIMIT:
+                            self._written.popitem(last=False)
+                if signature and isinstance(self.watcher, PollingWatcher):
+                    self.watcher.remember(path, signature)
+                if on_result:
+                    on_result(result, time.monotonic() - ready_at)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(path)
+
+        def submit(path):
+            with self._lock:
+                if path in self._in_flight:
+                    # İşlenirken yeniden yazıldı (veya kendi yazmamız): bittikten sonra yeniden bakılır
+                    self.debouncer.add(READY, path)
+                    return
+                # Kayıt bu olayla tüketilir: eşleşirse olay kendi yazmamızındır
+                written = self._written.pop(path, None)
+                signature = self._signature(path)
+                if signature is None:
+                    # Hazır olana kadar silindi veya taşındı (ör. geçici addan asıl ada)
+                    return
+                if written == signature:
+                    return
+                self._in_flight.add(path)
+            if on_ready:
+                on_ready(path)
+            handlers.submit(handle, path, time.monotonic())
+
+        try:
+            self.watcher = open_watcher(self.roots, self.sniff, self.poll_interval)
+            if on_watching:
+                on_watching(self.watcher.method)
+            if self.initial_scan:
+                # Servis kapalıyken gelen dosyalar (manifestodaki güncel dosyalar atlanır)
+                for path in iter_visible(self.roots, sniff=self.sniff):
+                    self.debouncer.add(READY, path, now=0)
+            while not self._stop.is_set():
+                for kind, path in self.watcher.read(self.debouncer.timeout()):
+                    if kind == RESCAN:
+                        for found in iter_visible(self.roots, sniff=self.sniff):
+                            self.debouncer.add(READY, found)
+                    else:
+                        self.debouncer.add(kind, path)
+                for path in self.debouncer.due():
+                    if self._stop.is_set():
+                        break
+                    submit(path)
+        finally:
+            handlers.shutdown(wait=True, cancel_futures=True)
+            pool.shutdown(wait=True, cancel_futures=True)
+            if shared:
+                shared.close()
+            if self.watcher:
+                self.watcher.close()
@@ -28,7 +28,7 @@ if [ -d ".venv" ]; then
     # Gerekli paketleri kontrol et
     if ! python -c "import PIL, piexif" 2>/dev/null; then
         echo "📦 Gerekli Python paketleri yükleniyor..."
-        pip install Pillow piexif
+        pip install -r requirements.txt
     fi
 else
     echo "⚠️  Sanal ortam bulunamadı, sistem Python kullanılacak"
@@ -36,7 +36,7 @@ else
     # Sistem Python ile gerekli paketleri kontrol et
     if ! python3 -c "import PIL, piexif" 2>/dev/null; then
         echo "❌ Gerekli Python paketleri bulunamadı!"
-        echo "💡 Lütfen şu komutu çalıştırın: pip3 install Pillow piexif"
+        echo "💡 Lütfen şu komutu çalıştırın: pip3 install -r requirements.txt"
         exit 1
     fi
 fi
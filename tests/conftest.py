@@ -0,0 +1,37 @@
+"""Testlerde kullanılan örnek JPEG üreticileri"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def gradient(width, height):
+    """Kenarları ayırt edilebilen renkli degrade (dönüşüm yönü piksellerden anlaşılır)"""
+    from PIL import Image
+
+    image = Image.new('RGB', (width, height))
+    image.putdata([(x * 255 // max(width - 1, 1), y * 255 // max(height - 1, 1), (x + y) % 256)
+                   for y in range(height) for x in range(width)])
+    return image
+
+
+@pytest.fixture
+def make_jpeg(tmp_path):
+    """make_jpeg(ad, boyut, alt örnekleme, Orientation, ek IFD0 etiketleri) -> yol"""
+    import piexif
+
+    def make(name, size=(64, 48), subsampling=2, orientation=None, tags=None):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        zeroth = dict(tags or {})
+        if orientation is not None:
+            zeroth[piexif.ImageIFD.Orientation] = orientation
+        params = {'quality': 90, 'subsampling': subsampling}
+        if zeroth:
+            params['exif'] = piexif.dump({'0th': zeroth})
+        gradient(*size).save(path, 'JPEG', **params)
+        return str(path)
+    return make
@@ -0,0 +1,73 @@
+"""Başlık denetimi: histogram, işlem listesi, --files-from ve --only-needed"""
+
+import json
+import os
+
+from jpegto.audit import audit, audit_file, read_list
+from jpegto.cli import main
+from jpegto.core import JobSpec
+from jpegto.jpegmeta import read_orientation
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def corpus(make_jpeg):
+    """İki dosya işlem gerektirir, ikisi zaten doğru"""
+    return {
+        'six': make_jpeg('photos/six.jpg', orientation=6),
+        'plain': make_jpeg('photos/plain.jpg'),
+        'one': make_jpeg('photos/one.jpg', orientation=1),
+        'three': make_jpeg('photos/three.jpg', orientation=3),
+    }
+
+
+def test_report_histogram_and_list(make_jpeg, tmp_path):
+    paths = corpus(make_jpeg)
+    (tmp_path / 'photos' / 'bad.jpg').write_bytes(b'\xff\xd8\xff' + bytes(20))
+    report = audit(JobSpec(), [str(tmp_path / 'photos')], workers=2)
+    assert report.files == 5 and len(report.errors) == 1
+    assert report.orientations == {6: 1, 3: 1, 1: 1, None: 1}
+    assert report.exif == 3
+    # Etiketsiz ve etiketi okunamayan dosyalar zaten doğru görünür
+    assert sorted(report.paths) == sorted([paths['six'], paths['three']])
+    assert any(line.startswith('Orientation   6:') for line in report.format_histogram())
+    assert json.loads(json.dumps(report.to_dict()))['needs_work'] == 2
+
+
+def test_audit_entry(make_jpeg):
+    entry = audit_file(JobSpec(), make_jpeg('a.jpg', size=(40, 24), orientation=1))
+    assert not entry.needs_work and entry.error is None
+    data = entry.to_dict()
+    assert (data['width'], data['height'], data['orientation']) == (40, 24, 1)
+
+
+def test_audit_cli_writes_nothing_but_the_list(make_jpeg, tmp_path, capsys):
+    paths = corpus(make_jpeg)
+    before = {path: (read(path), os.stat(path).st_mtime_ns) for path in paths.values()}
+    todo = str(tmp_path / 'todo.txt')
+    assert main([str(tmp_path / 'photos'), '--audit', '--audit-list', todo]) == 0
+    out, err = capsys.readouterr()
+    assert len(out.splitlines()) == 4 and "2 dosya işlem gerektiriyor" in err
+    assert sorted(read_list(todo)) == sorted([paths['six'], paths['three']])
+    assert {path: (read(path), os.stat(path).st_mtime_ns) for path in paths.values()} == before
+    assert sorted(os.listdir(tmp_path / 'photos')) == sorted(os.path.basename(path) for path in paths.values())
+
+    assert main(['--files-from', todo, '--mode', 'thread', '--no-progress', '--no-job', '--no-backup']) == 0
+    out, _ = capsys.readouterr()
+    assert sorted(json.loads(line)['path'] for line in out.splitlines()) == sorted(read_list(todo))
+    assert read_orientation(paths['six']) == read_orientation(paths['three']) == 1
+
+
+def test_only_needed_never_opens_untouched_files(make_jpeg, tmp_path, capsys):
+    paths = corpus(make_jpeg)
+    untouched = paths['one']
+    mtime = os.stat(untouched).st_mtime_ns
+    assert main([str(tmp_path / 'photos'), '--only-needed', '--mode', 'thread', '--no-progress', '--no-job']) == 0
+    out, _ = capsys.readouterr()
+    processed = {json.loads(line)['path'] for line in out.splitlines()}
+    assert untouched not in processed and paths['six'] in processed
+    assert os.stat(untouched).st_mtime_ns == mtime
+    assert not os.path.exists(untouched + '.backup')
@@ -0,0 +1,62 @@
+"""Yedekleme motoru: strateji geri dönüşü, aygıt başına hatırlama ve yedek listesi"""
+
+import errno
+import os
+
+from jpegto import backup
+from jpegto.backup import BUFFERED, BackupEngine
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_backup_is_identical_copy(make_jpeg):
+    path = make_jpeg('a.jpg')
+    engine = BackupEngine()
+    assert engine.backup(path) in dict(backup.STRATEGIES)
+    assert read(path + '.backup') == read(path)
+    # Var olan yedeğe dokunulmaz
+    assert engine.backup(path) is None
+
+
+def test_unsupported_strategy_falls_back_and_is_remembered(make_jpeg, monkeypatch):
+    attempts = []
+
+    def unsupported(src, dst, size):
+        attempts.append(size)
+        os.write(dst, b'partial')
+        raise OSError(errno.EOPNOTSUPP, "desteklenmiyor")
+
+    monkeypatch.setattr(backup, 'STRATEGIES', [('clone', unsupported), (BUFFERED, backup._buffered)])
+    engine = BackupEngine()
+    first, second = make_jpeg('a.jpg'), make_jpeg('b.jpg')
+    assert engine.backup(first) == BUFFERED
+    assert engine.backup(second) == BUFFERED
+    # Yarım kopya atılır; desteklenmeyen strateji aynı aygıtta bir daha denenmez
+    assert read(first + '.backup') == read(first)
+    assert len(attempts) == 1
+    assert engine.counts == {BUFFERED: 2}
+
+
+def test_deleted_backup_is_recreated(make_jpeg):
+    path = make_jpeg('a.jpg')
+    engine = BackupEngine()
+    assert engine.backup(path)
+    # Uzun ömürlü süreçte kullanıcı yedeği siler, dosya yeniden değişir
+    os.unlink(path + '.backup')
+    assert engine.backup(path)
+    assert os.path.exists(path + '.backup')
+
+
+def test_backup_created_elsewhere_is_not_overwritten(make_jpeg):
+    path = make_jpeg('a.jpg')
+    engine = BackupEngine()
+    assert not engine.exists(path + '.backup')
+    with open(path + '.backup', 'wb') as f:
+        f.write(b'older')
+    # Liste eski olsa da yayımlama var olan yedeğin üzerine yazmaz
+    assert engine.backup(path) is None
+    assert read(path + '.backup') == b'older'
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.startswith('.jpegto-')]
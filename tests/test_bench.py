@@ -0,0 +1,61 @@
+"""Ölçüm düzeneği: belirlenimci külliyat, ölçüm çalıştırması ve gerileme karşılaştırması"""
+
+import os
+
+from PIL import Image
+
+from jpegto import bench
+from jpegto.jpegmeta import read_orientation
+
+TINY = (0.05,)
+
+
+def test_corpus_covers_every_variant(tmp_path):
+    manifest = bench.generate_corpus(str(tmp_path), TINY, log=lambda message: None)
+    cases = manifest['cases']
+    assert len(cases) == len(bench.SUBSAMPLING) * 2 * len(bench.EXIF_KINDS)
+    assert {case['orientation'] for case in cases} - {None} == set(bench.ORIENTATIONS)
+    for case in cases:
+        path = str(tmp_path / case['name'])
+        assert read_orientation(path) == case['orientation']
+        with Image.open(path) as image:
+            assert image.size == (case['width'], case['height'])
+            assert bool(image.info.get('progressive')) == case['progressive']
+    assert bench.load_corpus(str(tmp_path)) == manifest
+
+
+def test_corpus_is_deterministic(tmp_path):
+    first = bench.generate_corpus(str(tmp_path / 'a'), TINY, log=lambda message: None)
+    second = bench.generate_corpus(str(tmp_path / 'b'), TINY, log=lambda message: None)
+    assert [case['hash'] for case in first['cases']] == [case['hash'] for case in second['cases']]
+    # Var olan dosyalar yeniden üretilmez
+    logged = []
+    bench.generate_corpus(str(tmp_path / 'a'), TINY, log=logged.append)
+    assert logged == []
+
+
+def test_run_measures_in_fresh_process(tmp_path):
+    corpus = str(tmp_path / 'corpus')
+    bench.generate_corpus(corpus, TINY, log=lambda message: None)
+    result = bench.run_benchmarks(corpus, paths=(bench.PATCH,), repeat=1, log=lambda message: None)
+    summary = result['results'][bench.PATCH]['0.05']
+    # Yerinde yama yalnızca Orientation etiketi olan dosyalara uygulanır
+    assert summary['files'] == sum(1 for case in bench.corpus_cases(TINY) if case['orientation'])
+    assert summary['median'] > 0
+    assert sorted(os.listdir(corpus)) == sorted([bench.CORPUS_MANIFEST] +
+                                                [case['name'] for case in bench.corpus_cases(TINY)])
+
+
+def test_compare_flags_regressions():
+    def baseline(median, rss):
+        return {'results': {bench.PATCH: {'2': {'files': 10, 'median': median, 'peak_rss_mb': rss}}}}
+
+    old = baseline(0.010, 50.0)
+    assert bench.compare(old, baseline(0.0105, 52.0))[1] == []
+    assert bench.compare(old, baseline(0.012, 50.0))[1] == [(bench.PATCH, '2')]
+    assert bench.compare(old, baseline(0.010, 60.0))[1] == [(bench.PATCH, '2')]
+    assert bench.compare(old, baseline(0.012, 50.0), threshold=0.5)[1] == []
+
+
+def test_unknown_path_is_rejected(tmp_path):
+    assert bench.main(['run', str(tmp_path), '--paths', 'nope']) == 2
@@ -0,0 +1,93 @@
+"""Arka uç yetenekleri: bir kez yoklanır, diske yazılır, PATH veya ikili değişince yenilenir"""
+
+import json
+import os
+import sys
+
+import pytest
+
+from jpegto import capabilities, exiftool
+
+# Her çağrıyı sayan sahte exiftool (yalnızca -ver)
+FAKE_EXIFTOOL = '''#!{python}
+with open({calls!r}, 'a') as f:
+    f.write('x')
+print('12.40')
+'''
+
+
+@pytest.fixture
+def environment(tmp_path, monkeypatch):
+    """Boş önbellek klasörü, yalnızca sahte exiftool içeren PATH ve sıfırlanmış süreç önbellekleri"""
+    bin_directory = tmp_path / 'bin'
+    bin_directory.mkdir()
+    calls = tmp_path / 'calls'
+    script = bin_directory / 'exiftool'
+    script.write_text(FAKE_EXIFTOOL.format(python=sys.executable, calls=str(calls)))
+    script.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bin_directory))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setattr(capabilities.sys, 'platform', 'linux')
+    monkeypatch.setattr(capabilities, '_current', None)
+    monkeypatch.setattr(exiftool, '_version_cache', {})
+
+    def probes():
+        return len(calls.read_text()) if calls.exists() else 0
+
+    return script, probes
+
+
+def fresh_process(monkeypatch):
+    """Yeni bir açılışı taklit et: yalnızca disk önbelleği kalır"""
+    monkeypatch.setattr(capabilities, '_current', None)
+    monkeypatch.setattr(exiftool, '_version_cache', {})
+
+
+def test_probe_once_then_from_disk(environment, monkeypatch):
+    _, probes = environment
+    backends = capabilities.probe()
+    assert backends.exiftool == '12.40' and not backends.cached
+    assert backends.sips is None and backends.lossless == capabilities.LOSSLESS_ENGINE
+    assert capabilities.probe() is backends
+    assert probes() == 1
+    with open(capabilities.cache_path(), encoding='utf-8') as f:
+        assert json.load(f)['backends'] == backends.to_dict()
+
+    fresh_process(monkeypatch)
+    cached = capabilities.probe()
+    assert cached.cached and cached.to_dict() == backends.to_dict()
+    assert probes() == 1
+    # ExifToolPool.available sürümü yeniden sormaz
+    assert exiftool.probe_exiftool() == '12.40' and probes() == 1
+
+
+def test_updated_binary_is_probed_again(environment, monkeypatch):
+    script, probes = environment
+    capabilities.probe()
+    stat = os.stat(script)
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    fresh_process(monkeypatch)
+    assert not capabilities.probe().cached
+    assert probes() == 2
+
+
+def test_changed_path_is_probed_again(environment, tmp_path, monkeypatch):
+    _, probes = environment
+    capabilities.probe()
+    monkeypatch.setenv('PATH', str(tmp_path / 'empty'))
+    fresh_process(monkeypatch)
+    backends = capabilities.probe()
+    assert not backends.cached and backends.exiftool is None
+    assert probes() == 1
+
+
+def test_refresh_and_broken_cache(environment, monkeypatch):
+    _, probes = environment
+    capabilities.probe()
+    assert not capabilities.probe(refresh=True).cached
+    assert probes() == 2
+    with open(capabilities.cache_path(), 'w', encoding='utf-8') as f:
+        f.write('{bozuk')
+    fresh_process(monkeypatch)
+    assert not capabilities.probe().cached
+    assert probes() == 3
@@ -0,0 +1,56 @@
+"""Başsız çekirdek ve komut satırı: JSON satırları, yedekler ve çıkış kodları"""
+
+import json
+import os
+import subprocess
+import sys
+
+from jpegto.cli import main
+from jpegto.jpegmeta import read_orientation
+
+
+def run(capsys, *args):
+    code = main(list(args) + ['--mode', 'thread', '--no-progress', '--no-job'])
+    out, err = capsys.readouterr()
+    return code, [json.loads(line) for line in out.splitlines()], err
+
+
+def test_fixes_folder_and_reports_each_file(make_jpeg, capsys):
+    paths = [make_jpeg(f'photos/{i}.jpg', orientation=6) for i in range(3)]
+    code, lines, err = run(capsys, os.path.dirname(paths[0]))
+    assert code == 0
+    assert sorted(line['path'] for line in lines) == sorted(paths)
+    assert all(line['ok'] for line in lines)
+    assert "3 başarılı, 0 hatalı" in err
+    for path in paths:
+        assert read_orientation(path) == 1
+        assert read_orientation(path + '.backup') == 6
+
+
+def test_no_backup(make_jpeg, capsys):
+    path = make_jpeg('a.jpg', orientation=3)
+    code, _, _ = run(capsys, path, '--no-backup')
+    assert code == 0 and read_orientation(path) == 1
+    assert not os.path.exists(path + '.backup')
+
+
+def test_broken_file_is_an_error(make_jpeg, tmp_path, capsys):
+    good = make_jpeg('photos/good.jpg', orientation=6)
+    (tmp_path / 'photos' / 'bad.jpg').write_bytes(b'\xff\xd8\xff' + bytes(20))
+    code, lines, _ = run(capsys, os.path.dirname(good), '--no-backup')
+    assert code == 1
+    results = {os.path.basename(line['path']): line for line in lines}
+    assert results['good.jpg']['ok'] and not results['bad.jpg']['ok']
+    assert results['bad.jpg']['error']
+
+
+def test_exit_codes(tmp_path, capsys):
+    assert run(capsys, str(tmp_path))[0] == 1
+    assert run(capsys, str(tmp_path), '--no-fix')[0] == 2
+
+
+def test_core_does_not_import_tkinter():
+    code = "import sys, jpegto.cli, jpegto.core, jpegto.pipeline; print('tkinter' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == 'False'
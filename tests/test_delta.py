@@ -0,0 +1,35 @@
+"""Delta yedekten bayt bayt geri yükleme"""
+
+import piexif
+import pytest
+
+from jpegto.core import JobSpec, Processor
+from jpegto.delta import DeltaJournal, restore
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('orientation, tags', [
+    (6, None),                                      # etiket yerinde yamalanır
+    (None, None),                                   # EXIF yok: yeni segment eklenir
+    (None, {piexif.ImageIFD.Make: b'jpegto'}),      # IFD0 büyütülür
+])
+def test_delta_restore_is_byte_identical(make_jpeg, tmp_path, orientation, tags):
+    path = make_jpeg('photo.jpg', orientation=orientation, tags=tags)
+    original = read(path)
+    journal_path = str(tmp_path / 'run.delta')
+
+    spec = JobSpec(fix_exif=False, rotate=True, rotate_mode='virtual', backup_mode='delta')
+    with Processor(spec) as processor, DeltaJournal(journal_path) as journal:
+        processor.journal = journal
+        result = processor.process_file(path)
+    assert result.ok, result.error
+    assert result.backends['backup'] == 'delta'
+    assert read(path) != original
+
+    outcomes = list(restore(journal_path))
+    assert [(p, error) for p, error, _ in outcomes] == [(path, None)]
+    assert read(path) == original
@@ -0,0 +1,59 @@
+"""Yeniden kodlama profilleri: original özgün tabloları ve alt örneklemeyi korur"""
+
+import io
+
+import pytest
+from PIL import Image, JpegImagePlugin
+
+from jpegto.encoding import DEFAULT_QUALITY, EncodeProfile
+
+
+def reencode(path, profile):
+    with Image.open(path) as source:
+        source.load()
+        buffer = io.BytesIO()
+        source.save(buffer, 'JPEG', **profile.params(source))
+        quantization, sampling = source.quantization, JpegImagePlugin.get_sampling(source)
+    buffer.seek(0)
+    return quantization, sampling, Image.open(buffer)
+
+
+@pytest.mark.parametrize('subsampling', [0, 1, 2])
+def test_original_keeps_tables_and_sampling(make_jpeg, subsampling):
+    path = make_jpeg('a.jpg', subsampling=subsampling)
+    quantization, sampling, output = reencode(path, EncodeProfile())
+    assert sampling == subsampling
+    assert output.quantization == quantization
+    assert JpegImagePlugin.get_sampling(output) == subsampling
+    assert not output.info.get('progressive')
+
+
+def test_original_keeps_progressive(tmp_path):
+    path = str(tmp_path / 'p.jpg')
+    Image.new('RGB', (64, 48), 'blue').save(path, 'JPEG', quality=70, progressive=True)
+    _, _, output = reencode(path, EncodeProfile())
+    assert output.info.get('progressive')
+
+
+def test_explicit_quality_replaces_tables(make_jpeg):
+    path = make_jpeg('a.jpg')
+    with Image.open(path) as source:
+        params = EncodeProfile(quality=85).params(source)
+    assert params['quality'] == 85 and 'qtables' not in params
+
+
+def test_fast_and_small(make_jpeg):
+    path = make_jpeg('a.jpg')
+    with Image.open(path) as source:
+        fast = EncodeProfile('fast').params(source)
+        small = EncodeProfile('small', quality=80).params(source)
+    assert fast == {'optimize': False, 'quality': DEFAULT_QUALITY, 'progressive': False}
+    assert small == {'optimize': True, 'quality': 80, 'progressive': True}
+    assert EncodeProfile('small', quality=80).label == 'small/q80'
+
+
+def test_invalid_profile():
+    with pytest.raises(ValueError):
+        EncodeProfile('huge')
+    with pytest.raises(ValueError):
+        EncodeProfile(quality=0)
@@ -0,0 +1,63 @@
+"""Arayüz olay kuyruğu: satırların sınırlanması, ilerlemenin birleştirilmesi ve günlük dosyası"""
+
+import threading
+
+from jpegto.events import EventQueue
+
+
+def test_empty_queue_drains_to_none():
+    assert EventQueue().drain() is None
+
+
+def test_progress_is_coalesced_to_last_value():
+    queue = EventQueue()
+    queue.total(100)
+    for done in range(1, 51):
+        queue.progress(done)
+    frame = queue.drain()
+    assert (frame.total, frame.progress) == (100, 50)
+    assert frame.lines == [] and frame.dropped == 0
+    assert queue.drain() is None
+
+
+def test_old_lines_are_dropped_when_ui_falls_behind():
+    queue = EventQueue(limit=3)
+    for i in range(10):
+        queue.log(f'satır {i}')
+    frame = queue.drain()
+    assert frame.lines == ['satır 7', 'satır 8', 'satır 9']
+    assert frame.dropped == 7
+    queue.log('yeni')
+    assert queue.drain().dropped == 0
+
+
+def test_calls_keep_order_after_lines():
+    queue = EventQueue()
+    queue.log('bitti')
+    queue.call(print, 'a')
+    queue.call(len, 'bc')
+    frame = queue.drain()
+    assert frame.lines == ['bitti']
+    assert frame.calls == [(print, ('a',)), (len, ('bc',))]
+
+
+def test_log_file_keeps_every_line(tmp_path):
+    path = str(tmp_path / 'run.log')
+    queue = EventQueue(limit=2)
+    queue.open_log(path)
+
+    def worker(n):
+        for i in range(200):
+            queue.log(f'{n}:{i}')
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    frame = queue.drain()
+    queue.close_log()
+    assert len(frame.lines) == 2 and frame.dropped == 798
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert sorted(lines) == sorted(f'{n}:{i}' for n in range(4) for i in range(200))
@@ -0,0 +1,105 @@
+"""Kalıcı exiftool işçileri: -stay_open protokolü, zaman aşımı ve yeniden başlatma
+
+Protokol, -stay_open davranışını taklit eden küçük bir betikle sınanır; gerçek
+exiftool kuruluysa ayrıca onunla da denenir.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+from jpegto.exiftool import ExifToolError, ExifToolPool, ExifToolWorker
+from jpegto.jpegmeta import read_orientation
+
+FAKE_EXIFTOOL = '''#!{python}
+import sys, time
+
+if sys.argv[1:] == ['-ver']:
+    print('12.40')
+    sys.exit(0)
+args = []
+for line in sys.stdin:
+    line = line.rstrip('\\n')
+    if args[-1:] == ['-stay_open'] and line == 'False':
+        break
+    if not line.startswith('-execute'):
+        args.append(line)
+        continue
+    sentinel = args[args.index('-echo4') + 1]
+    command = args[:args.index('-echo4')]
+    args = []
+    if command == ['-ver']:
+        sys.stdout.write('12.40\\n')
+    elif command == ['-sleep']:
+        time.sleep(30)
+    elif command[0].startswith('-Orientation='):
+        sys.stdout.write('    1 image files updated\\n')
+    else:
+        sys.stderr.write('Error: unknown command\\n')
+    for stream in (sys.stdout, sys.stderr):
+        stream.write(sentinel + '\\n')
+        stream.flush()
+'''
+
+
+@pytest.fixture
+def fake_exiftool(tmp_path):
+    path = tmp_path / 'exiftool'
+    path.write_text(FAKE_EXIFTOOL.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_one_process_serves_many_commands(fake_exiftool):
+    worker = ExifToolWorker(fake_exiftool)
+    try:
+        assert worker.execute(['-ver'])[0].strip() == '12.40'
+        pid = worker.process.pid
+        for _ in range(5):
+            assert worker.ping()
+        assert worker.process.pid == pid
+    finally:
+        worker.close()
+    assert worker.process is None
+
+
+def test_pool_set_orientation_reports_errors(fake_exiftool):
+    with ExifToolPool(size=2, executable=fake_exiftool) as pool:
+        assert 'updated' in pool.set_orientation('a.jpg', 1)
+        stdout, stderr = pool.execute(['-unknown'])
+        assert 'Error' in stderr
+        with pytest.raises(ValueError):
+            pool.execute(['-Orientation=1\n-all='])
+        assert pool.health_check() == 2
+    with pytest.raises(ExifToolError):
+        pool.execute(['-ver'])
+
+
+def test_hung_worker_is_killed_and_restarted(fake_exiftool):
+    worker = ExifToolWorker(fake_exiftool)
+    try:
+        with pytest.raises(ExifToolError):
+            worker.execute(['-sleep'], timeout=0.3)
+        assert not worker.alive
+        # Sonraki komut yeni bir süreçte çalışır
+        assert worker.ping()
+    finally:
+        worker.close()
+
+
+def test_missing_executable(tmp_path):
+    missing = str(tmp_path / 'no-exiftool')
+    assert not ExifToolPool.available(missing)
+    with pytest.raises(FileNotFoundError):
+        ExifToolWorker(missing).execute(['-ver'])
+
+
+@pytest.mark.skipif(not shutil.which('exiftool'), reason="exiftool kurulu değil")
+def test_real_exiftool_sets_orientation(make_jpeg):
+    path = make_jpeg('a.jpg', orientation=6)
+    with ExifToolPool() as pool:
+        pool.set_orientation(path, 1)
+    assert read_orientation(path) == 1
+    assert not os.path.exists(path + '_original')
@@ -0,0 +1,125 @@
+"""Yarıda kalan işin günlükten sürdürülmesi"""
+
+import os
+
+from jpegto.cli import main
+from jpegto.core import JobSpec
+from jpegto.jobs import JobJournal, default_job_path
+from jpegto.jpegmeta import patch_orientation, read_orientation
+from jpegto.manifest import fast_hash
+from jpegto.pipeline import Pipeline
+
+FILES = 24
+
+
+def make_tree(make_jpeg):
+    paths = [make_jpeg(f'photos/{i:02d}.jpg', size=(32, 32), orientation=6) for i in range(FILES)]
+    return os.path.dirname(paths[0]), paths
+
+
+def interrupt(root, after):
+    """İşi başlat ve after dosya bittikten sonra durdur (çökme yerine günlük kapatılır)"""
+    spec = JobSpec(backup=False)
+    job = JobJournal.create(default_job_path(root), spec, [root])
+    pipeline = Pipeline(spec, workers=1, mode='thread')
+    finished = []
+
+    def on_result(i, result):
+        finished.append(result.path)
+        if len(finished) >= after:
+            pipeline.stop()
+
+    pipeline.run([root], on_result=on_result, job=job)
+    assert not pipeline.completed
+    job.close()
+    return finished
+
+
+def test_resume_after_interruption(make_jpeg, capsys):
+    root, paths = make_tree(make_jpeg)
+    done = interrupt(root, after=5)
+    assert 5 <= len(done) < FILES
+    assert os.path.exists(default_job_path(root))
+
+    assert main([root, '--resume', '--no-progress']) == 0
+    err = capsys.readouterr().err
+    assert f"{len(done)} dosya daha önce tamamlanmış" in err
+    assert all(read_orientation(path) == 1 for path in paths)
+    # Kesintisiz biten işin günlüğü silinir
+    assert not os.path.exists(default_job_path(root))
+
+
+def test_resume_counts_written_but_unrecorded_file(make_jpeg):
+    root, paths = make_tree(make_jpeg)
+    spec = JobSpec(backup=False)
+    job = JobJournal.create(default_job_path(root), spec, [root])
+    for path in paths:
+        job.register(path)
+    job.finish_scan(len(paths))
+    # Niyet kaydedildi, dosya yazıldı, tamamlanma kaydından önce çöktü
+    job.intent(paths[0], fast_hash(paths[0]))
+    job.sync()
+    patch_orientation(paths[0], 1)
+    job.close()
+
+    resumed = JobJournal.resume(default_job_path(root))
+    assert resumed.recover(paths[0])
+    assert resumed.is_complete(paths[0])
+    resumed.close()
+
+
+def test_resume_reprocesses_torn_write(make_jpeg):
+    root, paths = make_tree(make_jpeg)
+    spec = JobSpec(backup=False)
+    job = JobJournal.create(default_job_path(root), spec, [root])
+    for path in paths:
+        job.register(path)
+    job.intent(paths[0], fast_hash(paths[0]))
+    job.sync()
+    job.close()
+    # Yeniden adlandırma kalıcı oldu ama veri diske ulaşmadı
+    with open(paths[0], 'r+b') as f:
+        f.truncate(0)
+
+    resumed = JobJournal.resume(default_job_path(root))
+    assert not resumed.recover(paths[0])
+    assert not resumed.is_complete(paths[0])
+    resumed.close()
+
+
+def test_resume_reprocesses_file_with_missing_data(make_jpeg):
+    root, paths = make_tree(make_jpeg)
+    spec = JobSpec(backup=False)
+    job = JobJournal.create(default_job_path(root), spec, [root])
+    for path in paths:
+        job.register(path)
+    job.intent(paths[0], fast_hash(paths[0]))
+    job.sync()
+    job.close()
+    # Başlık sağlam, entropi kodlu verinin sonu eksik
+    size = os.path.getsize(paths[0])
+    with open(paths[0], 'r+b') as f:
+        f.truncate(size // 2)
+
+    resumed = JobJournal.resume(default_job_path(root))
+    assert not resumed.recover(paths[0])
+    resumed.close()
+
+
+def test_job_fsyncs_every_written_file(make_jpeg, monkeypatch):
+    root, paths = make_tree(make_jpeg)
+    synced = []
+    fsync = os.fsync
+
+    def counting_fsync(fd):
+        synced.append(fd)
+        fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', counting_fsync)
+    spec = JobSpec(backup=False)
+    job = JobJournal.create(default_job_path(root), spec, [root])
+    Pipeline(spec, workers=2, mode='thread').run([root], job=job)
+    job.close()
+    # Dosya başına en az bir fsync, üstüne klasör ve günlük fsync'leri
+    assert len(synced) > FILES
+    assert not spec.durable
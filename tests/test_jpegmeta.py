@@ -0,0 +1,91 @@
+"""Yerinde Orientation yamalayıcı: yalnızca değer baytları değişir"""
+
+import io
+import struct
+
+import piexif
+import pytest
+from PIL import Image
+
+from jpegto.jpegmeta import (
+    JPEGFormatError, find_orientation, patch_orientation, patch_orientation_bytes, read_header, read_orientation,
+)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def changed_offsets(before, after):
+    assert len(before) == len(after)
+    return [i for i, (a, b) in enumerate(zip(before, after)) if a != b]
+
+
+@pytest.fixture
+def little_endian_jpeg(tmp_path):
+    """Elle kurulan 'II' (küçük sonlu) TIFF; piexif 'MM' yazar"""
+    path = tmp_path / 'le.jpg'
+    ifd = struct.pack('<H', 1) + struct.pack('<HHIHH', 0x0112, 3, 1, 8, 0) + struct.pack('<I', 0)
+    exif = b'Exif\x00\x00II*\x00' + struct.pack('<I', 8) + ifd
+    Image.new('RGB', (32, 16), 'red').save(path, 'JPEG', exif=exif)
+    return str(path)
+
+
+def test_patch_big_endian_changes_only_value(make_jpeg):
+    path = make_jpeg('be.jpg', orientation=6, tags={piexif.ImageIFD.Make: b'Camera'})
+    before = read(path)
+    entry = find_orientation(path)
+    assert entry.byteorder == '>' and entry.value == 6
+
+    assert patch_orientation(path, 1)
+    assert read_orientation(path) == 1
+    offsets = changed_offsets(before, read(path))
+    assert offsets and all(entry.value_offset <= i < entry.value_offset + 2 for i in offsets)
+
+
+def test_patch_little_endian(little_endian_jpeg):
+    before = read(little_endian_jpeg)
+    assert find_orientation(little_endian_jpeg).byteorder == '<'
+    assert patch_orientation(little_endian_jpeg, 3)
+    assert read_orientation(little_endian_jpeg) == 3
+    assert len(changed_offsets(before, read(little_endian_jpeg))) == 1
+
+
+def test_missing_tag_is_left_to_caller(make_jpeg):
+    for path in (make_jpeg('plain.jpg'), make_jpeg('tags.jpg', tags={piexif.ImageIFD.Make: b'Camera'})):
+        before = read(path)
+        assert read_orientation(path) is None
+        assert not patch_orientation(path, 1)
+        assert read(path) == before
+
+
+def test_same_value_is_not_written(make_jpeg):
+    path = make_jpeg('one.jpg', orientation=1)
+    before = read(path)
+    assert patch_orientation(path, 1, durable=True)
+    assert read(path) == before
+
+
+def test_patch_in_memory_matches_file(make_jpeg):
+    path = make_jpeg('be.jpg', orientation=6)
+    buffer = bytearray(read(path))
+    assert patch_orientation_bytes(buffer, 8)
+    patch_orientation(path, 8)
+    assert bytes(buffer) == read(path)
+    assert not patch_orientation_bytes(bytearray(read(make_jpeg('plain.jpg'))), 1)
+
+
+def test_read_header(make_jpeg):
+    info = read_header(make_jpeg('h.jpg', size=(40, 24), orientation=5))
+    assert (info.width, info.height, info.components) == (40, 24, 3)
+    assert info.exif and info.orientation == 5 and not info.progressive
+
+
+def test_not_a_jpeg(tmp_path):
+    path = tmp_path / 'x.jpg'
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8)).save(buffer, 'PNG')
+    path.write_bytes(buffer.getvalue())
+    with pytest.raises(JPEGFormatError):
+        read_orientation(str(path))
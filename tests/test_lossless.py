@@ -0,0 +1,124 @@
+"""Kayıpsız DCT dönüşümleri: boyutlar, pikseller ve kenar politikası"""
+
+import io
+import shutil
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from jpegto import capabilities, core
+from jpegto.core import PIL_TRANSPOSE, JobSpec, Processor
+from jpegto.lossless import (
+    PERFECT, TRANSFORMS, TRIM, NotPerfectError, TooLargeError, transform_jpeg, transform_jpeg_jpegtran,
+)
+
+ALL_TRANSFORMS = sorted(TRANSFORMS)
+
+
+def expected_size(size, transform):
+    width, height = size
+    return (height, width) if TRANSFORMS[transform][0] else (width, height)
+
+
+def difference(a, b):
+    return max(ImageStat.Stat(ImageChops.difference(a, b)).mean)
+
+
+def decode(data):
+    with Image.open(io.BytesIO(data)) as image:
+        return image.convert('RGB')
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('subsampling, mcu', [(0, 8), (2, 16)])
+@pytest.mark.parametrize('transform', ALL_TRANSFORMS)
+def test_aligned_transform_matches_pil(make_jpeg, transform, subsampling, mcu):
+    size = (mcu * 4, mcu * 3)
+    data = read(make_jpeg('aligned.jpg', size, subsampling))
+    output = transform_jpeg(data, transform)
+
+    result = decode(output)
+    assert result.size == expected_size(size, transform)
+    reference = decode(data).transpose(getattr(Image.Transpose, PIL_TRANSPOSE[transform]))
+    # Katsayılar yalnızca yer değiştirir; fark kroma ölçekleme yuvarlamasıyla sınırlı kalır
+    assert difference(result, reference) < 2
+
+
+@pytest.mark.parametrize('transform', ALL_TRANSFORMS)
+def test_unaligned_perfect_never_crops(make_jpeg, transform):
+    size = (100, 75)
+    data = read(make_jpeg('odd.jpg', size, subsampling=2))
+    try:
+        output = transform_jpeg(data, transform, trim=PERFECT)
+    except NotPerfectError:
+        return
+    assert decode(output).size == expected_size(size, transform)
+
+
+@pytest.mark.parametrize('transform', ALL_TRANSFORMS)
+def test_unaligned_trim_drops_only_partial_mcus(make_jpeg, transform):
+    size = (100, 75)
+    data = read(make_jpeg('odd.jpg', size, subsampling=2))
+    width, height = decode(transform_jpeg(data, transform, trim=TRIM)).size
+    full_width, full_height = expected_size(size, transform)
+    assert width in (full_width, full_width - full_width % 16)
+    assert height in (full_height, full_height - full_height % 16)
+
+
+def test_default_policy_is_perfect(make_jpeg):
+    data = read(make_jpeg('odd.jpg', (100, 75), subsampling=2))
+    with pytest.raises(NotPerfectError):
+        transform_jpeg(data, 'rotate90')
+
+
+@pytest.mark.parametrize('rotate_mode', ['pixels', 'bake'])
+def test_processor_rotation_keeps_edge_pixels(make_jpeg, rotate_mode):
+    path = make_jpeg('odd.jpg', (100, 75), subsampling=2, orientation=1)
+    spec = JobSpec(fix_exif=False, rotate=True, backup=False, rotate_mode=rotate_mode)
+    with Processor(spec) as processor:
+        result = processor.process_file(path)
+    assert result.ok, result.error
+    with Image.open(path) as image:
+        assert image.size == (75, 100)
+
+
+def test_processor_trim_is_opt_in(make_jpeg):
+    path = make_jpeg('odd.jpg', (100, 75), subsampling=2)
+    spec = JobSpec(fix_exif=False, rotate=True, backup=False, trim=TRIM)
+    with Processor(spec) as processor:
+        result = processor.process_file(path)
+    assert result.ok and result.backends['write'] == 'lossless'
+    with Image.open(path) as image:
+        assert image.size == (64, 100)
+
+
+def test_max_pixels_rejects_before_decoding(make_jpeg):
+    data = read(make_jpeg('big.jpg', (64, 48)))
+    with pytest.raises(TooLargeError):
+        transform_jpeg(data, 'rotate90', max_pixels=64 * 48 - 1)
+
+
+@pytest.mark.parametrize('always_lossless, backend', [(False, 'pil'), (True, 'lossless')])
+def test_builtin_engine_size_limit(make_jpeg, monkeypatch, always_lossless, backend):
+    monkeypatch.setattr(capabilities, 'probe', lambda refresh=False: capabilities.Backends())
+    monkeypatch.setattr(core, 'BUILTIN_MAX_PIXELS', 1000)
+    path = make_jpeg('big.jpg', (64, 48), orientation=1)
+    spec = JobSpec(fix_exif=False, rotate=True, backup=False, always_lossless=always_lossless)
+    with Processor(spec) as processor:
+        result = processor.process_file(path)
+    assert result.ok and result.backends['write'] == backend
+    with Image.open(path) as image:
+        assert image.size == (48, 64)
+
+
+@pytest.mark.skipif(not shutil.which('jpegtran'), reason="jpegtran kurulu değil")
+@pytest.mark.parametrize('transform', ALL_TRANSFORMS)
+def test_jpegtran_matches_builtin(make_jpeg, transform):
+    data = read(make_jpeg('aligned.jpg', (64, 48), subsampling=2))
+    assert difference(decode(transform_jpeg_jpegtran(data, transform)), decode(transform_jpeg(data, transform))) < 1
+    with pytest.raises(NotPerfectError):
+        transform_jpeg_jpegtran(read(make_jpeg('odd.jpg', (100, 75), subsampling=2)), 'rotate90')
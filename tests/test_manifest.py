@@ -0,0 +1,83 @@
+"""Artımlı manifesto: değişmemiş dosyaların atlanması ve geçersiz kılınması"""
+
+import json
+import os
+
+from jpegto.cli import main
+from jpegto.manifest import MANIFEST_NAME, Manifest, default_root, fast_hash
+
+OPERATION = 'fix_exif'
+
+
+def test_unchanged_file_is_current(make_jpeg, tmp_path):
+    path = make_jpeg('a.jpg')
+    with Manifest(str(tmp_path)) as manifest:
+        assert not manifest.is_current(path, OPERATION)
+        manifest.record(path, OPERATION)
+        assert manifest.is_current(path, OPERATION)
+        # Başka işlem aynı dosyayı yeniden işler
+        assert not manifest.is_current(path, 'rotate90:pixels')
+    # Kayıtlar kapatılınca kalıcıdır
+    with Manifest(str(tmp_path)) as manifest:
+        assert manifest.is_current(path, OPERATION)
+
+
+def test_changed_content_invalidates(make_jpeg, tmp_path):
+    path = make_jpeg('a.jpg')
+    with Manifest(str(tmp_path)) as manifest:
+        manifest.record(path, OPERATION)
+        with open(path, 'r+b') as f:
+            f.seek(-4, os.SEEK_END)
+            f.write(b'\x00\x00\xff\xd9')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert not manifest.is_current(path, OPERATION)
+        os.truncate(path, stat.st_size - 1)
+        assert not manifest.is_current(path, OPERATION)
+
+
+def test_touched_but_identical_file_is_current(make_jpeg, tmp_path):
+    path = make_jpeg('a.jpg')
+    with Manifest(str(tmp_path)) as manifest:
+        manifest.record(path, OPERATION)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        # Yalnızca zaman damgası değişti: özet aynı, yeni zaman kaydedilir
+        assert manifest.is_current(path, OPERATION)
+        assert manifest.lookup(path)[1] == stat.st_mtime_ns + 10 ** 9
+
+
+def test_missing_file_is_not_current(make_jpeg, tmp_path):
+    path = make_jpeg('a.jpg')
+    with Manifest(str(tmp_path)) as manifest:
+        manifest.record(path, OPERATION)
+        os.unlink(path)
+        assert not manifest.is_current(path, OPERATION)
+
+
+def test_fast_hash_reads_both_ends(tmp_path):
+    path = tmp_path / 'big.bin'
+    data = bytearray(300 * 1024)
+    path.write_bytes(data)
+    first = fast_hash(str(path))
+    data[-1] = 1
+    path.write_bytes(data)
+    assert fast_hash(str(path)) != first
+
+
+def test_default_root(tmp_path):
+    (tmp_path / 'a' / 'b').mkdir(parents=True)
+    assert default_root([str(tmp_path / 'a' / 'b'), str(tmp_path / 'a' / 'x.jpg')]) == str(tmp_path / 'a')
+    assert default_root([str(tmp_path / 'a' / '**' / '*.jpg')]) == str(tmp_path / 'a')
+
+
+def test_incremental_cli_skips_second_run(make_jpeg, capsys):
+    paths = [make_jpeg(f'photos/{i}.jpg', orientation=6) for i in range(3)]
+    root = os.path.dirname(paths[0])
+    args = [root, '--incremental', '--no-backup', '--no-job', '--no-progress', '--mode', 'thread']
+    assert main(args) == 0
+    capsys.readouterr()
+    assert main(args) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert all(line['skipped'] for line in lines) and len(lines) == 3
+    assert os.path.exists(os.path.join(root, MANIFEST_NAME))
@@ -0,0 +1,69 @@
+"""Bellek bütçesi: başlıktan tahmin, kabul denetimi ve tek başına çalışan büyük dosyalar"""
+
+import os
+import threading
+
+from jpegto.core import JobSpec
+from jpegto.memory import ROTATE_FACTOR, MemoryBudget, estimate_file
+from jpegto.pipeline import Pipeline
+from jpegto.stats import RunStats
+
+
+def test_estimate_from_header(make_jpeg, tmp_path):
+    rotate = JobSpec(rotate=True)
+    assert estimate_file(rotate, make_jpeg('a.jpg', size=(64, 48))) == 64 * 48 * 3 * ROTATE_FACTOR
+    # Yalnızca etiket yazan plan görüntüyü çözmez
+    assert estimate_file(JobSpec(), make_jpeg('b.jpg', orientation=6)) == 0
+    (tmp_path / 'bad.jpg').write_bytes(b'\xff\xd8\xff' + bytes(20))
+    assert estimate_file(rotate, str(tmp_path / 'bad.jpg')) == 0
+
+
+def test_small_jobs_share_the_budget():
+    budget = MemoryBudget(100)
+    assert budget.fits(60)
+    budget.charge(60)
+    assert budget.fits(40) and not budget.fits(41)
+    # Sırada bekleyen büyük iş için ayrılan pay küçük işleri de durdurur
+    assert not budget.fits(10, reserved=40)
+    assert budget.fits(0, reserved=100)
+    budget.release(60)
+    assert budget.used == 0 and budget.to_dict() == {'limit': 100, 'peak': 60, 'serialized': 0}
+
+
+def test_oversized_job_runs_alone():
+    budget = MemoryBudget(100)
+    assert budget.fits(500)
+    budget.charge(500)
+    assert budget.used == 100 and budget.serialized == 1
+    assert not budget.fits(1)
+    budget.release(500)
+    assert budget.used == 0
+
+
+def test_acquire_waits_for_release_and_honours_stop():
+    budget = MemoryBudget(100)
+    budget.charge(80)
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: budget.acquire(50) and acquired.set())
+    thread.start()
+    assert not acquired.wait(0.3)
+    budget.release(80)
+    assert acquired.wait(5)
+    thread.join()
+
+    stop = threading.Event()
+    stop.set()
+    assert not budget.acquire(80, stop)
+    assert budget.used == 50
+
+
+def test_pipeline_stays_within_budget(make_jpeg):
+    paths = [make_jpeg(f'photos/{i}.jpg', size=(64, 48)) for i in range(6)]
+    paths.append(make_jpeg('photos/big.jpg', size=(256, 192)))
+    limit = 64 * 48 * 3 * ROTATE_FACTOR * 2
+    stats = RunStats()
+    pipeline = Pipeline(JobSpec(rotate=True, backup=False), workers=4, mode='thread', memory_budget=limit)
+    assert pipeline.run([os.path.dirname(paths[0])], stats=stats) == (len(paths), 0)
+    assert stats.memory['limit'] == limit
+    assert 0 < stats.memory['peak'] <= limit
+    assert stats.memory['serialized'] == 1
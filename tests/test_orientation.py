@@ -0,0 +1,91 @@
+"""Orientation birleştirme (D4 grubu) ve sanal döndürme"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from jpegto.core import PIL_TRANSPOSE, JobSpec, Processor
+from jpegto.delta import header_end
+from jpegto.jpegmeta import read_orientation
+from jpegto.orientation import (
+    IDENTITY, ORIENTATION_TRANSFORMS, compose, compose_transforms, normalize, transform_for,
+)
+from jpegto.planner import BAKE, VIRTUAL
+
+OPERATIONS = sorted(t for t in ORIENTATION_TRANSFORMS.values() if t != IDENTITY)
+
+
+def apply(image, transform):
+    if transform == IDENTITY:
+        return image
+    return image.transpose(getattr(Image.Transpose, PIL_TRANSPOSE[transform]))
+
+
+def displayed(stored, orientation):
+    """Orientation'ı uygulayan bir görüntüleyicinin göstereceği resim"""
+    return apply(stored, transform_for(orientation)).tobytes()
+
+
+@pytest.fixture(scope='module')
+def stored():
+    # Her pikseli farklı, simetrisiz küçük resim
+    image = Image.new('RGB', (3, 2))
+    image.putdata([(i * 40, 0, 0) for i in range(6)])
+    return image
+
+
+@pytest.mark.parametrize('operation', OPERATIONS)
+@pytest.mark.parametrize('orientation', range(1, 9))
+def test_compose_matches_pixels(stored, orientation, operation):
+    expected = apply(apply(stored, transform_for(orientation)), operation).tobytes()
+    assert displayed(stored, compose(orientation, operation)) == expected
+
+
+def test_group_laws():
+    for orientation in range(1, 9):
+        value = orientation
+        for _ in range(4):
+            value = compose(value, 'rotate90')
+        assert value == orientation
+        assert compose(compose(orientation, 'rotate90'), 'rotate270') == orientation
+        assert compose(compose(orientation, 'flip_horizontal'), 'flip_horizontal') == orientation
+    assert compose_transforms('rotate90', 'rotate90') == 'rotate180'
+    assert compose_transforms('flip_horizontal', 'flip_vertical') == 'rotate180'
+
+
+def test_normalize():
+    assert [normalize(value) for value in (None, 0, 9, 6)] == [1, 1, 1, 6]
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def image_data(path):
+    data = read(path)
+    return data[header_end(io.BytesIO(data)):]
+
+
+@pytest.mark.parametrize('orientation', [None, 1, 6, 8])
+def test_virtual_rotation_only_rewrites_tag(make_jpeg, orientation):
+    path = make_jpeg('v.jpg', orientation=orientation)
+    before = image_data(path)
+    spec = JobSpec(fix_exif=False, rotate=True, rotate_mode=VIRTUAL, backup=False)
+    with Processor(spec) as processor:
+        result = processor.process_file(path)
+    assert result.ok and result.transform == IDENTITY
+    assert read_orientation(path) == compose(orientation, 'rotate90')
+    assert image_data(path) == before
+
+
+def test_bake_applies_composed_orientation(make_jpeg):
+    path = make_jpeg('b.jpg', size=(64, 32), orientation=6)
+    spec = JobSpec(fix_exif=False, rotate=True, rotate_mode=BAKE, backup=False)
+    with Processor(spec) as processor:
+        assert processor.process_file(path).ok
+    # 6 (90°) + 90° = 180°: pikseller döndürülür, etiket 1 olur
+    assert read_orientation(path) == 1
+    with Image.open(path) as image:
+        assert image.size == (64, 32)
@@ -0,0 +1,45 @@
+"""Paralel yürütücü: süreç ve iş parçacığı havuzları, mod seçimi ve sayaçlar"""
+
+import shutil
+
+import pytest
+from PIL import Image
+
+from jpegto.core import JobSpec
+from jpegto.jpegmeta import read_orientation
+from jpegto.parallel import AUTO, PROCESS, THREAD, ParallelExecutor
+
+
+@pytest.mark.parametrize('mode', [THREAD, PROCESS])
+def test_run_processes_every_file(make_jpeg, mode):
+    paths = [make_jpeg(f'{i}.jpg', size=(32, 32), orientation=6) for i in range(6)]
+    paths.append(make_jpeg('bad.jpg'))
+    with open(paths[-1], 'r+b') as f:
+        f.truncate(10)
+    indexes = []
+    results = {}
+
+    def on_result(index, result):
+        indexes.append(index)
+        results[result.path] = result
+
+    spec = JobSpec(rotate=True, backup=False)
+    executor = ParallelExecutor(spec, workers=2, mode=mode, max_in_flight=3)
+    assert executor.run(paths, on_result=on_result) == (6, 1)
+    # Sayaç tamamlanma sırasıyla artar, dosyanın sırasından bağımsızdır
+    assert indexes == list(range(7))
+    assert not results[paths[-1]].ok
+    for path in paths[:-1]:
+        assert results[path].ok
+        assert read_orientation(path) == 1
+        with Image.open(path) as image:
+            assert image.size == (32, 32)
+
+
+def test_mode_resolution():
+    assert ParallelExecutor(JobSpec(), mode=AUTO).resolve_mode() == THREAD
+    rotate = ParallelExecutor(JobSpec(rotate=True), mode=AUTO).resolve_mode()
+    assert rotate == (THREAD if shutil.which('sips') else PROCESS)
+    assert ParallelExecutor(JobSpec(rotate=True), mode=THREAD).resolve_mode() == THREAD
+    with pytest.raises(ValueError):
+        ParallelExecutor(JobSpec(), mode='gpu')
@@ -0,0 +1,61 @@
+"""Akış hattı: tarama bitmeden gelen sonuçlar, durdurma ve duraklatma"""
+
+import os
+import threading
+import time
+
+from jpegto import pipeline as pipeline_module
+from jpegto.core import JobSpec
+from jpegto.jpegmeta import read_orientation
+from jpegto.pipeline import Pipeline
+
+FILES = 8
+
+
+def make_tree(make_jpeg):
+    return [make_jpeg(f'photos/{i}.jpg', size=(32, 32), orientation=6) for i in range(FILES)]
+
+
+def test_results_arrive_before_scan_finishes(make_jpeg, monkeypatch):
+    paths = make_tree(make_jpeg)
+    first_result = threading.Event()
+    seen_during_scan = []
+
+    def slow_scan(sources, sniff=False):
+        yield paths[0]
+        # Tarayıcı ikinci dosyayı ancak ilk sonuç geldikten sonra bulur
+        seen_during_scan.append(first_result.wait(10))
+        yield from paths[1:]
+
+    monkeypatch.setattr(pipeline_module, 'iter_jpeg_paths', slow_scan)
+    totals = []
+    pipeline = Pipeline(JobSpec(backup=False), workers=2, mode='thread', memory_budget=0)
+    counts = pipeline.run(['photos'], on_result=lambda i, result: first_result.set(), on_total=totals.append)
+    assert seen_during_scan == [True]
+    assert counts == (FILES, 0) and totals == [FILES]
+    assert pipeline.completed
+
+
+def test_stop_before_run_touches_nothing(make_jpeg):
+    paths = make_tree(make_jpeg)
+    pipeline = Pipeline(JobSpec(backup=False), workers=2, mode='thread')
+    pipeline.stop()
+    assert pipeline.run([os.path.dirname(paths[0])]) == (0, 0)
+    assert not pipeline.completed
+    assert all(read_orientation(path) == 6 for path in paths)
+
+
+def test_pause_holds_new_files_until_resumed(make_jpeg):
+    paths = make_tree(make_jpeg)
+    pipeline = Pipeline(JobSpec(backup=False), workers=2, mode='thread')
+    results = []
+    pipeline.pause()
+    runner = threading.Thread(target=lambda: results.append(pipeline.run([os.path.dirname(paths[0])])))
+    runner.start()
+    time.sleep(0.5)
+    assert pipeline.paused
+    assert all(read_orientation(path) == 6 for path in paths)
+    pipeline.resume()
+    runner.join(10)
+    assert results == [(FILES, 0)]
+    assert all(read_orientation(path) == 1 for path in paths)
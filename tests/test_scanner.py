@@ -0,0 +1,61 @@
+"""Tarayıcı: uzantı süzgeci, FF D8 FF imzası ve jpegto'nun kendi dosyaları"""
+
+import os
+
+import pytest
+
+from jpegto.core import find_jpegs
+from jpegto.scanner import has_jpeg_magic, iter_jpegs
+
+
+@pytest.fixture
+def tree(make_jpeg, tmp_path):
+    """Klasörde gerçek JPEG'ler, uzantısız bir JPEG, JPEG olmayan dosya ve jpegto dosyaları"""
+    root = tmp_path / 'photos'
+    paths = {
+        'jpg': make_jpeg('photos/a.jpg'),
+        'upper': make_jpeg('photos/sub/B.JPEG'),
+        'bare': make_jpeg('photos/sub/camera_0001'),
+    }
+    (root / 'notes.txt').write_text('not a jpeg')
+    (root / 'fake.jpg.txt').write_bytes(b'\x89PNG\r\n')
+    with open(paths['jpg'], 'rb') as f:
+        data = f.read()
+    (root / 'a.jpg.backup').write_bytes(data)
+    (root / '.jpegto-x1y2.tmp').write_bytes(data)
+    return str(root), paths
+
+
+def test_magic(tree):
+    root, paths = tree
+    assert has_jpeg_magic(paths['bare'])
+    assert not has_jpeg_magic(os.path.join(root, 'notes.txt'))
+    assert not has_jpeg_magic(os.path.join(root, 'missing.jpg'))
+
+
+def test_directory_walk_uses_extensions(tree):
+    root, paths = tree
+    assert sorted(iter_jpegs([root])) == sorted([paths['jpg'], paths['upper']])
+
+
+def test_directory_walk_sniffs_when_asked(tree):
+    root, paths = tree
+    assert sorted(iter_jpegs([root], sniff=True)) == sorted(paths.values())
+
+
+def test_explicit_files_are_checked_by_magic(tree):
+    root, paths = tree
+    given = [paths['bare'], os.path.join(root, 'notes.txt'), paths['jpg']]
+    assert list(iter_jpegs(given)) == [paths['bare'], paths['jpg']]
+
+
+def test_explicit_backups_and_temps_are_ignored(tree):
+    root, _ = tree
+    given = [os.path.join(root, 'a.jpg.backup'), os.path.join(root, '.jpegto-x1y2.tmp')]
+    assert list(iter_jpegs(given)) == []
+
+
+def test_glob_patterns(tree):
+    root, paths = tree
+    # Desenin eşleştirdiği dosyalar doğrudan verilmiş sayılır
+    assert find_jpegs([os.path.join(root, 'sub', '*')]) == [paths['upper'], paths['bare']]
@@ -0,0 +1,127 @@
+"""Dosya sırası, öncelik tamponu, ağırlıklı adil paylaşım ve iptal edilebilir işler"""
+
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from jpegto.core import JobSpec
+from jpegto.jpegmeta import read_orientation
+from jpegto.priority import FOCUS, SMALLEST, FairShare, FileOrder, PriorityBuffer
+from jpegto.scheduler import CANCELLED, DONE, FAILED, Scheduler
+
+
+class Item:
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+
+def drain(buffer):
+    return [buffer.get(timeout=1) for _ in range(buffer.qsize())]
+
+
+def test_file_order_validation():
+    with pytest.raises(ValueError):
+        FileOrder('random')
+    with pytest.raises(ValueError):
+        FileOrder(FOCUS)
+
+
+def test_smallest_first_and_end_marker_last():
+    buffer = PriorityBuffer(10, FileOrder(SMALLEST))
+    end = object()
+    for item in (Item('c', 30), end, Item('a', 10), Item('b', 20), Item('a2', 10)):
+        buffer.put(item)
+    assert [getattr(item, 'path', item) for item in drain(buffer)] == ['a', 'a2', 'b', 'c', end]
+
+
+def test_changing_order_reorders_waiting_items(tmp_path):
+    order = FileOrder()
+    buffer = PriorityBuffer(10, order)
+    paths = [str(tmp_path / folder / 'x.jpg') for folder in ('a', 'b', 'a', 'b')]
+    for path in paths:
+        buffer.put(path)
+    order.set(FOCUS, str(tmp_path / 'b'))
+    assert drain(buffer) == [paths[1], paths[3], paths[0], paths[2]]
+
+
+def test_buffer_is_bounded():
+    buffer = PriorityBuffer(1, FileOrder())
+    buffer.put('a')
+    with pytest.raises(queue.Full):
+        buffer.put('b', timeout=0.05)
+    assert buffer.get() == 'a'
+    with pytest.raises(queue.Empty):
+        buffer.get(timeout=0.05)
+
+
+def test_fair_share_follows_weights():
+    share = FairShare(3)
+    heavy, light = share.register(weight=2), share.register(weight=1)
+    assert all(heavy.acquire(timeout=1) for _ in range(3))
+    assert not light.acquire(timeout=0.05)
+
+    granted = queue.Queue()
+
+    def wait(name, ticket):
+        assert ticket.acquire(timeout=5)
+        granted.put(name)
+
+    threads = [threading.Thread(target=wait, args=(name, ticket))
+               for name, ticket in (('heavy', heavy), ('light', light))]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while len(share._waiting) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Boşalan yuvayı, ağırlığına oranla en az kullanan iş alır
+    heavy.release()
+    assert granted.get(timeout=5) == 'light'
+    heavy.release()
+    assert granted.get(timeout=5) == 'heavy'
+    for thread in threads:
+        thread.join()
+    assert share.usage() == {heavy.key: 2, light.key: 1}
+    light.close()
+    assert share.usage() == {heavy.key: 2}
+
+
+def fix_folder(job, root, gate=None):
+    if gate:
+        gate.wait(5)
+    return job.pipeline(JobSpec(backup=False), workers=1, mode='thread').run([root])
+
+
+def test_job_runs_and_reports(make_jpeg):
+    paths = [make_jpeg(f'photos/{i}.jpg', orientation=6) for i in range(3)]
+    done = []
+    scheduler = Scheduler(workers=2, mode='thread', memory_budget=0)
+    job = scheduler.submit(fix_folder, (os.path.dirname(paths[0]),), on_done=done.append)
+    assert job.wait(10)
+    assert job.state == DONE and job.result == (3, 0) and done == [job]
+    assert scheduler.active == []
+    assert all(read_orientation(path) == 1 for path in paths)
+
+
+def test_cancelled_before_start_touches_nothing(make_jpeg):
+    path = make_jpeg('photos/a.jpg', orientation=6)
+    gate = threading.Event()
+    scheduler = Scheduler(workers=1, mode='thread', memory_budget=0)
+    job = scheduler.submit(fix_folder, (os.path.dirname(path), gate))
+    job.cancel()
+    gate.set()
+    assert job.wait(10)
+    assert job.state == CANCELLED and job.result is None
+    assert read_orientation(path) == 6
+
+
+def test_failing_job():
+    def broken(job):
+        raise RuntimeError("bozuk")
+
+    job = Scheduler(workers=1, mode='thread', memory_budget=0).submit(broken)
+    assert job.wait(10)
+    assert job.state == FAILED and job.error == "bozuk"
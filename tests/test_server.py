@@ -0,0 +1,113 @@
+"""HTTP servisi: /fix akışı, /batch NDJSON satırları ve havuzların paylaşılması"""
+
+import asyncio
+import json
+import os
+
+from jpegto import server
+from jpegto.jpegmeta import read_orientation
+
+
+async def request(port, method, target, body=b''):
+    """Tek istek gönder; (durum, başlıklar, gövde) döndür (chunked gövde birleştirilir)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in lines[1:])}
+    if headers.get('transfer-encoding') == 'chunked':
+        chunks = b''
+        while payload:
+            size, _, rest = payload.partition(b'\r\n')
+            size = int(size, 16)
+            chunks += rest[:size]
+            payload = rest[size + 2:]
+        payload = chunks
+    return int(lines[0].split(' ')[1]), headers, payload
+
+
+def serve(test, **options):
+    """Servisi boş bir portta başlat, test(port) eşyordamını çalıştır, servisi kapat"""
+    options.setdefault('mode', 'thread')
+    options.setdefault('memory_budget', 0)
+
+    async def main():
+        service = server.Service(**options)
+        _, port = await service.start('127.0.0.1', 0)
+        try:
+            return await test(port)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_evicting_a_busy_pool_does_not_cancel_its_requests(make_jpeg, monkeypatch):
+    monkeypatch.setattr(server, 'MAX_POOLS', 1)
+    with open(make_jpeg('in.jpg', (128, 96), orientation=6), 'rb') as f:
+        data = f.read()
+    # Her sorgu ayrı bir seçenek kümesi, dolayısıyla ayrı bir havuz ister
+    queries = [f'/fix?encode={encode}&quality={quality}'
+               for encode in ('original', 'fast', 'small') for quality in (80, 90)]
+
+    async def test(port):
+        return await asyncio.gather(*(request(port, 'POST', query, data) for query in queries))
+
+    responses = serve(test, workers=1, limit=len(queries))
+    assert [status for status, _, _ in responses] == [200] * len(queries)
+    for _, headers, _ in responses:
+        assert json.loads(headers['x-jpegto-result'])['ok']
+
+
+def test_fix_streams_corrected_jpeg(make_jpeg, tmp_path):
+    with open(make_jpeg('in.jpg', orientation=6), 'rb') as f:
+        data = f.read()
+
+    async def test(port):
+        return await request(port, 'POST', '/fix', data)
+
+    status, headers, body = serve(test)
+    assert status == 200 and headers['content-type'] == 'image/jpeg'
+    assert int(headers['content-length']) == len(body)
+    output = tmp_path / 'out.jpg'
+    output.write_bytes(body)
+    assert read_orientation(str(output)) == 1
+    assert json.loads(headers['x-jpegto-result'])['ok']
+
+
+def test_fix_rejects_non_jpeg():
+    async def test(port):
+        return await request(port, 'POST', '/fix', b'GIF89a' + bytes(64))
+
+    status, _, body = serve(test)
+    assert status == 415 and 'error' in json.loads(body)
+
+
+def test_batch_streams_one_line_per_file(make_jpeg):
+    paths = [make_jpeg(f'photos/{i}.jpg', orientation=6) for i in range(5)]
+    root = os.path.dirname(paths[0])
+
+    async def test(port):
+        return await request(port, 'POST', '/batch', json.dumps({'paths': [root], 'backup': False}).encode())
+
+    status, headers, body = serve(test, roots=[root])
+    assert status == 200 and headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert sorted(line['path'] for line in lines[:-1]) == sorted(paths)
+    assert lines[-1] == {'done': True, 'files': 5, 'ok': 5, 'error': 0}
+    assert all(read_orientation(path) == 1 for path in paths)
+
+
+def test_batch_refuses_paths_outside_roots(make_jpeg, tmp_path):
+    outside = make_jpeg('outside.jpg')
+    root = tmp_path / 'root'
+    root.mkdir()
+
+    async def test(port):
+        return await request(port, 'POST', '/batch', json.dumps({'paths': [outside]}).encode())
+
+    status, _, _ = serve(test, roots=[str(root)])
+    assert status == 403
@@ -0,0 +1,47 @@
+"""Orientation ekleme: yeni EXIF segmenti veya büyütülen IFD0; görüntü verisi aynı kalır"""
+
+import io
+
+import piexif
+
+from jpegto.delta import header_end
+from jpegto.jpegmeta import read_orientation
+from jpegto.splice import splice_orientation, splice_orientation_bytes
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def image_data(data):
+    """SOS'tan sonraki entropi kodlu veri"""
+    return data[header_end(io.BytesIO(data)):]
+
+
+def test_splice_without_exif(make_jpeg):
+    path = make_jpeg('plain.jpg')
+    original = read(path)
+    splice_orientation(path, 6)
+    spliced = read(path)
+    assert read_orientation(path) == 6
+    assert image_data(spliced) == image_data(original)
+
+
+def test_splice_grows_existing_ifd(make_jpeg):
+    path = make_jpeg('tagged.jpg', tags={piexif.ImageIFD.Make: b'jpegto', piexif.ImageIFD.Model: b'test'})
+    original = read(path)
+    splice_orientation(path, 8)
+    spliced = read(path)
+    assert read_orientation(path) == 8
+    zeroth = piexif.load(spliced)['0th']
+    assert zeroth[piexif.ImageIFD.Make] == b'jpegto'
+    assert zeroth[piexif.ImageIFD.Model] == b'test'
+    assert image_data(spliced) == image_data(original)
+
+
+def test_splice_bytes_matches_file(make_jpeg):
+    path = make_jpeg('plain.jpg')
+    in_memory = splice_orientation_bytes(read(path), 3)
+    splice_orientation(path, 3)
+    assert read(path) == in_memory
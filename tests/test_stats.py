@@ -0,0 +1,77 @@
+"""Çalıştırma istatistikleri: histogram yüzdelikleri, verim, kalan süre ve JSON özeti"""
+
+import json
+
+import pytest
+
+from jpegto import stats
+from jpegto.core import FileResult
+from jpegto.stats import Histogram, RunStats, format_duration, timed
+
+
+def result(size, ok=True, timings=None, encode=None):
+    item = FileResult('x.jpg')
+    item.ok = ok
+    item.size = size
+    item.timings = timings or {}
+    item.encode = encode
+    return item
+
+
+def test_histogram_percentiles_are_within_bucket_error():
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.add(i / 1000)
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.06)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.06)
+    assert histogram.percentile(100) <= histogram.max == 1.0
+    assert Histogram().percentile(50) is None
+
+
+def test_counts_stages_and_encodes():
+    run = RunStats()
+    run.add(result(1000, timings={stats.BACKUP: 0.01, stats.WRITE: 0.02}))
+    run.add(result(3000, ok=False))
+    run.add(result(2000, encode={'profile': 'fast', 'seconds': 0.5, 'bytes': 1000}))
+    run.add(FileResult.skipped_result('y.jpg'))
+    run.finish()
+    data = json.loads(json.dumps(run.to_dict()))
+    assert (data['files'], data['errors'], data['skipped'], data['bytes']) == (4, 1, 1, 6000)
+    assert set(data['stages']) == {stats.BACKUP, stats.WRITE}
+    assert data['encodes'] == {'fast': {'files': 1, 'seconds': 0.5, 'bytes_in': 2000, 'bytes_out': 1000}}
+    assert [line.split()[0] for line in run.format_stages()] == [stats.BACKUP, stats.WRITE]
+
+
+def test_live_rate_and_eta_use_recent_window(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(stats.time, 'monotonic', lambda: clock[0])
+    run = RunStats()
+    run.set_total(40)
+    assert run.eta() is None
+    # İlk on dosya yavaş, sonraki on dosya saniyede ikişer tane
+    for _ in range(10):
+        clock[0] += 10
+        run.add(result(stats.MB))
+    for _ in range(10):
+        clock[0] += 0.5
+        run.add(result(stats.MB))
+    files_per_second, mb_per_second = run.rates()
+    assert files_per_second == pytest.approx(2.0)
+    assert mb_per_second == pytest.approx(2.0)
+    assert run.eta() == pytest.approx(10.0)
+    assert '20/40 dosya' in run.format_live()
+
+
+def test_timed_accumulates():
+    timings = {}
+    with timed(timings, stats.HASH):
+        pass
+    with timed(timings, stats.HASH):
+        pass
+    assert set(timings) == {stats.HASH} and timings[stats.HASH] >= 0
+
+
+def test_format_duration():
+    assert format_duration(None) == '?'
+    assert format_duration(75) == '01:15'
+    assert format_duration(3725) == '1:02:05'
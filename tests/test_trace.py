@@ -0,0 +1,34 @@
+"""cProfile kaydı: iş parçacığı havuzunda profil dosyaları, başlatılamazsa uyarı"""
+
+import concurrent.futures
+import cProfile
+import os
+
+import pytest
+
+from jpegto import trace
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def test_profiler_in_thread_pool(tmp_path):
+    profiler = trace.Profiler(str(tmp_path))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3, initializer=profiler.start) as pool:
+        assert list(pool.map(busy, [1000] * 6)) == [busy(1000)] * 6
+    paths = profiler.save()
+    assert paths and all(os.path.getsize(path) for path in paths)
+    if trace.SHARED_PROFILE:
+        assert len(paths) == 1
+
+
+def test_profiler_degrades_to_warning(tmp_path, monkeypatch):
+    def busy_tool(self):
+        raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(cProfile.Profile, 'enable', busy_tool)
+    profiler = trace.Profiler(str(tmp_path))
+    with pytest.warns(RuntimeWarning):
+        profiler.start()
+    assert profiler.save() == []
@@ -0,0 +1,141 @@
+"""İzleme servisi: debounce, geçici adlar ve kendi yazmamızın yeniden işlenmemesi"""
+
+import os
+import queue
+import shutil
+import threading
+import time
+
+import pytest
+
+from jpegto.core import JobSpec
+from jpegto.jpegmeta import read_orientation
+from jpegto.watch import CHANGED, READY, Debouncer, WatchDaemon, _libc
+
+# Olay gelmediğinden emin olmak için beklenen süre
+QUIET = 1.0
+
+
+def test_debouncer_waits_for_quiet_period():
+    debouncer = Debouncer(delay=1.0, write_timeout=10.0)
+    assert debouncer.timeout() is None
+    debouncer.add(CHANGED, 'a.jpg', now=0)
+    debouncer.add(READY, 'b.jpg', now=0)
+    assert debouncer.timeout(now=0) == 1.0
+    # Yeni olay sessizlik süresini baştan başlatır
+    debouncer.add(READY, 'b.jpg', now=0.5)
+    assert debouncer.due(now=1.0) == []
+    assert debouncer.due(now=1.5) == ['b.jpg']
+    # Kapanış olayı gelmeyen dosya yazma zaman aşımında işlenir
+    assert debouncer.due(now=9.0) == []
+    debouncer.add(READY, 'a.jpg', now=9.0)
+    assert debouncer.due(now=10.0) == ['a.jpg']
+    assert len(debouncer) == 0
+
+
+class Running:
+    """Servisi arka planda çalıştırır; sonuçları kuyrukta toplar"""
+
+    def __init__(self, root, **options):
+        options.setdefault('mode', 'thread')
+        options.setdefault('workers', 1)
+        options.setdefault('memory_budget', 0)
+        options.setdefault('debounce', 0.1)
+        options.setdefault('initial_scan', False)
+        self.daemon = WatchDaemon(JobSpec(backup=False), [root], **options)
+        self.results = queue.Queue()
+        watching = threading.Event()
+        self.thread = threading.Thread(target=self.daemon.run, kwargs={
+            'on_result': lambda result, latency: self.results.put(result),
+            'on_watching': lambda method: watching.set(),
+        })
+        self.thread.start()
+        assert watching.wait(5)
+
+    def next(self, timeout=10):
+        return self.results.get(timeout=timeout)
+
+    def assert_quiet(self):
+        with pytest.raises(queue.Empty):
+            self.results.get(timeout=QUIET)
+
+    def close(self):
+        self.daemon.stop()
+        self.thread.join(10)
+        assert not self.thread.is_alive()
+
+
+@pytest.fixture(params=['inotify', 'polling'])
+def watch(request, tmp_path):
+    if request.param == 'inotify' and _libc() is None:
+        pytest.skip("inotify yok")
+    root = tmp_path / 'inbox'
+    root.mkdir()
+    poll = 0.1 if request.param == 'polling' else None
+    running = Running(str(root), poll_interval=poll)
+    yield root, running
+    running.close()
+
+
+def slow_copy(source, target, pause=0.3):
+    """Dosyayı iki parçada, arada bekleyerek yaz"""
+    with open(source, 'rb') as f:
+        data = f.read()
+    with open(target, 'wb') as f:
+        f.write(data[:len(data) // 2])
+        f.flush()
+        time.sleep(pause)
+        f.write(data[len(data) // 2:])
+
+
+def test_file_is_processed_once_after_writer_finishes(watch, make_jpeg):
+    root, running = watch
+    target = str(root / 'a.jpg')
+    slow_copy(make_jpeg('a.jpg', orientation=6), target)
+    result = running.next()
+    assert result.path == target and result.ok and not result.error
+    assert read_orientation(target) == 1
+    # jpegto'nun kendi yazması yeni bir olay olarak işlenmez
+    running.assert_quiet()
+
+
+def test_external_rewrite_is_processed_again(watch, make_jpeg):
+    root, running = watch
+    target = str(root / 'a.jpg')
+    shutil.copyfile(make_jpeg('a.jpg', orientation=6), target)
+    running.next()
+    running.assert_quiet()
+    shutil.copyfile(make_jpeg('b.jpg', size=(80, 40), orientation=3), target)
+    assert running.next().path == target
+    assert read_orientation(target) == 1
+
+
+def test_hidden_temporary_name_is_ignored_until_rename(watch, make_jpeg):
+    root, running = watch
+    temporary = str(root / '.a.jpg.partial')
+    slow_copy(make_jpeg('a.jpg', orientation=6), temporary)
+    running.assert_quiet()
+    os.rename(temporary, str(root / 'a.jpg'))
+    assert running.next().path == str(root / 'a.jpg')
+    running.assert_quiet()
+
+
+def test_initial_scan_and_new_subfolder(tmp_path, make_jpeg):
+    if _libc() is None:
+        pytest.skip("inotify yok")
+    root = tmp_path / 'inbox'
+    root.mkdir()
+    existing = str(root / 'old.jpg')
+    shutil.copyfile(make_jpeg('old.jpg', orientation=6), existing)
+    running = Running(str(root), initial_scan=True)
+    try:
+        assert running.next().path == existing
+        folder = tmp_path / 'folder'
+        folder.mkdir()
+        shutil.copyfile(make_jpeg('new.jpg', orientation=8), str(folder / 'new.jpg'))
+        # Taşınarak gelen klasörün dosyaları hazır sayılır
+        os.rename(str(folder), str(root / 'folder'))
+        assert running.next().path == str(root / 'folder' / 'new.jpg')
+        running.assert_quiet()
+    finally:
+        running.close()